@@ -79,6 +79,9 @@ from lms.envs.common import (
     REDIRECT_CACHE_TIMEOUT,
     REDIRECT_CACHE_KEY_PREFIX,
 
+    # cache of the roles of users
+    COURSE_ACCESS_ROLES_CACHE_TIMEOUT,
+
     JWT_AUTH,
 
     # django-debug-toolbar
@@ -399,6 +402,14 @@ MIDDLEWARE_CLASSES = (
     'openedx.core.djangoapps.site_configuration.middleware.SessionCookieDomainOverrideMiddleware',
 )
 
+# Directory where the contentserver keeps copies of course assets too large for
+# the cache, to serve them from the local disk, and the maximum total size in
+# bytes of the copies.  The least recently used copies are deleted when a new
+# one goes over it.  If the size is None, copies are never deleted, and
+# operators must clean up the directory themselves.
+CONTENTSERVER_DISK_CACHE_DIR = None
+CONTENTSERVER_DISK_CACHE_MAX_SIZE = 10 * 1024 * 1024 * 1024
+
 # Clickjacking protection can be enabled by setting this to 'DENY'
 X_FRAME_OPTIONS = 'ALLOW'
 
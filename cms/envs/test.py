@@ -182,6 +182,9 @@ CACHES = {
     },
 }
 
+# The default cache isn't cleared between tests, so don't cache the roles of users across requests
+COURSE_ACCESS_ROLES_CACHE_TIMEOUT = 0
+
 # hide ratelimit warnings while running tests
 filterwarnings('ignore', message='No request passed to the backend, unable to rate-limit')
 
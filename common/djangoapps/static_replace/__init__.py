@@ -11,10 +11,22 @@ from xmodule.modulestore import ModuleStoreEnum
 from xmodule.contentstore.content import StaticContent
 
 from opaque_keys.edx.locator import AssetLocator
+from openedx.core.djangoapps.contentserver.caching import get_course_assets_version
+from openedx.core.lib.cache_utils import ProcessLocalCache
 
 log = logging.getLogger(__name__)
 XBLOCK_STATIC_RESOURCE_PREFIX = '/static/xblock'
 
+# The maximum number of course asset urls kept by each process, and the number of
+# seconds they're kept, which bounds how long an asset imported without being
+# uploaded through Studio may keep its previous url.
+ASSET_URL_CACHE_SIZE = 10000
+ASSET_URL_CACHE_TIMEOUT = 300
+ASSET_URL_CACHE = ProcessLocalCache(ASSET_URL_CACHE_SIZE, ASSET_URL_CACHE_TIMEOUT)
+
+# Cached by _static_url_regex, keyed by STATIC_URL and the data directory.
+_STATIC_URL_REGEXES = {}
+
 
 def _url_replace_regex(prefix):
     """
@@ -123,14 +135,22 @@ def process_static_urls(text, replacement_function, data_dir=None):
 
         return replacement_function(original, prefix, quote, rest)
 
-    return re.sub(
-        _url_replace_regex(u'(?:{static_url}|/static/)(?!{data_dir})'.format(
+    return _static_url_regex(data_dir).sub(wrap_part_extraction, text)
+
+
+def _static_url_regex(data_dir):
+    """
+    Returns the compiled regex matching the static urls that aren't in the data_dir.
+    """
+    key = (settings.STATIC_URL, data_dir)
+    regex = _STATIC_URL_REGEXES.get(key)
+    if regex is None:
+        regex = re.compile(_url_replace_regex(u'(?:{static_url}|/static/)(?!{data_dir})'.format(
             static_url=settings.STATIC_URL,
             data_dir=data_dir
-        )),
-        wrap_part_extraction,
-        text
-    )
+        )))
+        _STATIC_URL_REGEXES[key] = regex
+    return regex
 
 
 def make_static_urls_absolute(request, html):
@@ -161,7 +181,31 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
     data_directory: The directory in which course data is stored
     course_id: The course identifier used to distinguish static content for this course in studio
     static_asset_path: Path for static assets, which overrides data_directory and course_namespace, if nonempty
+
+    The urls of course assets are cached by each process under the version of the
+    course's assets and the asset configuration, which are read once per call.
     """
+    course_asset_state = {}
+
+    def course_asset_config():
+        """
+        Returns the base url and the excluded extensions of course assets.
+        """
+        if 'config' not in course_asset_state:
+            course_asset_state['config'] = (
+                AssetBaseUrlConfig.get_base_url(),
+                AssetExcludedExtensionsConfig.get_excluded_extensions(),
+            )
+        return course_asset_state['config']
+
+    def course_asset_url_cache_key(rest):
+        """
+        Returns the key under which the url that rest is rewritten to is cached.
+        """
+        if 'version' not in course_asset_state:
+            course_asset_state['version'] = get_course_assets_version(course_id)
+        base_url, excluded_exts = course_asset_config()
+        return (unicode(course_id), course_asset_state['version'], base_url, tuple(excluded_exts), rest)
 
     def replace_static_url(original, prefix, quote, rest):
         """
@@ -179,24 +223,30 @@ def replace_static_urls(text, data_directory=None, course_id=None, static_asset_
             # first look in the static file pipeline and see if we are trying to reference
             # a piece of static content which is in the edx-platform repo (e.g. JS associated with an xmodule)
 
-            exists_in_staticfiles_storage = False
-            try:
-                exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
-            except Exception as err:
-                log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
-                    rest, str(err)))
+            cache_key = course_asset_url_cache_key(rest)
+            url = ASSET_URL_CACHE.get(cache_key)
+            if url is None:
+                exists_in_staticfiles_storage = False
+                try:
+                    exists_in_staticfiles_storage = staticfiles_storage.exists(rest)
+                except Exception as err:
+                    log.warning("staticfiles_storage couldn't find path {0}: {1}".format(
+                        rest, str(err)))
+
+                if exists_in_staticfiles_storage:
+                    url = ''
+                else:
+                    # if not, then assume it's courseware specific content and then look in the
+                    # Mongo-backed database
+                    url = StaticContent.get_canonicalized_asset_path(course_id, rest, *course_asset_config())
+
+                    if AssetLocator.CANONICAL_NAMESPACE in url:
+                        url = url.replace('block@', 'block/', 1)
+                ASSET_URL_CACHE.set(cache_key, url)
 
-            if exists_in_staticfiles_storage:
+            # The urls of static files depend on the current theme, so they're not cached.
+            if not url:
                 url = staticfiles_storage.url(rest)
-            else:
-                # if not, then assume it's courseware specific content and then look in the
-                # Mongo-backed database
-                base_url = AssetBaseUrlConfig.get_base_url()
-                excluded_exts = AssetExcludedExtensionsConfig.get_excluded_extensions()
-                url = StaticContent.get_canonicalized_asset_path(course_id, rest, base_url, excluded_exts)
-
-                if AssetLocator.CANONICAL_NAMESPACE in url:
-                    url = url.replace('block@', 'block/', 1)
 
         # Otherwise, look the file up in staticfiles_storage, and append the data directory if needed
         else:
@@ -15,7 +15,8 @@ from static_replace import (
     replace_course_urls,
     _url_replace_regex,
     process_static_urls,
-    make_static_urls_absolute
+    make_static_urls_absolute,
+    ASSET_URL_CACHE,
 )
 from mock import patch, Mock
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
@@ -228,6 +229,89 @@ def test_static_url_with_xblock_resource_on_cdn(mock_modulestore, mock_storage):
     assert_equals(post_text, replace_static_urls(pre_text, DATA_DIRECTORY, COURSE_KEY))
 
 
+@patch('static_replace.get_course_assets_version')
+@patch('static_replace.StaticContent', autospec=True)
+@patch('static_replace.staticfiles_storage', autospec=True)
+def test_course_asset_urls_cached(mock_storage, mock_static_content, mock_get_course_assets_version):
+    """
+    Make sure the urls of course assets are looked up once per version of the course's assets.
+    """
+    ASSET_URL_CACHE.clear()
+    mock_storage.exists.return_value = False
+    mock_static_content.get_canonicalized_asset_path.return_value = '/c4x/org/course/asset/file.png'
+    mock_get_course_assets_version.return_value = 'first'
+
+    text = STATIC_SOURCE + ' ' + STATIC_SOURCE
+    post_text = '"/c4x/org/course/asset/file.png" "/c4x/org/course/asset/file.png"'
+    assert_equals(post_text, replace_static_urls(text, DATA_DIRECTORY, COURSE_KEY))
+    assert_equals(post_text, replace_static_urls(text, DATA_DIRECTORY, COURSE_KEY))
+    assert_equals(mock_static_content.get_canonicalized_asset_path.call_count, 1)
+    mock_storage.exists.assert_called_once_with('file.png')
+
+    # The course's assets changed.
+    mock_get_course_assets_version.return_value = 'second'
+    assert_equals(post_text, replace_static_urls(text, DATA_DIRECTORY, COURSE_KEY))
+    assert_equals(mock_static_content.get_canonicalized_asset_path.call_count, 2)
+
+
+@patch('static_replace.get_course_assets_version')
+@patch('static_replace.staticfiles_storage', autospec=True)
+def test_static_file_urls_not_cached(mock_storage, mock_get_course_assets_version):
+    """
+    Make sure the urls of static files are generated for each call, since they depend on the current theme.
+    """
+    ASSET_URL_CACHE.clear()
+    mock_storage.exists.return_value = True
+    mock_get_course_assets_version.return_value = 'first'
+
+    mock_storage.url.return_value = '/static/red-theme/file.png'
+    assert_equals('"/static/red-theme/file.png"', replace_static_urls(STATIC_SOURCE, DATA_DIRECTORY, COURSE_KEY))
+    mock_storage.url.return_value = '/static/blue-theme/file.png'
+    assert_equals('"/static/blue-theme/file.png"', replace_static_urls(STATIC_SOURCE, DATA_DIRECTORY, COURSE_KEY))
+    mock_storage.exists.assert_called_once_with('file.png')
+
+
+class CourseAssetUrlCacheTest(SharedModuleStoreTestCase):
+    """
+    Tests that the urls of the assets of a course are rewritten from the
+    process-local cache once they have been looked up.
+    """
+    @classmethod
+    def setUpClass(cls):
+        super(CourseAssetUrlCacheTest, cls).setUpClass()
+        cls.course = CourseFactory.create()
+        for index in range(3):
+            name = 'image_{}.png'.format(index)
+            location = StaticContent.compute_location(cls.course.id, name)
+            contentstore().save(StaticContent(location, name, 'image/png', 'not really a png'))
+
+        # Each asset is referenced twice.
+        cls.html = '\n'.join('<img src="/static/image_{}.png"/>'.format(index % 3) for index in range(6))
+
+    def setUp(self):
+        super(CourseAssetUrlCacheTest, self).setUp()
+        # The test caches don't store anything, so the version of the course's assets is fixed.
+        patcher = patch('static_replace.get_course_assets_version', return_value='version')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        ASSET_URL_CACHE.clear()
+        self.addCleanup(ASSET_URL_CACHE.clear)
+
+    def test_cache_hits(self):
+        with patch.object(ASSET_URL_CACHE, 'set', wraps=ASSET_URL_CACHE.set) as mock_set:
+            expected = replace_static_urls(self.html, course_id=self.course.id)
+        self.assertNotIn('"/static/', expected)
+        # Only the first reference to each asset misses the cache.
+        self.assertEqual(mock_set.call_count, 3)
+
+        with patch.object(ASSET_URL_CACHE, 'get', wraps=ASSET_URL_CACHE.get) as mock_get:
+            with patch.object(ASSET_URL_CACHE, 'set', wraps=ASSET_URL_CACHE.set) as mock_set:
+                with check_mongo_calls(0):
+                    self.assertEqual(replace_static_urls(self.html, course_id=self.course.id), expected)
+        self.assertEqual(mock_get.call_count, 6)
+        self.assertFalse(mock_set.called)
+
+
 @ddt.ddt
 class CanonicalContentTest(SharedModuleStoreTestCase):
     """
@@ -0,0 +1,95 @@
+"""
+Performance test comparing the rewriting of the static urls of a large HTML
+module with and without the course asset urls cached by the process.
+"""
+import unittest
+
+from mock import patch
+
+from static_replace import replace_static_urls, ASSET_URL_CACHE
+from xmodule.contentstore.content import StaticContent
+from xmodule.contentstore.django import contentstore
+from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory
+
+# The dependency below needs to be installed manually from the development.txt file, which doesn't
+# get installed during unit tests!
+try:
+    from code_block_timer import CodeBlockTimer
+except ImportError:
+    CodeBlockTimer = None
+
+# Number of assets of the course, each referenced by the HTML module.
+NUM_ASSETS = 50
+
+# Number of times each asset is referenced by the HTML module.
+NUM_REFERENCES = 4
+
+# Number of times the HTML module is rewritten with and without cached urls.
+REPEAT_COUNT = 5
+
+
+# Eventually, exclude this attribute from regular unittests while running *only* tests
+# with this attribute during regular performance tests.
+# @attr("perf_test")
+@unittest.skip("Performance test, run manually.")
+class TestReplaceStaticUrlsPerformance(SharedModuleStoreTestCase):
+    """
+    Times the rewriting of the static urls of an HTML module referencing
+    many course assets.
+    """
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestReplaceStaticUrlsPerformance, cls).setUpClass()
+        cls.course = CourseFactory.create()
+        for index in range(NUM_ASSETS):
+            name = 'image_{}.png'.format(index)
+            location = StaticContent.compute_location(cls.course.id, name)
+            contentstore().save(StaticContent(location, name, 'image/png', 'not really a png'))
+
+        cls.html = '\n'.join(
+            '<p><img src="/static/image_{}.png"/></p>'.format(index)
+            for __ in range(NUM_REFERENCES)
+            for index in range(NUM_ASSETS)
+        )
+
+    def setUp(self):
+        super(TestReplaceStaticUrlsPerformance, self).setUp()
+        # The test caches don't store anything, so the version of the course's assets is fixed.
+        patcher = patch('static_replace.get_course_assets_version', return_value='version')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(ASSET_URL_CACHE.clear)
+
+    def replace(self):
+        """
+        Rewrite the static urls of the HTML module.
+        """
+        return replace_static_urls(self.html, course_id=self.course.id)
+
+    def replace_uncached(self):
+        """
+        Rewrite the static urls of the HTML module, without any cached url.
+        """
+        ASSET_URL_CACHE.clear()
+        return self.replace()
+
+    def test_replace_time(self):
+        if CodeBlockTimer is None:
+            raise unittest.SkipTest("CodeBlockTimer undefined.")
+
+        expected = self.replace_uncached()
+        self.assertNotIn('"/static/', expected)
+        self.assertEqual(self.replace(), expected)
+
+        desc = "{} static urls, {} distinct assets".format(NUM_ASSETS * NUM_REFERENCES, NUM_ASSETS)
+        with CodeBlockTimer(desc):
+            with CodeBlockTimer("uncached"):
+                for __ in range(REPEAT_COUNT):
+                    self.replace_uncached()
+            with CodeBlockTimer("cached"):
+                for __ in range(REPEAT_COUNT):
+                    self.replace()
@@ -54,6 +54,7 @@ from openedx.core.djangoapps.content.course_overviews.models import CourseOvervi
 from openedx.core.djangoapps.site_configuration import helpers as configuration_helpers
 from openedx.core.djangoapps.xmodule_django.models import CourseKeyField, NoneToEmptyManager
 from track import contexts
+from util.db import call_after_transaction
 from util.milestones_helpers import is_entrance_exams_enabled
 from util.model_utils import emit_field_changed_events, get_changed_fields_dict
 from util.query import use_read_replica_if_available
@@ -1442,6 +1443,16 @@ class CourseEnrollment(models.Model):
     def enrollments_for_user(cls, user):
         return cls.objects.filter(user=user, is_active=1)
 
+    @classmethod
+    def load_course_overviews(cls, enrollments):
+        """
+        Loads the CourseOverviews of the courses of the given enrollments at once,
+        so that their course_overview properties don't each load them.
+        """
+        course_overviews = CourseOverview.get_from_ids(enrollment.course_id for enrollment in enrollments)
+        for enrollment in enrollments:
+            enrollment._course_overview = course_overviews[enrollment.course_id]  # pylint: disable=protected-access
+
     @classmethod
     def enrollment_status_hash_cache_key(cls, user):
         """ Returns the cache key for the cached enrollment status hash.
@@ -1771,6 +1782,9 @@ class CourseAccessRole(models.Model):
 
     objects = NoneToEmptyManager()
 
+    ROLES_CACHE_KEY = u'student.courseaccessrole.roles.{user_id}'
+    ROLES_REQUEST_CACHE_NAME = u'CourseAccessRole.roles_for_user'
+
     user = models.ForeignKey(User)
     # blank org is for global group based roles such as course creator (may be deprecated)
     org = models.CharField(max_length=64, db_index=True, blank=True)
@@ -1808,6 +1822,51 @@ class CourseAccessRole(models.Model):
     def __unicode__(self):
         return "[CourseAccessRole] user: {}   role: {}   org: {}   course: {}".format(self.user.username, self.role, self.org, self.course_id)
 
+    @classmethod
+    def roles_for_user(cls, user):
+        """
+        Returns a frozenset of the (role, course_id, org) tuples of all the roles
+        of the given user.
+
+        The roles are cached across requests until one of the user's roles changes
+        or COURSE_ACCESS_ROLES_CACHE_TIMEOUT expires, and they're also kept for the
+        rest of the current request, if any.
+        """
+        # The request cache is only cleared between requests.
+        request_cache_dict = None
+        if request_cache.get_request() is not None:
+            request_cache_dict = request_cache.get_cache(cls.ROLES_REQUEST_CACHE_NAME)
+            roles = request_cache_dict.get(user.id)
+            if roles is not None:
+                return roles
+
+        cache_key = cls.ROLES_CACHE_KEY.format(user_id=user.id)
+        roles = cache.get(cache_key)
+        if roles is None:
+            roles = frozenset(
+                (access_role.role, access_role.course_id, access_role.org)
+                for access_role in cls.objects.filter(user=user)
+            )
+            cache.set(cache_key, roles, settings.COURSE_ACCESS_ROLES_CACHE_TIMEOUT)
+
+        if request_cache_dict is not None:
+            request_cache_dict[user.id] = roles
+        return roles
+
+
+@receiver(models.signals.post_save, sender=CourseAccessRole)
+@receiver(models.signals.post_delete, sender=CourseAccessRole)
+def invalidate_roles_cache(sender, instance, **kwargs):  # pylint: disable=unused-argument
+    """
+    Invalidate the cached roles of the user of a CourseAccessRole, now and
+    once the transaction is over, since until it is committed other requests
+    read and cache the previous roles.
+    """
+    cache_key = CourseAccessRole.ROLES_CACHE_KEY.format(user_id=instance.user_id)
+    cache.delete(cache_key)
+    call_after_transaction(lambda: cache.delete(cache_key))
+    request_cache.get_cache(CourseAccessRole.ROLES_REQUEST_CACHE_NAME).pop(instance.user_id, None)
+
 
 #### Helper methods for use from python manage.py shell and other classes.
 
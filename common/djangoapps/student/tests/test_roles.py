@@ -2,9 +2,14 @@
 Tests of student.roles
 """
 import ddt
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.signals import request_finished
 from django.test import TestCase
+from mock import Mock, patch
 
 from courseware.tests.factories import UserFactory, StaffFactory, InstructorFactory
+from student.models import CourseAccessRole
 from student.tests.factories import AnonymousUserFactory
 
 from student.roles import (
@@ -12,6 +17,7 @@ from student.roles import (
     OrgStaffRole, OrgInstructorRole, RoleCache, CourseBetaTesterRole
 )
 from opaque_keys.edx.locations import SlashSeparatedCourseKey
+from openedx.core.djangolib.testing.utils import CacheIsolationTestCase
 
 
 class RolesTestCase(TestCase):
@@ -193,3 +199,48 @@ class RoleCacheTestCase(TestCase):
     def test_empty_cache(self, role, target):
         cache = RoleCache(self.user)
         self.assertFalse(cache.has_role(*target))
+
+
+class SharedRoleCacheTestCase(CacheIsolationTestCase):
+    """
+    Tests of the caching of the roles of users across and within requests.
+    """
+    ENABLED_CACHES = ['default']
+
+    def setUp(self):
+        super(SharedRoleCacheTestCase, self).setUp()
+        self.course_key = SlashSeparatedCourseKey('edX', 'toy', '2012_Fall')
+        self.user = UserFactory()
+        CourseStaffRole(self.course_key).add_users(self.user)
+
+    def test_roles_cached_across_requests(self):
+        self.assertTrue(RoleCache(self.user).has_role('staff', self.course_key, 'edX'))
+        user = User.objects.get(id=self.user.id)
+        with self.assertNumQueries(0):
+            self.assertTrue(RoleCache(user).has_role('staff', self.course_key, 'edX'))
+
+    def test_cached_roles_invalidated(self):
+        self.assertTrue(RoleCache(self.user).has_role('staff', self.course_key, 'edX'))
+        CourseInstructorRole(self.course_key).add_users(self.user)
+        self.assertTrue(RoleCache(self.user).has_role('instructor', self.course_key, 'edX'))
+        CourseStaffRole(self.course_key).remove_users(self.user)
+        self.assertFalse(RoleCache(self.user).has_role('staff', self.course_key, 'edX'))
+
+    def test_cached_roles_invalidated_after_transaction(self):
+        roles = CourseAccessRole.roles_for_user(self.user)
+        CourseStaffRole(self.course_key).remove_users(self.user)
+        # another request caches the previous roles before the removal is committed
+        cache.set(CourseAccessRole.ROLES_CACHE_KEY.format(user_id=self.user.id), roles)
+        self.assertTrue(RoleCache(self.user).has_role('staff', self.course_key, 'edX'))
+
+        request_finished.send(sender=self.__class__)
+        self.assertFalse(RoleCache(self.user).has_role('staff', self.course_key, 'edX'))
+
+    @patch('student.models.request_cache.get_request', Mock(return_value=Mock()))
+    def test_roles_kept_for_request(self):
+        self.assertTrue(RoleCache(self.user).has_role('staff', self.course_key, 'edX'))
+        cache.clear()
+        with self.assertNumQueries(0):
+            self.assertTrue(RoleCache(self.user).has_role('staff', self.course_key, 'edX'))
+        CourseStaffRole(self.course_key).remove_users(self.user)
+        self.assertFalse(RoleCache(self.user).has_role('staff', self.course_key, 'edX'))
@@ -5,12 +5,19 @@ Utility functions related to databases.
 # pylint: disable=nonstandard-exception
 from contextlib import contextmanager
 from functools import wraps
+import logging
 import random
+import threading
 
+from celery.signals import task_postrun
+from django.core.signals import request_finished
 from django.db import DEFAULT_DB_ALIAS, DatabaseError, Error, transaction
 import request_cache
 
 
+log = logging.getLogger(__name__)
+
+
 OUTER_ATOMIC_CACHE_NAME = 'db.outer_atomic'
 
 MYSQL_MAX_INT = (2 ** 31) - 1
@@ -264,6 +271,55 @@ def outer_atomic(using=None, savepoint=True, read_committed=False, name=None):
         return OuterAtomic(using, savepoint, read_committed, name)
 
 
+class _DeferredCallbacks(threading.local):
+    """
+    A thread-local for storing the callbacks deferred by call_after_transaction.
+    """
+    def __init__(self):
+        super(_DeferredCallbacks, self).__init__()
+        self.callbacks = []
+
+
+DEFERRED_CALLBACKS = _DeferredCallbacks()
+
+
+def call_after_transaction(func, using=None):
+    """
+    Calls `func` once the current transaction, if any, is over.
+
+    Django 1.8 has no transaction.on_commit().  Outside of atomic blocks,
+    `func` is called right away.  Inside of one, it is called at the end
+    of the current request or celery task, when the transactions they
+    opened have been committed or rolled back.  So `func` must be harmless
+    when the transaction was rolled back, like the invalidation of a cache.
+
+    Arguments:
+        func (callable): the function to call, without arguments.
+        using (str): the name of the database.
+    """
+    if transaction.get_connection(using).in_atomic_block:
+        DEFERRED_CALLBACKS.callbacks.append(func)
+    else:
+        func()
+
+
+@task_postrun.connect
+def run_deferred_callbacks(**kwargs):  # pylint: disable=unused-argument
+    """
+    Calls the callbacks deferred by call_after_transaction once a request
+    or celery task completes.
+    """
+    callbacks, DEFERRED_CALLBACKS.callbacks = DEFERRED_CALLBACKS.callbacks, []
+    for callback in callbacks:
+        try:
+            callback()
+        except Exception:  # pylint: disable=broad-except
+            log.exception(u"Error in the callback %r deferred until the end of the transaction", callback)
+
+
+request_finished.connect(run_deferred_callbacks, dispatch_uid='util.db.run_deferred_callbacks')
+
+
 def generate_int_id(minimum=0, maximum=MYSQL_MAX_INT, used_ids=None):
     """
     Return a unique integer in the range [minimum, maximum], inclusive.
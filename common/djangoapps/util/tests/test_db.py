@@ -7,13 +7,17 @@ import unittest
 
 from django.contrib.auth.models import User
 from django.core.management import call_command
+from django.core.signals import request_finished
 from django.db import connection, IntegrityError
 from django.db.transaction import atomic, TransactionManagementError
 from django.test import TestCase, TransactionTestCase
 from django.test.utils import override_settings
 
+from mock import Mock
+
 from util.db import (
-    commit_on_success, enable_named_outer_atomic, outer_atomic, generate_int_id, NoOpMigrationModules
+    call_after_transaction, commit_on_success, enable_named_outer_atomic, outer_atomic, generate_int_id,
+    NoOpMigrationModules
 )
 
 
@@ -182,6 +186,33 @@ class TransactionManagersTestCase(TransactionTestCase):
                     outer_atomic(name='abc')(do_nothing)()
 
 
+class CallAfterTransactionTestCase(TransactionTestCase):
+    """
+    Tests call_after_transaction.
+    """
+    def test_outside_atomic(self):
+        callback = Mock()
+        call_after_transaction(callback)
+        callback.assert_called_once_with()
+
+    def test_inside_atomic(self):
+        callbacks = [Mock(side_effect=Exception), Mock()]
+        with atomic():
+            for callback in callbacks:
+                call_after_transaction(callback)
+        for callback in callbacks:
+            self.assertFalse(callback.called)
+
+        # the callbacks are called at the end of the request, even if one of them fails
+        request_finished.send(sender=self.__class__)
+        for callback in callbacks:
+            callback.assert_called_once_with()
+
+        request_finished.send(sender=self.__class__)
+        for callback in callbacks:
+            self.assertEqual(callback.call_count, 1)
+
+
 @ddt.ddt
 class GenerateIntIdTestCase(TestCase):
     """Tests for `generate_int_id`"""
@@ -7,6 +7,9 @@ Uses pyparsing to parse. Main function as of now is evaluator().
 import math
 import operator
 import numbers
+from collections import OrderedDict
+from threading import Lock
+
 import numpy
 import scipy.constants
 import functions
@@ -228,34 +231,246 @@ def evaluator(variables, functions, math_expr, case_sensitive=False):
     if math_expr.strip() == "":
         return float('nan')
 
-    # Parse the tree.
-    math_interpreter = ParseAugmenter(math_expr, case_sensitive)
-    math_interpreter.parse_algebra()
+    return compile_expression(math_expr, case_sensitive).evaluate(variables, functions)
 
-    # Get our variables together.
-    all_variables, all_functions = add_defaults(variables, functions, case_sensitive)
 
-    # ...and check them
-    math_interpreter.check_variables(all_variables, all_functions)
+# The following evaluation actions are used instead of the ones above when
+# evaluating an expression in batch, where values are numpy arrays that hold
+# one value per sample. Operators are the only strings among their inputs.
 
-    # Create a recursion to evaluate the tree.
-    if case_sensitive:
-        casify = lambda x: x
-    else:
-        casify = lambda x: x.lower()  # Lowercase for case insens.
+def batch_eval_atom(parse_result):
+    """
+    Return the values wrapped by the atom, ignoring parentheses.
+    """
+    return next(k for k in parse_result if not isinstance(k, basestring))
+
+
+def batch_eval_power(parse_result):
+    """
+    Exponentiate the values, right to left, like `eval_power`.
+    """
+    parse_result = reversed(
+        [k for k in parse_result if not isinstance(k, basestring)]
+    )
+    return reduce(lambda a, b: b ** a, parse_result)
+
+
+def batch_eval_parallel(parse_result):
+    """
+    Compute values according to the parallel resistors operator, like
+    `eval_parallel`, with NaN for the samples where an input is zero.
+    """
+    if len(parse_result) == 1:
+        return parse_result[0]
+    values = [k for k in parse_result if not isinstance(k, basestring)]
+    has_zero = reduce(numpy.logical_or, [numpy.equal(value, 0) for value in values])
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        result = 1. / sum(1. / value for value in values)
+    return numpy.where(has_zero, float('nan'), result)
+
+
+def batch_eval_sum(parse_result):
+    """
+    Add the values, keeping in mind their sign, like `eval_sum`.
+    """
+    total = 0.0
+    current_op = operator.add
+    for token in parse_result:
+        if isinstance(token, basestring):
+            current_op = operator.sub if token == '-' else operator.add
+        else:
+            total = current_op(total, token)
+    return total
+
+
+def batch_eval_product(parse_result):
+    """
+    Multiply the values, like `eval_product`.
+    """
+    prod = 1.0
+    current_op = operator.mul
+    for token in parse_result:
+        if isinstance(token, basestring):
+            current_op = operator.truediv if token == '/' else operator.mul
+        else:
+            prod = current_op(prod, token)
+    return prod
+
+
+class CompiledExpression(object):
+    """
+    A parsed math expression, which can be evaluated repeatedly with
+    different variables without being parsed again.
 
+    Instances are immutable once created, so they may be shared; use
+    `compile_expression` to get them from the cache of compiled expressions.
+    """
     evaluate_actions = {
-        'number': eval_number,
-        'variable': lambda x: all_variables[casify(x[0])],
-        'function': lambda x: all_functions[casify(x[0])](x[1]),
         'atom': eval_atom,
         'power': eval_power,
         'parallel': eval_parallel,
         'product': eval_product,
-        'sum': eval_sum
+        'sum': eval_sum,
+    }
+
+    batch_evaluate_actions = {
+        'atom': batch_eval_atom,
+        'power': batch_eval_power,
+        'parallel': batch_eval_parallel,
+        'product': batch_eval_product,
+        'sum': batch_eval_sum,
     }
 
-    return math_interpreter.reduce_tree(evaluate_actions)
+    def __init__(self, math_expr, case_sensitive=False):
+        """
+        Parse the given math expression string.
+
+        Raise a `pyparsing.ParseException` if it isn't valid.
+        """
+        self.math_expr = math_expr
+        self.case_sensitive = case_sensitive
+
+        math_interpreter = ParseAugmenter(math_expr, case_sensitive)
+        math_interpreter.parse_algebra()
+        self._math_interpreter = math_interpreter
+        self._tree = self._compile_node(math_interpreter.tree)
+
+    def _casify(self, name):
+        """
+        Return the name as it is looked up in the variables and functions.
+        """
+        return name if self.case_sensitive else name.lower()
+
+    def _compile_node(self, node):
+        """
+        Convert the given node of a parse tree into nested tuples that are
+        quicker to evaluate than `pyparsing.ParseResults`.
+
+        Numbers are converted to floats, and variable and function names are
+        made lowercase when the expression is case insensitive.
+        """
+        if not isinstance(node, ParseResults):
+            # Then it is an operator or a parenthesis.
+            return node
+
+        node_name = node.getName()
+        if node_name == 'number':
+            return ('number', eval_number(node))
+        elif node_name == 'variable':
+            return ('variable', self._casify(node[0]))
+        elif node_name == 'function':
+            return ('function', self._casify(node[0]), self._compile_node(node[1]))
+        elif node_name in self.evaluate_actions:
+            return (node_name, [self._compile_node(k) for k in node])
+        else:  # pragma: no cover
+            raise Exception(u"Unknown branch name '{}'".format(node_name))
+
+    def _evaluate_tree(self, variables, functions, actions):
+        """
+        Check the variables and functions used by the expression, then
+        evaluate it with the given evaluation actions.
+        """
+        all_variables, all_functions = add_defaults(variables, functions, self.case_sensitive)
+        self._math_interpreter.check_variables(all_variables, all_functions)
+
+        def handle_node(node):
+            """
+            Return the result representing the node, using recursion.
+            """
+            if not isinstance(node, tuple):
+                return node
+            node_name = node[0]
+            if node_name == 'number':
+                return node[1]
+            elif node_name == 'variable':
+                return all_variables[node[1]]
+            elif node_name == 'function':
+                return all_functions[node[1]](handle_node(node[2]))
+            return actions[node_name]([handle_node(k) for k in node[1]])
+
+        return handle_node(self._tree)
+
+    def evaluate(self, variables, functions):
+        """
+        Evaluate the expression and return a number.
+
+        Variables and functions are passed like to `evaluator`.
+        """
+        return self._evaluate_tree(variables, functions, self.evaluate_actions)
+
+    def evaluate_batch(self, variables, functions, num_samples):
+        """
+        Evaluate the expression for `num_samples` samples at once, and return
+        a numpy array of the results.
+
+        Variables are passed as a dictionary from string to a numpy array of
+        their `num_samples` values, or to a python number when the value is
+        the same for all samples. Functions must accept and return numpy
+        arrays, like the default ones, except for the factorials.
+
+        Unlike `evaluate`, invalid operations such as divisions by zero or
+        overflows follow numpy's error handling instead of raising, and
+        results may be NaN or infinite where `evaluate` would raise.
+        """
+        result = self._evaluate_tree(variables, functions, self.batch_evaluate_actions)
+        if numpy.ndim(result) == 0:
+            # The expression doesn't depend on the samples.
+            result = numpy.repeat(result, num_samples)
+        return result
+
+
+class CompiledExpressionCache(object):
+    """
+    Least recently used cache of compiled expressions, keyed by the
+    expression string and its case sensitivity.
+    """
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, math_expr, case_sensitive):
+        """
+        Return the `CompiledExpression` of the given expression, parsing it
+        if it isn't cached.
+        """
+        key = (math_expr, bool(case_sensitive))
+        with self._lock:
+            compiled_expr = self._entries.pop(key, None)
+            if compiled_expr is not None:
+                # Re-insert the entry to mark it as the most recently used.
+                self._entries[key] = compiled_expr
+                return compiled_expr
+
+        compiled_expr = CompiledExpression(math_expr, case_sensitive)
+        with self._lock:
+            self._entries[key] = compiled_expr
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return compiled_expr
+
+    def clear(self):
+        """
+        Evict all compiled expressions.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+# The maximum number of compiled expressions kept in memory.
+COMPILED_EXPRESSIONS_CACHE_SIZE = 1024
+
+COMPILED_EXPRESSIONS = CompiledExpressionCache(COMPILED_EXPRESSIONS_CACHE_SIZE)
+
+
+def compile_expression(math_expr, case_sensitive=False):
+    """
+    Return the `CompiledExpression` of the given expression string, from the
+    cache of compiled expressions.
+
+    Raise a `pyparsing.ParseException` if the expression isn't valid.
+    """
+    return COMPILED_EXPRESSIONS.get(math_expr, case_sensitive)
 
 
 class ParseAugmenter(object):
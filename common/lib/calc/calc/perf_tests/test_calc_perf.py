@@ -0,0 +1,121 @@
+"""
+Performance test comparing the ways of evaluating the answers of typical
+formula problems for all of their samples: parsing the answer for each
+sample, evaluating a cached compiled expression for each sample, and
+evaluating it for all samples at once in batch.
+
+It is skipped on regular unittest runs; to run it, remove the skip decorator
+of TestCalcPerformance, install code_block_timer and run:
+  python -m unittest calc.perf_tests.test_calc_perf
+"""
+import random
+import unittest
+
+import numpy
+
+import calc
+
+# The dependency below needs to be installed manually from the development.txt file, which doesn't
+# get installed during unit tests!
+try:
+    from code_block_timer import CodeBlockTimer
+except ImportError:
+    CodeBlockTimer = None
+
+# Answers of typical formula problems, with the ranges of their variables.
+FORMULA_PROBLEMS = (
+    ("x+2*y", {'x': (-10, 10), 'y': (-10, 10)}),
+    ("m*g*h + 1/2*m*v^2", {'m': (1, 10), 'g': (9, 10), 'h': (1, 100), 'v': (0, 20)}),
+    ("sqrt(x^2 + y^2)*cos(theta)", {'x': (1, 5), 'y': (1, 5), 'theta': (0, 3)}),
+    ("R1 || R2 + 5k", {'R1': (1000, 5000), 'R2': (1000, 5000)}),
+    ("A*e^(-t/tau)*sin(omega*t + phi)", {'A': (1, 2), 't': (0, 10), 'tau': (1, 5), 'omega': (1, 3), 'phi': (0, 1)}),
+)
+
+# Number of samples per problem, as in the samples attribute of formularesponse.
+NUM_SAMPLES = 20
+
+# Number of times the answers of all the problems are evaluated with each function.
+REPEAT_COUNT = 10
+
+
+def evaluate_parsing_each_sample(math_expr, var_dict_list):
+    """
+    Evaluate the expression for each sample, parsing it every time.
+    """
+    return [
+        calc.CompiledExpression(math_expr).evaluate(var_dict, {})
+        for var_dict in var_dict_list
+    ]
+
+
+def evaluate_each_sample(math_expr, var_dict_list):
+    """
+    Evaluate the cached compiled expression for each sample.
+    """
+    return [
+        calc.compile_expression(math_expr).evaluate(var_dict, {})
+        for var_dict in var_dict_list
+    ]
+
+
+def evaluate_in_batch(math_expr, var_dict_list):
+    """
+    Evaluate the cached compiled expression for all samples at once.
+    """
+    variables = {
+        var: numpy.array([var_dict[var] for var_dict in var_dict_list])
+        for var in var_dict_list[0]
+    }
+    return calc.compile_expression(math_expr).evaluate_batch(variables, {}, len(var_dict_list)).tolist()
+
+
+# Eventually, exclude this attribute from regular unittests while running *only* tests
+# with this attribute during regular performance tests.
+# @attr("perf_test")
+@unittest.skip("Performance test, run manually.")
+class TestCalcPerformance(unittest.TestCase):
+    """
+    Times the evaluation of the answers of typical formula problems for
+    all of their samples.
+    """
+    # Use this attribute to skip this test on regular unittest CI runs.
+    perf_test = True
+
+    def setUp(self):
+        super(TestCalcPerformance, self).setUp()
+        random.seed(0)
+        self.problems = [
+            (math_expr, [
+                {var: random.uniform(*var_range) for var, var_range in var_ranges.iteritems()}
+                for __ in range(NUM_SAMPLES)
+            ])
+            for math_expr, var_ranges in FORMULA_PROBLEMS
+        ]
+
+    def evaluate_all(self, evaluate):
+        """
+        Evaluate the answers of all the problems with the given function.
+        """
+        for math_expr, var_dict_list in self.problems:
+            evaluate(math_expr, var_dict_list)
+
+    def test_evaluation_time(self):
+        if CodeBlockTimer is None:
+            raise unittest.SkipTest("CodeBlockTimer undefined.")
+
+        for math_expr, var_dict_list in self.problems:
+            expected = evaluate_parsing_each_sample(math_expr, var_dict_list)
+            for evaluate in (evaluate_each_sample, evaluate_in_batch):
+                for expected_result, result in zip(expected, evaluate(math_expr, var_dict_list)):
+                    self.assertAlmostEqual(expected_result, result)
+
+        desc = "{} problems, {} samples each".format(len(self.problems), NUM_SAMPLES)
+        with CodeBlockTimer(desc):
+            for label, evaluate in (
+                    ("parsing_each_sample", evaluate_parsing_each_sample),
+                    ("compiled_each_sample", evaluate_each_sample),
+                    ("compiled_in_batch", evaluate_in_batch),
+            ):
+                with CodeBlockTimer(label):
+                    for __ in range(REPEAT_COUNT):
+                        self.evaluate_all(evaluate)
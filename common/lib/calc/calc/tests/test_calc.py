@@ -559,3 +559,73 @@ class EvaluatorTest(unittest.TestCase):
             calc.evaluator({'r1': 5}, {}, "r1+r2")
         with self.assertRaisesRegexp(calc.UndefinedVariable, 'r1 r3'):
             calc.evaluator(variables, {}, "r1*r3", case_sensitive=True)
+
+
+class CompiledExpressionTest(unittest.TestCase):
+    """
+    Run tests for calc.compile_expression and calc.CompiledExpression
+    """
+    def setUp(self):
+        super(CompiledExpressionTest, self).setUp()
+        calc.COMPILED_EXPRESSIONS.clear()
+
+    def test_cached(self):
+        compiled_expr = calc.compile_expression("x^2 + 1")
+        self.assertIs(calc.compile_expression("x^2 + 1"), compiled_expr)
+        self.assertIsNot(calc.compile_expression("x^2 + 1", case_sensitive=True), compiled_expr)
+        self.assertEqual(compiled_expr.evaluate({'x': 2.0}, {}), 5.0)
+        self.assertEqual(compiled_expr.evaluate({'x': 3.0}, {}), 10.0)
+
+    def test_least_recently_used_eviction(self):
+        cache = calc.CompiledExpressionCache(max_size=2)
+        first = cache.get("1", False)
+        second = cache.get("2", False)
+        # mark the first expression as the most recently used
+        cache.get("1", False)
+        cache.get("3", False)
+        self.assertIs(cache.get("1", False), first)
+        self.assertIsNot(cache.get("2", False), second)
+
+    def test_invalid_not_cached(self):
+        with self.assertRaises(ParseException):
+            calc.compile_expression("1 +")
+        self.assertEqual(len(calc.COMPILED_EXPRESSIONS._entries), 0)  # pylint: disable=protected-access
+
+    def test_undefined_vars(self):
+        compiled_expr = calc.compile_expression("r1+r2")
+        with self.assertRaisesRegexp(calc.UndefinedVariable, 'r2'):
+            compiled_expr.evaluate({'r1': 5}, {})
+        with self.assertRaisesRegexp(calc.UndefinedVariable, 'r2'):
+            compiled_expr.evaluate_batch({'r1': numpy.array([5.0])}, {}, 1)
+
+    def test_evaluate_batch(self):
+        """
+        Check that evaluating in batch gives the results of evaluating each
+        sample on its own.
+        """
+        samples = [{'x': x, 'y': y} for x, y in [(0.5, 1.0), (2.0, -3.0), (1.5, 0.25)]]
+        variables = {name: numpy.array([sample[name] for sample in samples]) for name in ('x', 'y')}
+        for math_expr in (
+            "x^2 + 3*y - 7",
+            "-x/y + y/x",
+            "sin(x)*cos(y) + sqrt(x)",
+            "2^x^2 - e^(x*y)",
+            "x || 2",
+            "(x + i*y)^2",
+            "5k * 2",
+            "X*Y",
+        ):
+            compiled_expr = calc.compile_expression(math_expr)
+            results = compiled_expr.evaluate_batch(variables, {}, len(samples))
+            self.assertEqual(results.shape, (len(samples),))
+            for sample, result in zip(samples, results):
+                self.assertAlmostEqual(compiled_expr.evaluate(sample, {}), result)
+
+    def test_evaluate_batch_constant(self):
+        results = calc.compile_expression("2*pi").evaluate_batch({'x': numpy.array([1.0, 2.0])}, {}, 2)
+        self.assertEqual(results.tolist(), [2 * numpy.pi, 2 * numpy.pi])
+
+    def test_evaluate_batch_parallel_with_zero(self):
+        results = calc.compile_expression("x || 1").evaluate_batch({'x': numpy.array([0.0, 1.0])}, {}, 2)
+        self.assertTrue(numpy.isnan(results[0]))
+        self.assertEqual(results[1], 0.5)
@@ -16,9 +16,11 @@ This is used by capa_module.
 from collections import OrderedDict
 from copy import deepcopy
 from datetime import datetime
+import hashlib
 import logging
 import os.path
 import re
+from threading import Lock
 
 from lxml import etree
 from pytz import UTC
@@ -72,6 +74,54 @@ html_problem_semantics = [
 
 log = logging.getLogger(__name__)
 
+# maximum number of parsed problem templates kept in memory by each process
+PARSED_PROBLEM_CACHE_SIZE = 1000
+
+
+class ParsedProblemCache(object):
+    """
+    Least recently used cache of the parsed XML trees of problems, keyed by
+    a hash of the problem XML, whether it is unicode, and the problem id.
+
+    The cached trees don't depend on the problem's seed or state, so instances
+    of the same problem share them.  They must not be modified: each instance
+    works on its own copy.
+    """
+    def __init__(self, max_size):
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key):
+        """
+        Return the cached tree for the given key, or None.
+        """
+        with self._lock:
+            tree = self._entries.pop(key, None)
+            if tree is not None:
+                # Re-insert the entry to mark it as the most recently used.
+                self._entries[key] = tree
+            return tree
+
+    def set(self, key, tree):
+        """
+        Cache the given tree for the given key.
+        """
+        with self._lock:
+            self._entries[key] = tree
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Evict all cached trees.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+PARSED_PROBLEMS = ParsedProblemCache(PARSED_PROBLEM_CACHE_SIZE)
+
 #-----------------------------------------------------------------------------
 # main class for this module
 
@@ -172,30 +222,30 @@ class LoncapaProblem(object):
         self.done = state.get('done', False)
         self.input_state = state.get('input_state', {})
 
-        # Convert startouttext and endouttext to proper <text></text>
-        problem_text = re.sub(r"startouttext\s*/", "text", problem_text)
-        problem_text = re.sub(r"endouttext\s*/", "/text", problem_text)
-        self.problem_text = problem_text
-
-        # parse problem XML file into an element tree
-        self.tree = etree.XML(problem_text)
-
-        self.make_xml_compatible(self.tree)
+        # parse problem XML file into an element tree, or copy the one parsed
+        # for a previous instance of this problem
+        self.problem_text, template_tree, template_data = self._get_parsed_problem(problem_text)
+        self.tree = deepcopy(template_tree)
 
         # handle any <include file="foo"> tags
         self._process_includes()
 
+        # Problems with <include> tags are labelled once the files are included.
+        if template_data is None:
+            self.problem_data = self._label_responses(self.tree)
+        else:
+            self.problem_data = deepcopy(template_data)
+
         # construct script processor context (eg for customresponse problems)
         if minimal_init:
             self.context = {}
         else:
             self.context = self._extract_context(self.tree)
 
-        # Pre-parse the XML tree: modifies it to add ID's and perform some in-place
-        # transformations.  This also creates the dict (self.responders) of Response
+        # Pre-parse the XML tree: creates the dict (self.responders) of Response
         # instances for each question in the problem. The dict has keys = xml subtree of
         # Response, values = Response instance
-        self.problem_data = self._preprocess_problem(self.tree, minimal_init)
+        self._preprocess_problem(self.tree, minimal_init)
 
         if not minimal_init:
             if not self.student_answers:  # True when student_answers is an empty dict
@@ -215,6 +265,38 @@ class LoncapaProblem(object):
 
             self.extracted_tree = self._extract_html(self.tree)
 
+    def _get_parsed_problem(self, problem_text):
+        """
+        Return the problem text with <startouttext /> and <endouttext /> converted,
+        the element tree parsed from it and made compatible, and the a11y data of
+        its responses.
+
+        The tree is shared through PARSED_PROBLEMS with the other instances of this
+        problem, so it must be copied before it is modified.  <include> tags aren't
+        processed, since the included files depend on the course's filestore, so
+        trees that have them aren't labelled, and their a11y data is None.
+        """
+        is_unicode = isinstance(problem_text, unicode)
+        key = (
+            is_unicode,
+            hashlib.sha1(problem_text.encode('utf-8') if is_unicode else problem_text).hexdigest(),
+            self.problem_id,
+        )
+        cached = PARSED_PROBLEMS.get(key)
+        if cached is not None:
+            return cached
+
+        # Convert startouttext and endouttext to proper <text></text>
+        problem_text = re.sub(r"startouttext\s*/", "text", problem_text)
+        problem_text = re.sub(r"endouttext\s*/", "/text", problem_text)
+
+        tree = etree.XML(problem_text)
+        self.make_xml_compatible(tree)
+        problem_data = None if tree.find('.//include') is not None else self._label_responses(tree)
+
+        PARSED_PROBLEMS.set(key, (problem_text, tree, problem_data))
+        return problem_text, tree, problem_data
+
     def make_xml_compatible(self, tree):
         """
         Adjust tree xml in-place for compatibility before creating
@@ -869,20 +951,17 @@ class LoncapaProblem(object):
 
         return tree
 
-    def _preprocess_problem(self, tree, minimal_init):  # private
+    def _label_responses(self, tree):
         """
         Assign IDs to all the responses
         Assign sub-IDs to all entries (textline, schematic, etc.)
-        Annoted correctness and value
-        In-place transformation
+        In-place transformation, which depends only on the problem XML and id
 
-        Also create capa Response instances for each responsetype and save as self.responders
-
-        Obtain all responder answers and save as self.responder_answers dict (key = response)
+        Return the a11y data of the entries, with their labels and descriptions
         """
         response_id = 1
         problem_data = {}
-        self.responders = {}
+        input_tags = inputtypes.registry.registered_tags()
         for response in tree.xpath('//' + "|//".join(responsetypes.registry.registered_tags())):
             responsetype_id = self.problem_id + "_" + str(response_id)
             # create and save ID for this response
@@ -890,7 +969,6 @@ class LoncapaProblem(object):
             response_id += 1
 
             answer_id = 1
-            input_tags = inputtypes.registry.registered_tags()
             inputfields = tree.xpath(
                 "|".join(['//' + response.tag + '[@id=$id]//' + x for x in input_tags]),
                 id=responsetype_id
@@ -905,6 +983,25 @@ class LoncapaProblem(object):
 
             self.response_a11y_data(response, inputfields, responsetype_id, problem_data)
 
+        return problem_data
+
+    def _preprocess_problem(self, tree, minimal_init):  # private
+        """
+        Create capa Response instances for each responsetype, labelled by
+        _label_responses, and save as self.responders
+
+        Obtain all responder answers and save as self.responder_answers dict (key = response)
+        Annoted correctness and value
+        In-place transformation
+        """
+        self.responders = {}
+        input_tags = inputtypes.registry.registered_tags()
+        for response in tree.xpath('//' + "|//".join(responsetypes.registry.registered_tags())):
+            inputfields = tree.xpath(
+                "|".join(['//' + response.tag + '[@id=$id]//' + x for x in input_tags]),
+                id=response.get('id')
+            )
+
             # instantiate capa Response
             responsetype_cls = responsetypes.registry.get_class_for_tag(response.tag)
             responder = responsetype_cls(
@@ -933,8 +1030,6 @@ class LoncapaProblem(object):
                 solution.attrib['id'] = "%s_solution_%i" % (self.problem_id, solution_id)
                 solution_id += 1
 
-        return problem_data
-
     def response_a11y_data(self, response, inputfields, responsetype_id, problem_data):
         """
         Construct data to be used for a11y.
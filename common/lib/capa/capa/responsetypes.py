@@ -37,7 +37,7 @@ from shapely.geometry import Point, MultiPoint
 import dogstats_wrapper as dog_stats_api
 
 # specific library imports
-from calc import evaluator, UndefinedVariable
+from calc import compile_expression, evaluator, UndefinedVariable
 from . import correctmap
 from .registry import TagRegistry
 from datetime import datetime
@@ -3089,6 +3089,10 @@ class FormulaResponse(LoncapaResponse):
         """
         _ = self.capa_system.i18n.ugettext
 
+        out = self.tupleize_answers_in_batch(answer, var_dict_list)
+        if out is not None:
+            return out
+
         out = []
         for var_dict in var_dict_list:
             try:
@@ -3140,6 +3144,34 @@ class FormulaResponse(LoncapaResponse):
                 )
         return out
 
+    def tupleize_answers_in_batch(self, answer, var_dict_list):
+        """
+        Like tupleize_answers, but evaluates the answer for all the test cases
+        at once, using numpy arrays.
+
+        Returns None if the answer can't be evaluated that way, or if any
+        result isn't finite, so that tupleize_answers evaluates each test case
+        on its own and reports errors as usual.
+        """
+        if not var_dict_list:
+            return None
+        variables = {
+            var: numpy.array([var_dict[var] for var_dict in var_dict_list])
+            for var in var_dict_list[0]
+        }
+        try:
+            with numpy.errstate(all='ignore'):
+                results = compile_expression(answer, self.case_sensitive).evaluate_batch(
+                    variables,
+                    dict(),
+                    len(var_dict_list),
+                )
+            if not numpy.all(numpy.isfinite(results)):
+                return None
+        except Exception:  # pylint: disable=broad-except
+            return None
+        return results.tolist()
+
     def randomize_variables(self, samples):
         """
         Returns a list of dictionaries mapping variables to random values in range,
@@ -6,7 +6,11 @@ from codejail.safe_exec import json_safe, SafeExecException
 from . import lazymod
 from dogapi import dog_stats_api
 
+from collections import OrderedDict
+from copy import deepcopy
 import hashlib
+from threading import Lock
+from time import time
 
 # Establish the Python environment for Capa.
 # Capa assumes float-friendly division always.
@@ -46,6 +50,13 @@ for name, modname in ASSUMED_IMPORTS:
 
 LAZY_IMPORTS = "".join(LAZY_IMPORTS)
 
+# The maximum number of safe_exec results kept in memory by each process,
+# and for how many seconds.  Results don't depend on the files in the
+# python_path, such as a course's python_lib.zip, so they mustn't be kept
+# for much longer than in the shared cache.
+LOCAL_CACHE_SIZE = 500
+LOCAL_CACHE_TIMEOUT = 300
+
 
 def update_hash(hasher, obj):
     """
@@ -70,6 +81,90 @@ def update_hash(hasher, obj):
         hasher.update(repr(obj))
 
 
+class LocalCache(object):
+    """
+    A process-local, least recently used cache of safe_exec results, which
+    expire after `timeout` seconds.
+
+    Results are copied when they are read, since safe_exec hands their
+    values to the caller's globals dictionary.
+    """
+    def __init__(self, max_size, timeout):
+        self.max_size = max_size
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key):
+        """
+        Return a copy of the cached value for `key`, or None.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+            expiration_time, value = entry
+            if expiration_time < time():
+                return None
+            # Re-insert the entry to mark it as the most recently used.
+            self._entries[key] = entry
+        return deepcopy(value)
+
+    def set(self, key, value):
+        """
+        Cache a copy of `value` for `key`.
+        """
+        entry = (time() + self.timeout, deepcopy(value))
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = entry
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Evict all cached values.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+LOCAL_CACHE = LocalCache(LOCAL_CACHE_SIZE, LOCAL_CACHE_TIMEOUT)
+
+
+class TwoTierCache(object):
+    """
+    A cache for safe_exec that keeps results in the process-local
+    `LOCAL_CACHE`, in front of a shared cache such as Django's.
+
+    Results found in the shared cache are added to the local one, so each
+    process reads them from the shared cache at most once while they are
+    kept locally.
+    """
+    def __init__(self, shared_cache, local_cache=LOCAL_CACHE):
+        self.shared_cache = shared_cache
+        self.local_cache = local_cache
+
+    def get(self, key):
+        """
+        Return the cached value for `key` from the local cache, else from
+        the shared cache, or None.
+        """
+        value = self.local_cache.get(key)
+        if value is None:
+            value = self.shared_cache.get(key)
+            if value is not None:
+                self.local_cache.set(key, value)
+        return value
+
+    def set(self, key, value):
+        """
+        Cache `value` for `key` in both caches.
+        """
+        self.local_cache.set(key, value)
+        self.shared_cache.set(key, value)
+
+
 @dog_stats_api.timed('capa.safe_exec.time')
 def safe_exec(
     code,
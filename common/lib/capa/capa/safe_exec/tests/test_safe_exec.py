@@ -9,7 +9,8 @@ import unittest
 
 from nose.plugins.skip import SkipTest
 
-from capa.safe_exec import safe_exec, update_hash
+from capa.safe_exec import safe_exec, update_hash, TwoTierCache
+from capa.safe_exec.safe_exec import LocalCache
 from codejail.safe_exec import SafeExecException
 from codejail.jail_code import is_configured
 
@@ -177,6 +178,59 @@ class TestSafeExecCaching(unittest.TestCase):
                 self.fail("Tried executing code with non-ASCII unicode: {0}".format(code))
 
 
+class TestTwoTierCache(unittest.TestCase):
+    """Test the process-local cache in front of the shared one."""
+
+    def setUp(self):
+        super(TestTwoTierCache, self).setUp()
+        self.shared = {}
+        self.local_cache = LocalCache(max_size=2, timeout=60)
+        self.cache = TwoTierCache(DictCache(self.shared), self.local_cache)
+
+    def test_cache_miss_then_hit(self):
+        g = {}
+        safe_exec("a = int(math.pi)", g, cache=self.cache)
+        self.assertEqual(g['a'], 3)
+        # The result is in both caches.
+        key = self.shared.keys()[0]
+        self.assertEqual(self.local_cache.get(key), (None, {'a': 3}))
+
+        # Without the shared cache, the result comes from the local one.
+        self.shared.clear()
+        g = {}
+        safe_exec("a = int(math.pi)", g, cache=self.cache)
+        self.assertEqual(g['a'], 3)
+        self.assertEqual(self.shared, {})
+
+    def test_shared_hit_is_kept_locally(self):
+        self.shared['key'] = (None, {'a': 17})
+        self.assertEqual(self.cache.get('key'), (None, {'a': 17}))
+        del self.shared['key']
+        self.assertEqual(self.cache.get('key'), (None, {'a': 17}))
+
+    def test_values_are_copied(self):
+        self.cache.set('key', (None, {'a': [1]}))
+        self.cache.get('key')[1]['a'].append(2)
+        self.assertEqual(self.local_cache.get('key'), (None, {'a': [1]}))
+
+    def test_least_recently_used_eviction(self):
+        for key in ('first', 'second'):
+            self.local_cache.set(key, (None, {}))
+        # Mark the first value as the most recently used.
+        self.local_cache.get('first')
+        self.local_cache.set('third', (None, {}))
+        self.assertIsNotNone(self.local_cache.get('first'))
+        self.assertIsNone(self.local_cache.get('second'))
+        self.assertIsNotNone(self.local_cache.get('third'))
+
+    def test_expiration(self):
+        self.local_cache.set('key', (None, {}))
+        self.local_cache.timeout = -1
+        self.local_cache.set('expired', (None, {}))
+        self.assertIsNotNone(self.local_cache.get('key'))
+        self.assertIsNone(self.local_cache.get('expired'))
+
+
 class TestUpdateHash(unittest.TestCase):
     """Test the safe_exec.update_hash function to be sure it canonicalizes properly."""
 
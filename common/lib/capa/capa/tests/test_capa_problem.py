@@ -4,8 +4,10 @@ Test capa problem.
 import ddt
 import textwrap
 from lxml import etree
+from mock import patch
 import unittest
 
+from capa.capa_problem import PARSED_PROBLEMS
 from capa.tests.helpers import new_loncapa_problem
 
 
@@ -590,3 +592,57 @@ class CAPAMultiInputProblemTest(unittest.TestCase):
             description_element = multi_inputs_group.xpath('//p[@id="{}"]'.format(description_id))
             self.assertEqual(len(description_element), 1)
             self.assertEqual(description_element[0].text, descriptions[index])
+
+
+class CAPAParsedProblemCacheTest(unittest.TestCase):
+    """ TestCase for the cache of parsed problem trees """
+
+    xml = textwrap.dedent("""
+        <problem>
+            <startouttext/>Pick a color<endouttext/>
+            <optionresponse>
+                <label>Which color?</label>
+                <optioninput>
+                    <option correct="False">yellow</option>
+                    <option correct="True">blue</option>
+                </optioninput>
+            </optionresponse>
+        </problem>
+    """)
+
+    def setUp(self):
+        super(CAPAParsedProblemCacheTest, self).setUp()
+        PARSED_PROBLEMS.clear()
+
+    def test_parsed_once(self):
+        # the problem XML is parsed and labelled, and its tree cached, on the first miss only
+        with patch.object(PARSED_PROBLEMS, 'set', wraps=PARSED_PROBLEMS.set) as mock_set:
+            problems = [new_loncapa_problem(self.xml, seed=seed) for seed in (1, 2)]
+        self.assertEqual(mock_set.call_count, 1)
+
+        for problem in problems:
+            self.assertEqual(len(problem.tree.findall('.//text')), 1)
+            self.assertIsNone(problem.tree.find('.//label'))
+            self.assertEqual(problem.tree.find('.//optioninput').get('options'), "('yellow','blue')")
+            self.assertEqual(problem.tree.find('.//optioninput').get('correct'), 'blue')
+            self.assertEqual(problem.tree.find('.//optionresponse').get('id'), '1_1')
+            self.assertEqual(problem.problem_data['1_2_1']['label'], 'Which color?')
+
+    def test_labelled_per_problem(self):
+        with patch.object(PARSED_PROBLEMS, 'set', wraps=PARSED_PROBLEMS.set) as mock_set:
+            problems = [new_loncapa_problem(self.xml, problem_id=problem_id) for problem_id in ('1', '2')]
+        self.assertEqual(mock_set.call_count, 2)
+
+        for problem in problems:
+            self.assertEqual(problem.tree.find('.//optionresponse').get('id'), problem.problem_id + '_1')
+            self.assertEqual(problem.problem_data[problem.problem_id + '_2_1']['label'], 'Which color?')
+
+    def test_trees_not_shared(self):
+        first_problem = new_loncapa_problem(self.xml, seed=1)
+        second_problem = new_loncapa_problem(self.xml, seed=2)
+        self.assertIsNot(first_problem.tree, second_problem.tree)
+        self.assertIsNot(first_problem.problem_data, second_problem.problem_data)
+
+        first_problem.tree.find('.//optioninput').set('options', "('red')")
+        third_problem = new_loncapa_problem(self.xml, seed=3)
+        self.assertEqual(third_problem.tree.find('.//optioninput').get('options'), "('yellow','blue')")
@@ -619,6 +619,32 @@ class FormulaResponseTest(ResponseTest):
         self.assertTrue(problem.responders.values()[0].validate_answer('14*x'))
         self.assertFalse(problem.responders.values()[0].validate_answer('3*y+2*x'))
 
+    def test_tupleize_answers_in_batch(self):
+        """
+        Test that answers are evaluated for all samples at once, with the
+        results of evaluating each sample on its own.
+        """
+        sample_dict = {'x': (1, 2), 'y': (-1, 1)}
+        problem = self.build_problem(
+            sample_dict=sample_dict,
+            num_samples=10,
+            tolerance="1%",
+            answer="x"
+        )
+        responder = problem.responders.values()[0]
+        var_dict_list = responder.randomize_variables(responder.samples)
+        with mock.patch('capa.responsetypes.evaluator') as mock_evaluator:
+            results = responder.tupleize_answers('sin(x)^2 + y*x', var_dict_list)
+        self.assertFalse(mock_evaluator.called)
+        for var_dict, result in zip(var_dict_list, results):
+            self.assertAlmostEqual(result, calc.evaluator(var_dict, {}, 'sin(x)^2 + y*x'))
+
+        # Answers that can't be evaluated in batch are evaluated per sample.
+        self.assertIsNone(responder.tupleize_answers_in_batch('fact(x)', var_dict_list))
+        self.assertIsNone(responder.tupleize_answers_in_batch('1/(x-x)', var_dict_list))
+        with self.assertRaises(StudentInputError):
+            responder.tupleize_answers('1/(x-x)', var_dict_list)
+
 
 class StringResponseTest(ResponseTest):  # pylint: disable=missing-docstring
     xml_factory_class = StringResponseXMLFactory
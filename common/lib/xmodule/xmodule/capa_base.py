@@ -23,9 +23,11 @@ from capa.capa_problem import LoncapaProblem, LoncapaSystem
 from capa.inputtypes import Status
 from capa.responsetypes import StudentInputError, ResponseError, LoncapaProblemError
 from capa.util import convert_files_to_filenames, get_inner_html_from_xpath
+from capa.safe_exec import TwoTierCache
 from xblock.fields import Boolean, Dict, Float, Integer, Scope, String, XMLString
 from xmodule.capa_base_constants import RANDOMIZATION, SHOWANSWER
 from xmodule.exceptions import NotFoundError
+from xmodule.x_module import DoNothingCache
 from .fields import Date, Timedelta
 from .progress import Progress
 
@@ -303,10 +305,15 @@ class CapaMixin(CapaFields):
         if text is None:
             text = self.data
 
+        # Runtimes without a cache, like Studio's preview, must not get results cached by the process either.
+        cache = self.runtime.cache
+        if not isinstance(cache, DoNothingCache):
+            cache = TwoTierCache(cache)
+
         capa_system = LoncapaSystem(
             ajax_url=self.runtime.ajax_url,
             anonymous_student_id=self.runtime.anonymous_student_id,
-            cache=self.runtime.cache,
+            cache=cache,
             can_execute_unsafe_code=self.runtime.can_execute_unsafe_code,
             get_python_lib_zip=self.runtime.get_python_lib_zip,
             DEBUG=self.runtime.DEBUG,
@@ -336,6 +336,13 @@ class StaticContentStream(StaticContent):
             position += STREAM_DATA_CHUNK_SIZE
             yield chunk
 
+    def get_file(self):
+        """
+        Returns the underlying file-like object, positioned at the start of the data
+        """
+        self._stream.seek(0)
+        return self._stream
+
     def close(self):
         self._stream.close()
 
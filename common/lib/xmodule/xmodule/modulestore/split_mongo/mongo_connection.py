@@ -8,9 +8,13 @@ import zlib
 import pymongo
 import pytz
 import re
+from collections import OrderedDict
 from contextlib import contextmanager
+from threading import Lock
 from time import time
 
+from bson import BSON
+
 # Import this just to export it
 from pymongo.errors import DuplicateKeyError  # pylint: disable=unused-import
 
@@ -243,8 +247,16 @@ class CourseStructureCache(object):
 
     def get(self, key, course_context=None):
         """Pull the compressed, pickled struct data from cache and deserialize."""
+        return self.get_with_size(key, course_context)[0]
+
+    def get_with_size(self, key, course_context=None):
+        """
+        Pull the compressed, pickled struct data from cache and deserialize.
+        Returns the structure, or None if not found, along with the size of
+        its pickled data.
+        """
         if self.cache is None:
-            return None
+            return None, 0
 
         with TIMER.timer("CourseStructureCache.get", course_context) as tagger:
             compressed_pickled_data = self.cache.get(key)
@@ -253,14 +265,14 @@ class CourseStructureCache(object):
             if compressed_pickled_data is None:
                 # Always log cache misses, because they are unexpected
                 tagger.sample_rate = 1
-                return None
+                return None, 0
 
             tagger.measure('compressed_size', len(compressed_pickled_data))
 
             pickled_data = zlib.decompress(compressed_pickled_data)
             tagger.measure('uncompressed_size', len(pickled_data))
 
-            return pickle.loads(pickled_data)
+            return pickle.loads(pickled_data), len(pickled_data)
 
     def set(self, key, structure, course_context=None):
         """Given a structure, will pickle, compress, and write to cache."""
@@ -279,16 +291,81 @@ class CourseStructureCache(object):
             self.cache.set(key, compressed_pickled_data, None)
 
 
+class LocalDocumentCache(object):
+    """
+    Process-local, least recently used cache of decoded structures and
+    definitions, bounded by the total size of their encodings.
+
+    Structures and definitions are immutable once written, so they are
+    cached by id and never need to be invalidated.  The cached documents
+    are shared by all callers in the process, which must not modify
+    them.
+    """
+    def __init__(self, max_size):
+        """
+        Arguments:
+            max_size (int): The maximum total size, in bytes, of the
+                encodings of the cached documents.
+        """
+        self.max_size = max_size
+        self._size = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key):
+        """
+        Returns the cached document for the given key, or None if not found.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+            # Re-insert the entry to mark it as the most recently used.
+            self._entries[key] = entry
+        return entry[0]
+
+    def add(self, key, document, size):
+        """
+        Caches the given document for the given key, evicting the least
+        recently used documents as needed to stay within max_size.
+
+        Arguments:
+            size (int): The size, in bytes, of the encoding of the document.
+        """
+        if size > self.max_size:
+            return
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is not None:
+                self._size -= entry[1]
+            while self._entries and self._size + size > self.max_size:
+                __, (__, evicted_size) = self._entries.popitem(last=False)
+                self._size -= evicted_size
+            self._entries[key] = (document, size)
+            self._size += size
+
+    def clear(self):
+        """
+        Evicts all documents.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+
 class MongoConnection(object):
     """
     Segregation of pymongo functions from the data modeling mechanisms for split modulestore.
     """
     def __init__(
         self, db, collection, host, port=27017, tz_aware=True, user=None, password=None,
-        asset_collection=None, retry_wait_time=0.1, **kwargs
+        asset_collection=None, retry_wait_time=0.1, local_cache_max_size=0, **kwargs
     ):
         """
         Create & open the connection, authenticate, and provide pointers to the collections
+
+        If local_cache_max_size isn't 0, structures and definitions are also cached
+        in a LocalDocumentCache of that size, shared by all requests in the process.
         """
         # Set a write concern of 1, which makes writes complete successfully to the primary
         # only before returning. Also makes pymongo report write errors.
@@ -304,6 +381,8 @@ class MongoConnection(object):
         self.structures = self.database[collection + '.structures']
         self.definitions = self.database[collection + '.definitions']
 
+        self.local_cache = LocalDocumentCache(local_cache_max_size) if local_cache_max_size else None
+
     def heartbeat(self):
         """
         Check that the db is reachable.
@@ -318,11 +397,18 @@ class MongoConnection(object):
         Get the structure from the persistence mechanism whose id is the given key.
 
         This method will use a cached version of the structure if it is available.
+        The structure may be shared with other callers, so it must not be modified.
         """
         with TIMER.timer("get_structure", course_context) as tagger_get_structure:
+            if self.local_cache is not None:
+                structure = self.local_cache.get((u'structure', key))
+                tagger_get_structure.tag(from_local_cache=str(bool(structure)).lower())
+                if structure:
+                    return structure
+
             cache = CourseStructureCache()
 
-            structure = cache.get(key, course_context)
+            structure, size = cache.get_with_size(key, course_context)
             tagger_get_structure.tag(from_cache=str(bool(structure)).lower())
             if not structure:
                 # Always log cache misses, because they are unexpected
@@ -337,11 +423,16 @@ class MongoConnection(object):
                         )
                         return None
                     tagger_find_one.measure("blocks", len(doc['blocks']))
+                    if self.local_cache is not None:
+                        size = len(BSON.encode(doc))
                     structure = structure_from_mongo(doc, course_context)
                     tagger_find_one.sample_rate = 1
 
                 cache.set(key, structure, course_context)
 
+            if self.local_cache is not None:
+                self.local_cache.add((u'structure', key), structure, size)
+
             return structure
 
     @autoretry_read()
@@ -523,7 +614,11 @@ class MongoConnection(object):
         Get the definition from the persistence mechanism whose id is the given key
         """
         with TIMER.timer("get_definition", course_context) as tagger:
-            definition = self.definitions.find_one({'_id': key})
+            definition = self._get_cached_definition(key)
+            tagger.tag(from_local_cache=str(definition is not None).lower())
+            if definition is None:
+                definition = self.definitions.find_one({'_id': key})
+                self._cache_definition(definition)
             tagger.measure("fields", len(definition['fields']))
             tagger.tag(block_type=definition['block_type'])
             return definition
@@ -534,8 +629,40 @@ class MongoConnection(object):
         """
         with TIMER.timer("get_definitions", course_context) as tagger:
             tagger.measure('definitions', len(definitions))
-            definitions = self.definitions.find({'_id': {'$in': definitions}})
-            return definitions
+            if self.local_cache is None:
+                return self.definitions.find({'_id': {'$in': definitions}})
+
+            found_definitions = []
+            missing_ids = []
+            for definition_id in definitions:
+                definition = self._get_cached_definition(definition_id)
+                if definition is None:
+                    missing_ids.append(definition_id)
+                else:
+                    found_definitions.append(definition)
+            tagger.measure('from_local_cache', len(found_definitions))
+
+            if missing_ids:
+                for definition in self.definitions.find({'_id': {'$in': missing_ids}}):
+                    self._cache_definition(definition)
+                    found_definitions.append(definition)
+            return found_definitions
+
+    def _get_cached_definition(self, key):
+        """
+        Returns the definition whose id is the given key from the local cache,
+        or None if it isn't cached.
+        """
+        if self.local_cache is None:
+            return None
+        return self.local_cache.get((u'definition', key))
+
+    def _cache_definition(self, definition):
+        """
+        Adds the given definition, as read from the database, to the local cache.
+        """
+        if self.local_cache is not None and definition is not None:
+            self.local_cache.add((u'definition', definition['_id']), definition, len(BSON.encode(definition)))
 
     def insert_definition(self, definition, course_context=None):
         """
@@ -591,6 +718,9 @@ class MongoConnection(object):
         """
         connection = self.database.connection
 
+        if self.local_cache is not None:
+            self.local_cache.clear()
+
         if database:
             connection.drop_database(self.database.name)
         elif collections:
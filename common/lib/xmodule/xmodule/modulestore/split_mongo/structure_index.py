@@ -0,0 +1,145 @@
+"""
+Secondary indexes over split structures, so that queries on a structure's
+blocks don't need to scan all of them.
+"""
+from collections import OrderedDict, defaultdict
+from threading import Lock
+
+
+# The block types that are roots of a structure's tree when they have no parent.
+ROOT_BLOCK_TYPES = ('course', 'library')
+
+
+class StructureIndex(object):
+    """
+    Indexes of the blocks of a structure, by block type and by child, along
+    with the set of blocks that have a path to the root.
+
+    Each index is built the first time it is used.  The structure must not
+    be modified afterwards.
+    """
+    def __init__(self, structure):
+        self.structure = structure
+        self._blocks_by_type = None
+        self._parents = None
+        self._blocks_without_parents = None
+        self._reachable = None
+
+    @property
+    def num_blocks(self):
+        """
+        The number of blocks in the structure.
+        """
+        return len(self.structure['blocks'])
+
+    def get_blocks_of_type(self, block_type):
+        """
+        Returns the list of the keys of the blocks of the given block_type.
+        """
+        if self._blocks_by_type is None:
+            blocks_by_type = defaultdict(list)
+            for block_key in self.structure['blocks']:
+                blocks_by_type[block_key.type].append(block_key)
+            self._blocks_by_type = dict(blocks_by_type)
+        return self._blocks_by_type.get(block_type, [])
+
+    def get_parents(self, block_key):
+        """
+        Returns the list of the keys of the parents of the given block.
+        """
+        return self.parents.get(block_key, [])
+
+    @property
+    def parents(self):
+        """
+        A dict mapping the key of each block that is a child of another
+        block to the list of the keys of its parents.
+        """
+        if self._parents is None:
+            parents = defaultdict(list)
+            for parent_key, block_data in self.structure['blocks'].iteritems():
+                for child_key in block_data.fields.get('children', []):
+                    parents[child_key].append(parent_key)
+            self._parents = dict(parents)
+        return self._parents
+
+    def get_blocks_without_parents(self):
+        """
+        Returns the list of the keys of the blocks that aren't the child of
+        any block, including the root.
+        """
+        if self._blocks_without_parents is None:
+            parents = self.parents
+            self._blocks_without_parents = [
+                block_key for block_key in self.structure['blocks'] if block_key not in parents
+            ]
+        return self._blocks_without_parents
+
+    def has_path_to_root(self, block_key):
+        """
+        Returns whether the given block has a path to a root of the
+        structure, that is to a course or library block without parents.
+        """
+        if self._reachable is None:
+            roots = [
+                root_key
+                for root_key in self.get_blocks_without_parents()
+                if root_key.type in ROOT_BLOCK_TYPES
+            ]
+            reachable = set(roots)
+            stack = list(roots)
+            while stack:
+                block_data = self.structure['blocks'].get(stack.pop())
+                if block_data is None:
+                    continue
+                for child_key in block_data.fields.get('children', []):
+                    if child_key not in reachable:
+                        reachable.add(child_key)
+                        stack.append(child_key)
+            self._reachable = reachable
+        return block_key in self._reachable
+
+
+class StructureIndexCache(object):
+    """
+    Process-local, least recently used cache of the StructureIndexes of
+    structures that are immutable, keyed by the structures' ids and
+    bounded by the total number of blocks of the indexed structures.
+    """
+    def __init__(self, max_blocks):
+        self.max_blocks = max_blocks
+        self._num_blocks = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, structure):
+        """
+        Returns the StructureIndex of the given structure, creating and
+        caching it if needed.
+        """
+        structure_id = structure['_id']
+        with self._lock:
+            index = self._entries.pop(structure_id, None)
+            if index is not None:
+                # Re-insert the entry to mark it as the most recently used.
+                self._entries[structure_id] = index
+                return index
+
+        index = StructureIndex(structure)
+        if index.num_blocks <= self.max_blocks:
+            with self._lock:
+                if structure_id not in self._entries:
+                    while self._entries and self._num_blocks + index.num_blocks > self.max_blocks:
+                        __, evicted_index = self._entries.popitem(last=False)
+                        self._num_blocks -= evicted_index.num_blocks
+                    self._entries[structure_id] = index
+                    self._num_blocks += index.num_blocks
+        return index
+
+    def clear(self):
+        """
+        Evicts all StructureIndexes.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._num_blocks = 0
@@ -29,6 +29,7 @@ from ccx_keys.locator import CCXBlockUsageLocator
 from xmodule.modulestore.inheritance import InheritanceMixin
 from xmodule.x_module import XModuleMixin
 from xmodule.fields import Date, Timedelta
+from xmodule.modulestore.split_mongo.mongo_connection import LocalDocumentCache
 from xmodule.modulestore.split_mongo.split import SplitMongoModuleStore
 from xmodule.modulestore.tests.test_modulestore import check_has_course_method
 from xmodule.modulestore.split_mongo import BlockKey
@@ -999,6 +1000,25 @@ class TestCourseStructureCache(SplitModuleTest):
         # now make sure that you get the same structure
         self.assertEqual(cached_structure, not_cached_structure)
 
+    def test_local_cache(self):
+        with patch.object(modulestore().db_connection, 'local_cache', LocalDocumentCache(10 * 1024 * 1024)):
+            with check_mongo_calls(1):
+                not_cached_structure = self._get_structure(self.new_course)
+
+            # the structure is now decoded in this process' memory
+            with check_mongo_calls(0):
+                cached_structure = self._get_structure(self.new_course)
+
+            self.assertIs(cached_structure, not_cached_structure)
+
+            root_block = cached_structure['blocks'][cached_structure['root']]
+            definition_id = root_block.definition
+            with check_mongo_calls(1):
+                definition = modulestore().db_connection.get_definition(definition_id)
+            with check_mongo_calls(0):
+                self.assertIs(modulestore().db_connection.get_definition(definition_id), definition)
+                self.assertEqual(modulestore().db_connection.get_definitions([definition_id]), [definition])
+
     def _get_structure(self, course):
         """
         Helper function to get a structure from a course.
@@ -1,7 +1,7 @@
 """ Test the behavior of split_mongo/MongoConnection """
 import unittest
 from mock import patch
-from xmodule.modulestore.split_mongo.mongo_connection import MongoConnection
+from xmodule.modulestore.split_mongo.mongo_connection import LocalDocumentCache, MongoConnection
 from xmodule.exceptions import HeartbeatFailure
 
 
@@ -17,3 +17,42 @@ class TestHeartbeatFailureException(unittest.TestCase):
 
             with self.assertRaises(HeartbeatFailure):
                 useless_conn.heartbeat()
+
+
+class TestLocalDocumentCache(unittest.TestCase):
+    """ Test the LocalDocumentCache """
+    def setUp(self):
+        super(TestLocalDocumentCache, self).setUp()
+        self.cache = LocalDocumentCache(max_size=10)
+
+    def test_get_and_add(self):
+        self.assertIsNone(self.cache.get('a'))
+        document = {'_id': 'a'}
+        self.cache.add('a', document, 3)
+        self.assertIs(self.cache.get('a'), document)
+
+    def test_too_large(self):
+        self.cache.add('a', {'_id': 'a'}, 11)
+        self.assertIsNone(self.cache.get('a'))
+
+    def test_least_recently_used_eviction(self):
+        for key in ('a', 'b', 'c'):
+            self.cache.add(key, {'_id': key}, 3)
+        # mark 'a' as the most recently used
+        self.cache.get('a')
+        self.cache.add('d', {'_id': 'd'}, 3)
+        self.assertIsNone(self.cache.get('b'))
+        for key in ('a', 'c', 'd'):
+            self.assertEqual(self.cache.get(key), {'_id': key})
+
+    def test_replace(self):
+        self.cache.add('a', {'_id': 'a'}, 6)
+        self.cache.add('a', {'_id': 'a', 'new': True}, 6)
+        self.assertEqual(self.cache.get('a'), {'_id': 'a', 'new': True})
+
+    def test_clear(self):
+        self.cache.add('a', {'_id': 'a'}, 3)
+        self.cache.clear()
+        self.assertIsNone(self.cache.get('a'))
+        self.cache.add('b', {'_id': 'b'}, 10)
+        self.assertIsNotNone(self.cache.get('b'))
@@ -0,0 +1,107 @@
+""" Test the split_mongo/structure_index module """
+import unittest
+
+from xmodule.modulestore import BlockData
+from xmodule.modulestore.split_mongo import BlockKey
+from xmodule.modulestore.split_mongo.structure_index import StructureIndex, StructureIndexCache
+
+
+def make_structure(structure_id, children_map):
+    """
+    Returns a structure with the given id, whose blocks have the children
+    given by children_map.
+    """
+    return {
+        '_id': structure_id,
+        'root': BlockKey('course', 'course'),
+        'blocks': {
+            block_key: BlockData(block_type=block_key.type, fields={'children': children})
+            for block_key, children in children_map.iteritems()
+        },
+    }
+
+
+class TestStructureIndex(unittest.TestCase):
+    """ Test StructureIndex """
+    def setUp(self):
+        super(TestStructureIndex, self).setUp()
+        self.course = BlockKey('course', 'course')
+        self.chapter = BlockKey('chapter', 'chapter')
+        self.problem = BlockKey('problem', 'problem')
+        self.other_problem = BlockKey('problem', 'other_problem')
+        self.orphan = BlockKey('vertical', 'orphan')
+        self.orphan_child = BlockKey('html', 'orphan_child')
+        self.structure = make_structure('structure', {
+            self.course: [self.chapter],
+            self.chapter: [self.problem, self.other_problem],
+            self.problem: [],
+            self.other_problem: [],
+            self.orphan: [self.orphan_child, self.problem],
+            self.orphan_child: [],
+        })
+        self.index = StructureIndex(self.structure)
+
+    def test_blocks_of_type(self):
+        self.assertEqual(set(self.index.get_blocks_of_type('problem')), {self.problem, self.other_problem})
+        self.assertEqual(self.index.get_blocks_of_type('course'), [self.course])
+        self.assertEqual(self.index.get_blocks_of_type('video'), [])
+
+    def test_parents(self):
+        self.assertEqual(self.index.get_parents(self.course), [])
+        self.assertEqual(self.index.get_parents(self.chapter), [self.course])
+        self.assertEqual(set(self.index.get_parents(self.problem)), {self.chapter, self.orphan})
+
+    def test_blocks_without_parents(self):
+        self.assertEqual(set(self.index.get_blocks_without_parents()), {self.course, self.orphan})
+
+    def test_has_path_to_root(self):
+        for block_key in (self.course, self.chapter, self.problem, self.other_problem):
+            self.assertTrue(self.index.has_path_to_root(block_key))
+        for block_key in (self.orphan, self.orphan_child):
+            self.assertFalse(self.index.has_path_to_root(block_key))
+
+    def test_cycle(self):
+        first = BlockKey('vertical', 'first')
+        second = BlockKey('vertical', 'second')
+        index = StructureIndex(make_structure('cycle', {
+            self.course: [],
+            first: [second],
+            second: [first],
+        }))
+        self.assertTrue(index.has_path_to_root(self.course))
+        self.assertFalse(index.has_path_to_root(first))
+        self.assertFalse(index.has_path_to_root(second))
+
+
+class TestStructureIndexCache(unittest.TestCase):
+    """ Test StructureIndexCache """
+    def setUp(self):
+        super(TestStructureIndexCache, self).setUp()
+        self.cache = StructureIndexCache(max_blocks=4)
+        self.structures = [
+            make_structure(structure_id, {BlockKey('course', 'course'): [], BlockKey('html', 'html'): []})
+            for structure_id in ('first', 'second', 'third')
+        ]
+
+    def test_get(self):
+        index = self.cache.get(self.structures[0])
+        self.assertIs(index.structure, self.structures[0])
+        self.assertIs(self.cache.get(self.structures[0]), index)
+
+    def test_least_recently_used_eviction(self):
+        first_index = self.cache.get(self.structures[0])
+        second_index = self.cache.get(self.structures[1])
+        # mark the first index as the most recently used
+        self.cache.get(self.structures[0])
+        self.cache.get(self.structures[2])
+        self.assertIs(self.cache.get(self.structures[0]), first_index)
+        self.assertIsNot(self.cache.get(self.structures[1]), second_index)
+
+    def test_too_large(self):
+        structure = make_structure('large', {BlockKey('html', str(index)): [] for index in range(5)})
+        self.assertIsNot(self.cache.get(structure), self.cache.get(structure))
+
+    def test_clear(self):
+        index = self.cache.get(self.structures[0])
+        self.cache.clear()
+        self.assertIsNot(self.cache.get(self.structures[0]), index)
@@ -21,10 +21,12 @@ from webob.multidict import MultiDict
 import xmodule
 from xmodule.tests import DATA_DIR
 from capa import responsetypes
+from capa.safe_exec import TwoTierCache
 from capa.responsetypes import (StudentInputError, LoncapaProblemError,
                                 ResponseError)
 from capa.xqueue_interface import XQueueInterface
 from xmodule.capa_module import CapaModule, CapaDescriptor, ComplexEncoder
+from xmodule.x_module import DoNothingCache
 from opaque_keys.edx.locations import Location
 from xblock.field_data import DictFieldData
 from xblock.fields import ScopeIds
@@ -212,6 +214,19 @@ class CapaModuleTest(unittest.TestCase):
         other_module = CapaFactory.create(correct=True)
         self.assertEqual(other_module.get_score()['score'], 1)
 
+    def test_safe_exec_cache(self):
+        """
+        Check that safe_exec results are only cached by the process when the runtime has a cache.
+        """
+        module = CapaFactory.create()
+        self.assertIsInstance(module.runtime.cache, DoNothingCache)
+        self.assertIs(module.lcp.capa_system.cache, module.runtime.cache)
+
+        module.runtime.cache = Mock()
+        lcp = module.new_lcp(module.get_state_for_lcp())
+        self.assertIsInstance(lcp.capa_system.cache, TwoTierCache)
+        self.assertIs(lcp.capa_system.cache.shared_cache, module.runtime.cache)
+
     def test_get_score(self):
         """
         Do 1 test where the internals of get_score are properly set
@@ -4,10 +4,13 @@ by the individual custom courses feature.
 """
 import json
 import logging
+from uuid import uuid4
 
+from django.core.cache import cache
 from django.db import transaction
 
 import request_cache
+from util.db import call_after_transaction
 
 from courseware.field_overrides import FieldOverrideProvider
 from opaque_keys.edx.keys import CourseKey, UsageKey
@@ -18,6 +21,11 @@ from lms.djangoapps.ccx.models import CcxFieldOverride, CustomCourseForEdX
 
 log = logging.getLogger(__name__)
 
+# The overrides of a CCX are cached across requests under a version that
+# changes whenever they're changed.
+OVERRIDES_CACHE_KEY = u'ccx.overrides.{ccx_id}.{version}'
+OVERRIDES_VERSION_CACHE_KEY = u'ccx.overrides.version.{ccx_id}'
+
 
 class CustomCoursesForEdxOverrideProvider(FieldOverrideProvider):
     """
@@ -126,22 +134,62 @@ def _get_overrides_for_ccx(ccx):
     overrides_cache = request_cache.get_cache('ccx-overrides')
 
     if ccx not in overrides_cache:
-        overrides = {}
-        query = CcxFieldOverride.objects.filter(
-            ccx=ccx,
-        )
-
-        for override in query:
-            block_overrides = overrides.setdefault(override.location, {})
-            block_overrides[override.field] = json.loads(override.value)
-            block_overrides[override.field + "_id"] = override.id
-            block_overrides[override.field + "_instance"] = override
+        cache_key = OVERRIDES_CACHE_KEY.format(ccx_id=ccx.id, version=_get_overrides_version(ccx))
+        overrides = cache.get(cache_key)
+        if overrides is None:
+            overrides = {}
+            query = CcxFieldOverride.objects.filter(
+                ccx=ccx,
+            )
+
+            for override in query:
+                block_overrides = overrides.setdefault(override.location, {})
+                block_overrides[override.field] = json.loads(override.value)
+                block_overrides[override.field + "_id"] = override.id
+                block_overrides[override.field + "_instance"] = override
+
+            # The model instances aren't cached across requests;
+            # override_field_for_ccx fetches them when they're missing.
+            cache.set(cache_key, {
+                location: {
+                    key: value for key, value in block_overrides.iteritems() if not key.endswith("_instance")
+                }
+                for location, block_overrides in overrides.iteritems()
+            })
 
         overrides_cache[ccx] = overrides
 
     return overrides_cache[ccx]
 
 
+def _get_overrides_version(ccx):
+    """
+    Returns the version under which the overrides of the `ccx` are cached
+    across requests.
+    """
+    version_key = OVERRIDES_VERSION_CACHE_KEY.format(ccx_id=ccx.id)
+    version = cache.get(version_key)
+    if version is None:
+        # A new random version, rather than a counter, so that overrides
+        # cached under an evicted version are never used again.
+        cache.add(version_key, uuid4().hex, None)
+        version = cache.get(version_key)
+    return version
+
+
+def _invalidate_overrides(ccx):
+    """
+    Changes the version of the overrides of the `ccx` cached across
+    requests, after they've been changed.
+
+    The version is changed again once the transaction is over, since until
+    it is committed, other requests read and cache the previous overrides.
+    """
+    version_key = OVERRIDES_VERSION_CACHE_KEY.format(ccx_id=ccx.id)
+    cache.set(version_key, uuid4().hex, None)
+    call_after_transaction(lambda: cache.set(version_key, uuid4().hex, None))
+
+
 @transaction.atomic
 def override_field_for_ccx(ccx, block, name, value):
     """
@@ -152,7 +200,7 @@ def override_field_for_ccx(ccx, block, name, value):
     field = block.fields[name]
     value_json = field.to_json(value)
     serialized_value = json.dumps(value_json)
-    override_has_changes = False
+    override_has_changes = created = False
     clean_ccx_key = _clean_ccx_key(block.location)
 
     override = get_override_for_ccx(ccx, block, name + "_instance")
@@ -175,6 +223,9 @@ def override_field_for_ccx(ccx, block, name, value):
         override.value = serialized_value
         override.save()
 
+    if created or override_has_changes:
+        _invalidate_overrides(ccx)
+
     _get_overrides_for_ccx(ccx).setdefault(clean_ccx_key, {})[name] = value_json
     _get_overrides_for_ccx(ccx).setdefault(clean_ccx_key, {})[name + "_instance"] = override
 
@@ -193,6 +244,7 @@ def clear_override_for_ccx(ccx, block, name):
             field=name).delete()
 
         clear_ccx_field_info_from_ccx_map(ccx, block, name)
+        _invalidate_overrides(ccx)
 
     except CcxFieldOverride.DoesNotExist:
         pass
@@ -220,3 +272,4 @@ def bulk_delete_ccx_override_fields(ccx, ids):
     ids = list(set(ids))
     if ids:
         CcxFieldOverride.objects.filter(ccx=ccx, id__in=ids).delete()
+        _invalidate_overrides(ccx)
@@ -15,6 +15,7 @@ from certificates.models import (
     CertificateStatuses,
     GeneratedCertificate,
     certificate_status_for_student,
+    certificate_statuses_for_students,
     certificate_info_for_user
 )
 from certificates.tests.factories import GeneratedCertificateFactory
@@ -41,6 +42,26 @@ class CertificatesModelTest(ModuleStoreTestCase, MilestonesTestCaseMixin):
         self.assertEqual(certificate_status['status'], CertificateStatuses.unavailable)
         self.assertEqual(certificate_status['mode'], GeneratedCertificate.MODES.honor)
 
+    def test_certificate_statuses_for_students(self):
+        students = [UserFactory(), UserFactory()]
+        course = CourseFactory.create(org='edx', number='verified', display_name='Verified Course')
+        GeneratedCertificateFactory.create(
+            user=students[0],
+            course_id=course.id,
+            status=CertificateStatuses.downloadable,
+            mode='verified',
+            download_url='http://www.example.com/certificate.pdf',
+        )
+
+        with self.assertNumQueries(1):
+            certificate_statuses = certificate_statuses_for_students(students, course.id)
+        self.assertEqual(
+            certificate_statuses,
+            {student.id: certificate_status_for_student(student, course.id) for student in students}
+        )
+        self.assertEqual(certificate_statuses[students[0].id]['status'], CertificateStatuses.downloadable)
+        self.assertEqual(certificate_statuses[students[1].id]['status'], CertificateStatuses.unavailable)
+
     @unpack
     @data(
         {'allow_certificate': False, 'whitelisted': False, 'grade': None, 'output': ['N', 'N', 'N/A']},
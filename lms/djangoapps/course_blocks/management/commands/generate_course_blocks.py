@@ -4,10 +4,13 @@ Command to load course blocks.
 import logging
 
 from django.core.management.base import BaseCommand
+from django.db.models import Q
+from django.utils import timezone
 from xmodule.modulestore.django import modulestore
 
 import openedx.core.djangoapps.content.block_structure.api as api
 import openedx.core.djangoapps.content.block_structure.tasks as tasks
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 import openedx.core.lib.block_structure.cache as cache
 from openedx.core.lib.command_utils import (
     get_mutually_exclusive_required_option,
@@ -24,6 +27,9 @@ class Command(BaseCommand):
     Example usage:
         $ ./manage.py lms generate_course_blocks --all --settings=devstack
         $ ./manage.py lms generate_course_blocks 'edX/DemoX/Demo_Course' --settings=devstack
+
+    To pre-warm the block structures cache, such as after a deployment:
+        $ ./manage.py lms generate_course_blocks --active_courses --settings=devstack
     """
     args = '<course_id course_id ...>'
     help = 'Generates and stores course blocks for one or more courses.'
@@ -44,6 +50,12 @@ class Command(BaseCommand):
             action='store_true',
             default=False,
         )
+        parser.add_argument(
+            '--active_courses',
+            help='Generate course blocks for all courses that have not ended.',
+            action='store_true',
+            default=False,
+        )
         parser.add_argument(
             '--enqueue_task',
             help='Enqueue the tasks for asynchronous computation.',
@@ -76,7 +88,7 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
 
-        courses_mode = get_mutually_exclusive_required_option(options, 'courses', 'all_courses')
+        courses_mode = get_mutually_exclusive_required_option(options, 'courses', 'all_courses', 'active_courses')
         validate_dependent_option(options, 'routing_key', 'enqueue_task')
         validate_dependent_option(options, 'start_index', 'all_courses')
         validate_dependent_option(options, 'end_index', 'all_courses')
@@ -86,6 +98,12 @@ class Command(BaseCommand):
             if options.get('start_index'):
                 end = options.get('end_index') or len(course_keys)
                 course_keys = course_keys[options['start_index']:end]
+        elif courses_mode == 'active_courses':
+            course_keys = list(
+                CourseOverview.objects.filter(
+                    Q(end__isnull=True) | Q(end__gt=timezone.now())
+                ).values_list('id', flat=True)
+            )
         else:
             course_keys = parse_course_keys(options['courses'])
 
@@ -1,16 +1,20 @@
 """
 Tests for generate_course_blocks management command.
 """
+from datetime import datetime
+
 import ddt
 from django.core.management.base import CommandError
 import itertools
 from mock import patch
+from pytz import UTC
 
 from xmodule.modulestore import ModuleStoreEnum
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from .. import generate_course_blocks
 from openedx.core.djangoapps.content.block_structure.tests.helpers import is_course_in_block_structure_cache
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview
 
 
 @ddt.ddt
@@ -64,6 +68,14 @@ class TestGenerateCourseBlocks(ModuleStoreTestCase):
             self.command.handle(all_courses=True, force_update=force_update)
             self.assertEqual(mock_update_from_store.call_count, self.num_courses if force_update else 0)
 
+    def test_active_courses(self):
+        ended_course = CourseFactory.create(end=datetime(2000, 1, 1, tzinfo=UTC))
+        for course_key in self.course_keys + [ended_course.id]:
+            CourseOverview.get_from_id(course_key)
+        self.command.handle(active_courses=True)
+        self._assert_courses_in_block_cache(*self.course_keys)
+        self._assert_courses_not_in_block_cache(ended_course.id)
+
     def test_one_course(self):
         self._assert_courses_not_in_block_cache(*self.course_keys)
         self.command.handle(courses=[unicode(self.course_keys[0])])
@@ -132,7 +144,9 @@ class TestGenerateCourseBlocks(ModuleStoreTestCase):
             self.command.handle(all_courses=False)
 
     def test_no_course_mode(self):
-        with self.assertRaisesMessage(CommandError, 'Either --courses or --all_courses must be specified.'):
+        with self.assertRaisesMessage(
+            CommandError, 'Either --courses or --all_courses or --active_courses must be specified.'
+        ):
             self.command.handle()
 
     def test_both_course_modes(self):
@@ -28,7 +28,8 @@ from .models import (
     StudentModule,
     XModuleUserStateSummaryField,
     XModuleStudentPrefsField,
-    XModuleStudentInfoField
+    XModuleStudentInfoField,
+    chunks,
 )
 import logging
 from opaque_keys.edx.keys import CourseKey, UsageKey
@@ -944,6 +945,9 @@ class ScoresClient(object):
     """
     Score = namedtuple('Score', 'correct total')
 
+    # Maximum number of locations in each query made by create_for_users.
+    LOCATIONS_CHUNK_SIZE = 500
+
     def __init__(self, course_key, user_id):
         self.course_key = course_key
         self.user_id = user_id
@@ -993,6 +997,31 @@ class ScoresClient(object):
         client.fetch_scores(scorable_locations)
         return client
 
+    @classmethod
+    def create_for_users(cls, course_id, user_ids, scorable_locations):
+        """
+        Create a ScoresClient for each of the given users, with pre-fetched
+        data for the given locations, using a single query per chunk of
+        LOCATIONS_CHUNK_SIZE locations.  Returns a dict of ScoresClients
+        keyed by user id.
+        """
+        clients = {user_id: cls(course_id, user_id) for user_id in user_ids}
+        for locations in chunks(set(scorable_locations), cls.LOCATIONS_CHUNK_SIZE):
+            scores_qset = StudentModule.objects.filter(
+                student_id__in=user_ids,
+                course_id=course_id,
+                module_state_key__in=locations,
+            )
+            for user_id, location, correct, total in scores_qset.values_list(
+                    'student_id', 'module_state_key', 'grade', 'max_grade'
+            ):
+                clients[user_id]._locations_to_scores[  # pylint: disable=protected-access
+                    UsageKey.from_string(location).map_into_course(course_id)
+                ] = cls.Score(correct, total)
+        for client in clients.itervalues():
+            client._has_fetched = True  # pylint: disable=protected-access
+        return clients
+
 
 # @contract(user_id=int, usage_key=UsageKey, score="number|None", max_score="number|None")
 def set_score(user_id, usage_key, score, max_score):
@@ -19,6 +19,7 @@ from django.contrib.auth.models import User
 from django.conf import settings
 from django.db import models
 from django.db.models.signals import post_save
+from django.dispatch import Signal
 
 from model_utils.models import TimeStampedModel
 import coursewarehistoryextended
@@ -29,6 +30,13 @@ from openedx.core.djangoapps.xmodule_django.models import (
 
 log = logging.getLogger("edx.courseware")
 
+# Sent instead of post_save, with the list of their instances, when
+# StudentModules are created or updated in bulk, as by set_many of
+# DjangoXBlockUserStateClient.  Receivers of post_save for StudentModule
+# are not called for those writes, so any that must see them also has to
+# be connected to this signal, as the history receivers are.
+student_modules_bulk_saved = Signal(providing_args=['instances'])
+
 
 def chunks(items, chunk_size):
     """
@@ -174,6 +182,25 @@ class BaseStudentModuleHistory(models.Model):
         """
         return StudentModule.objects.get(pk=self.student_module_id)
 
+    @classmethod
+    def bulk_create_history(cls, student_modules):
+        """
+        Creates the history entries of the given StudentModules whose
+        module_type is one that we save, with a single query.
+        """
+        cls.objects.bulk_create([
+            cls(
+                student_module=student_module,
+                version=None,
+                created=student_module.modified,
+                state=student_module.state,
+                grade=student_module.grade,
+                max_grade=student_module.max_grade,
+            )
+            for student_module in student_modules
+            if student_module.module_type in cls.HISTORY_SAVING_TYPES
+        ])
+
     @staticmethod
     def get_history(student_modules):
         """
@@ -229,11 +256,18 @@ class StudentModuleHistory(BaseStudentModuleHistory):
                                                  max_grade=instance.max_grade)
             history_entry.save()
 
+    def save_history_in_bulk(sender, instances, **kwargs):  # pylint: disable=no-self-argument, unused-argument
+        """
+        Creates the StudentModuleHistory entries of StudentModules saved in bulk.
+        """
+        StudentModuleHistory.bulk_create_history(instances)
+
     # When the extended studentmodulehistory table exists, don't save
     # duplicate history into courseware_studentmodulehistory, just retain
     # data for reading.
     if not settings.FEATURES.get('ENABLE_CSMH_EXTENDED'):
         post_save.connect(save_history, sender=StudentModule)
+        student_modules_bulk_saved.connect(save_history_in_bulk, sender=StudentModule)
 
 
 class XBlockFieldBase(models.Model):
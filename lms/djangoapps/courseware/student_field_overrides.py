@@ -4,6 +4,8 @@ by the individual due dates feature.
 """
 import json
 
+import request_cache
+
 from .field_overrides import FieldOverrideProvider
 from .models import StudentFieldOverride
 
@@ -43,19 +45,48 @@ def _get_overrides_for_user(user, block):
     Gets all of the individual student overrides for given user and block.
     Returns a dictionary of field override values keyed by field name.
     """
-    query = StudentFieldOverride.objects.filter(
-        course_id=block.runtime.course_id,
-        location=block.location,
-        student_id=user.id,
-    )
+    course_id = block.runtime.course_id
+    course_overrides = _get_course_overrides_for_user(user, course_id)
     overrides = {}
-    for override in query:
-        field = block.fields[override.field]
-        value = field.from_json(json.loads(override.value))
-        overrides[override.field] = value
+    for field_name, value in course_overrides.get(block.location.map_into_course(course_id), {}).iteritems():
+        field = block.fields[field_name]
+        overrides[field_name] = field.from_json(value)
     return overrides
 
 
+def _get_course_overrides_for_user(user, course_id):
+    """
+    Gets all of the individual student overrides for given user in the course,
+    with one query per request.  Returns a dictionary mapping block locations
+    to dictionaries of the json values of their overridden fields, keyed by
+    field name.
+    """
+    overrides_cache = request_cache.get_cache('student-field-overrides')
+    cache_key = (user.id, course_id)
+    if cache_key not in overrides_cache:
+        query = StudentFieldOverride.objects.filter(
+            course_id=course_id,
+            student_id=user.id,
+        )
+        overrides = {}
+        for override in query:
+            block_overrides = overrides.setdefault(override.location.map_into_course(course_id), {})
+            block_overrides[override.field] = json.loads(override.value)
+        overrides_cache[cache_key] = overrides
+    return overrides_cache[cache_key]
+
+
+def _clear_cached_overrides_for_user(user, block):
+    """
+    Clears the overrides cached for the `user` in the request and on `block`,
+    after one of them has been changed.
+    """
+    overrides_cache = request_cache.get_cache('student-field-overrides')
+    overrides_cache.pop((user.id, block.runtime.course_id), None)
+    if hasattr(block, '_student_overrides'):
+        block._student_overrides.pop(user.id, None)  # pylint: disable=protected-access
+
+
 def override_field_for_user(user, block, name, value):
     """
     Overrides a field for the `user`.  `block` and `name` specify the block
@@ -70,6 +101,7 @@ def override_field_for_user(user, block, name, value):
     field = block.fields[name]
     override.value = json.dumps(field.to_json(value))
     override.save()
+    _clear_cached_overrides_for_user(user, block)
 
 
 def clear_override_for_user(user, block, name):
@@ -87,3 +119,4 @@ def clear_override_for_user(user, block, name):
             field=name).delete()
     except StudentFieldOverride.DoesNotExist:
         pass
+    _clear_cached_overrides_for_user(user, block)
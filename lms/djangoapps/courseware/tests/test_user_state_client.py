@@ -6,7 +6,12 @@ defined in edx_user_state_client.
 from collections import defaultdict
 from unittest import skip
 
+import ddt
+from django.db.utils import IntegrityError
 from django.test import TestCase
+from mock import patch
+from opaque_keys.edx.locator import CourseLocator
+from xblock.fields import Scope
 
 from edx_user_state_client.tests import UserStateClientTestBase
 from courseware.user_state_client import DjangoXBlockUserStateClient
@@ -67,3 +72,127 @@ class TestDjangoUserStateClient(UserStateClientTestBase, TestCase):
     @skip("Not supported by DjangoXBlockUserStateClient")
     def test_iter_course_many_users(self):
         pass
+
+
+@ddt.ddt
+class TestDjangoUserStateClientManyUsers(TestCase):
+    """
+    Tests of DjangoXBlockUserStateClient.get_many_for_users.
+    """
+    def setUp(self):
+        super(TestDjangoUserStateClientManyUsers, self).setUp()
+        self.client = DjangoXBlockUserStateClient()
+        self.usernames = [UserFactory.create().username for __ in range(3)]
+        course_key = CourseLocator('org', 'course', 'run')
+        self.block_keys = [course_key.make_usage_key('problem', 'problem_{}'.format(index)) for index in range(3)]
+        for username in self.usernames:
+            self.client.set_many(
+                username,
+                {block_key: {'username': username, 'block': unicode(block_key)} for block_key in self.block_keys},
+            )
+
+    def _assert_states(self, states, usernames, block_keys):
+        """
+        Verifies that the given states are those of the given users and
+        blocks, in order of username.
+        """
+        self.assertEquals(
+            sorted((state.username, state.block_key) for state in states),
+            [(username, block_key) for username in sorted(usernames) for block_key in block_keys],
+        )
+        self.assertEquals([state.username for state in states], sorted(state.username for state in states))
+        for state in states:
+            self.assertEquals(state.state, {'username': state.username, 'block': unicode(state.block_key)})
+
+    @ddt.data(1, 2, None)
+    def test_get_many_for_users(self, chunk_size):
+        states = list(self.client.get_many_for_users(self.usernames, self.block_keys, chunk_size=chunk_size))
+        self._assert_states(states, self.usernames, self.block_keys)
+
+    def test_num_queries(self):
+        with self.assertNumQueries(4):
+            states = list(self.client.get_many_for_users(self.usernames, self.block_keys, chunk_size=2))
+        self._assert_states(states, self.usernames, self.block_keys)
+
+    def test_subset_and_fields(self):
+        states = list(self.client.get_many_for_users(self.usernames[:2], self.block_keys[1:], fields=['username']))
+        self.assertEquals(len(states), 4)
+        for state in states:
+            self.assertIn(state.username, self.usernames[:2])
+            self.assertIn(state.block_key, self.block_keys[1:])
+            self.assertEquals(state.state, {'username': state.username})
+
+    def test_deleted_state(self):
+        self.client.delete_many(self.usernames[0], self.block_keys)
+        states = list(self.client.get_many_for_users(self.usernames, self.block_keys))
+        self._assert_states(states, self.usernames[1:], self.block_keys)
+
+    def test_other_scope(self):
+        with self.assertRaises(ValueError):
+            list(self.client.get_many_for_users(self.usernames, self.block_keys, scope=Scope.preferences))
+
+
+class TestDjangoUserStateClientSetMany(TestCase):
+    """
+    Tests of the bulk writes of DjangoXBlockUserStateClient.set_many.
+    """
+    # Tell Django to clean out all databases, not just default
+    multi_db = True
+
+    def setUp(self):
+        super(TestDjangoUserStateClientSetMany, self).setUp()
+        self.client = DjangoXBlockUserStateClient()
+        self.username = UserFactory.create().username
+        course_key = CourseLocator('org', 'course', 'run')
+        self.block_keys = [course_key.make_usage_key('problem', 'problem_{}'.format(index)) for index in range(5)]
+
+    def _set_many(self, value):
+        """
+        Sets the 'value' field of all the blocks.
+        """
+        self.client.set_many(self.username, {block_key: {'value': value} for block_key in self.block_keys})
+
+    def _assert_history(self, block_keys, values):
+        """
+        Verifies the values of the 'value' field in the history of the given blocks, latest first.
+        """
+        for block_key in block_keys:
+            history = list(self.client.get_history(self.username, block_key))
+            self.assertEquals([state.state.get('value') for state in history], values)
+
+    def test_create(self):
+        # read the existing StudentModules, insert the missing ones in bulk and read their ids
+        with self.assertNumQueries(5, using='default'):
+            with self.assertNumQueries(1, using='student_module_history'):
+                self._set_many('first')
+        self._assert_history(self.block_keys, ['first'])
+
+    def test_create_one(self):
+        # read the existing StudentModule and insert the missing one, which sets its id
+        with self.assertNumQueries(4, using='default'):
+            with self.assertNumQueries(1, using='student_module_history'):
+                self.client.set_many(self.username, {self.block_keys[0]: {'value': 'first'}})
+        self._assert_history(self.block_keys[:1], ['first'])
+
+    def test_create_integrity_error(self):
+        with patch('django.db.models.query.QuerySet.bulk_create', side_effect=IntegrityError):
+            with patch('courseware.user_state_client.log') as mock_log:
+                self._set_many('first')
+        self.assertEquals(mock_log.warning.call_count, 2)
+        with self.assertRaises(self.client.DoesNotExist):
+            self.client.get(self.username, self.block_keys[0])
+
+    @patch.object(DjangoXBlockUserStateClient, 'SET_MANY_CHUNK_SIZE', 2)
+    def test_update(self):
+        self._set_many('first')
+        self.client.set(self.username, self.block_keys[0], {'other': 'other'})
+
+        # read the existing StudentModules and update them two at a time
+        with self.assertNumQueries(6, using='default'):
+            with self.assertNumQueries(1, using='student_module_history'):
+                self._set_many('second')
+        self._assert_history(self.block_keys[1:], ['second', 'first'])
+        self._assert_history(self.block_keys[:1], ['second', 'first', 'first'])
+        self.assertEquals(
+            self.client.get(self.username, self.block_keys[0]).state, {'value': 'second', 'other': 'other'}
+        )
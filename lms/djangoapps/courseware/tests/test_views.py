@@ -1379,7 +1379,7 @@ class ProgressPageTests(ModuleStoreTestCase):
 
         # subsequent accesses to the progress page require fewer queries.
         for _ in range(2):
-            with self.assertNumQueries(24), check_mongo_calls(4):
+            with self.assertNumQueries(23), check_mongo_calls(4):
                 self._get_progress_page()
 
     @patch(
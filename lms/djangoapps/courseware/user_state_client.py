@@ -16,9 +16,11 @@ import newrelic_custom_metrics
 import dogstats_wrapper as dog_stats_api
 from django.contrib.auth.models import User
 from django.db import transaction
+from django.db.models import Case, TextField, Value, When
 from django.db.utils import IntegrityError
+from django.utils import timezone
 from xblock.fields import Scope
-from courseware.models import StudentModule, BaseStudentModuleHistory
+from courseware.models import StudentModule, BaseStudentModuleHistory, chunks, student_modules_bulk_saved
 from edx_user_state_client.interface import XBlockUserStateClient, XBlockUserState
 
 log = logging.getLogger(__name__)
@@ -47,6 +49,14 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
     # Use this sample rate for DataDog events.
     API_DATADOG_SAMPLE_RATE = 0.1
 
+    # Default maximum number of usernames, and of block keys, in each query
+    # made by get_many_for_users.  This bounds both the number of query
+    # parameters and the number of rows read at a time.
+    MANY_USERS_CHUNK_SIZE = 250
+
+    # Maximum number of StudentModules updated by each query made by set_many.
+    SET_MANY_CHUNK_SIZE = 100
+
     class ServiceUnavailable(XBlockUserStateClient.ServiceUnavailable):
         """
         This error is raised if the service backing this client is currently unavailable.
@@ -100,6 +110,47 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
                 usage_key = student_module.module_state_key.map_into_course(student_module.course_id)
                 yield (student_module, usage_key)
 
+    def _get_student_modules_for_users(self, usernames, block_keys, chunk_size):
+        """
+        Retrieve the :class:`~StudentModule`s for all of the supplied ``usernames``
+        and ``block_keys``, along with their students.
+
+        The modules are read with one query per chunk of ``chunk_size`` usernames
+        and chunk of ``chunk_size`` block keys, rather than with queries per user.
+        The modules of each chunk of usernames are yielded in order of username,
+        once all of their chunks of block keys are read.
+
+        Arguments:
+            usernames (list of str): The names of the users to load `StudentModule`s for.
+            block_keys (list of :class:`~UsageKey`): The set of XBlocks to load data for.
+            chunk_size (int): The maximum number of usernames, and of block keys, per query.
+        """
+        course_key_func = attrgetter('course_key')
+        by_course = [
+            (course_key, list(usage_keys))
+            for course_key, usage_keys in itertools.groupby(
+                sorted(block_keys, key=course_key_func),
+                course_key_func,
+            )
+        ]
+
+        for usernames_chunk in chunks(sorted(set(usernames)), chunk_size):
+            student_modules = []
+            for course_key, usage_keys in by_course:
+                for usage_keys_chunk in chunks(usage_keys, chunk_size):
+                    query = StudentModule.objects.filter(
+                        student__username__in=usernames_chunk,
+                        course_id=course_key,
+                        module_state_key__in=usage_keys_chunk,
+                    ).select_related('student').order_by('student__username', 'module_state_key')
+                    student_modules.extend(query.iterator())
+
+            # The sort is stable, so the modules of each user stay in order of query.
+            student_modules.sort(key=lambda student_module: student_module.student.username)
+            for student_module in student_modules:
+                usage_key = student_module.module_state_key.map_into_course(student_module.course_id)
+                yield (student_module, usage_key)
+
     def _ddog_increment(self, evt_time, evt_name):
         """
         DataDog increment method.
@@ -195,34 +246,11 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
 
         modules = self._get_student_modules(username, block_keys)
         for module, usage_key in modules:
-            if module.state is None:
-                self._ddog_increment(evt_time, 'get_many.empty_state')
-                continue
-
-            state = json.loads(module.state)
-            state_length = len(module.state)
-
-            # record this metric before the check for empty state, so that we
-            # have some visibility into empty blocks.
-            self._ddog_histogram(evt_time, 'get_many.block_size', state_length)
-
-            # If the state is the empty dict, then it has been deleted, and so
-            # conformant UserStateClients should treat it as if it doesn't exist.
-            if state == {}:
+            state = self._get_module_state('get_many', evt_time, module, usage_key, fields)
+            if state is None:
                 continue
 
-            # collect statistics for metric reporting
-            self._nr_block_stat_increment('get_many', usage_key.block_type, 'blocks_out')
-            self._nr_block_stat_accumulate('get_many', usage_key.block_type, 'size', state_length)
             total_block_count += 1
-
-            # filter state on fields
-            if fields is not None:
-                state = {
-                    field: state[field]
-                    for field in fields
-                    if field in state
-                }
             yield XBlockUserState(username, usage_key, state, module.modified, scope)
 
         # The rest of this method exists only to report metrics.
@@ -233,6 +261,99 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         self._ddog_histogram(evt_time, 'get_many.response_time', duration)
         self._nr_stat_accumulate('get_many', 'duration', duration)
 
+    def get_many_for_users(self, usernames, block_keys, scope=Scope.user_state, fields=None, chunk_size=None):
+        """
+        Retrieve the stored XBlock state of many users for the specified XBlock usages.
+
+        Unlike calling :meth:`get_many` for each user, this makes one query per chunk
+        of users and chunk of blocks, and streams the results rather than loading
+        them all at once.
+
+        Arguments:
+            usernames ([str]): The names of the users whose state should be retrieved
+            block_keys ([UsageKey]): A list of UsageKeys identifying which xblock states to load.
+            scope (Scope): The scope to load data from
+            fields: A list of field values to retrieve. If None, retrieve all stored fields.
+            chunk_size (int): The maximum number of usernames, and of block keys, per query.
+                Defaults to MANY_USERS_CHUNK_SIZE.
+
+        Yields:
+            XBlockUserState tuples for each specified UsageKey in block_keys, for each
+            user in usernames, ordered by username.
+            field_state is a dict mapping field names to values.
+        """
+        if scope != Scope.user_state:
+            raise ValueError("Only Scope.user_state is supported, not {}".format(scope))
+
+        total_block_count = 0
+        evt_time = time()
+
+        # count how many times this function gets called
+        self._nr_stat_increment('get_many_for_users', 'calls')
+
+        # keep track of users and blocks requested
+        self._ddog_histogram(evt_time, 'get_many_for_users.users_requested', len(usernames))
+        self._ddog_histogram(evt_time, 'get_many_for_users.blks_requested', len(block_keys))
+        self._nr_stat_accumulate('get_many_for_users', 'users_requested', len(usernames))
+        self._nr_stat_accumulate('get_many_for_users', 'blocks_requested', len(block_keys))
+
+        modules = self._get_student_modules_for_users(
+            usernames,
+            block_keys,
+            chunk_size or self.MANY_USERS_CHUNK_SIZE,
+        )
+        for module, usage_key in modules:
+            state = self._get_module_state('get_many_for_users', evt_time, module, usage_key, fields)
+            if state is None:
+                continue
+
+            total_block_count += 1
+            yield XBlockUserState(module.student.username, usage_key, state, module.modified, scope)
+
+        # The rest of this method exists only to report metrics.
+        finish_time = time()
+        duration = (finish_time - evt_time) * 1000  # milliseconds
+
+        self._ddog_histogram(evt_time, 'get_many_for_users.blks_out', total_block_count)
+        self._ddog_histogram(evt_time, 'get_many_for_users.response_time', duration)
+        self._nr_stat_accumulate('get_many_for_users', 'duration', duration)
+
+    def _get_module_state(self, function_name, evt_time, module, usage_key, fields):
+        """
+        Returns the state dict stored in the given StudentModule, filtered on
+        the given fields if they aren't None, and records metrics about it.
+
+        Returns None if there is no state, or if it has been deleted.
+        """
+        if module.state is None:
+            self._ddog_increment(evt_time, '{}.empty_state'.format(function_name))
+            return None
+
+        state = json.loads(module.state)
+        state_length = len(module.state)
+
+        # record this metric before the check for empty state, so that we
+        # have some visibility into empty blocks.
+        self._ddog_histogram(evt_time, '{}.block_size'.format(function_name), state_length)
+
+        # If the state is the empty dict, then it has been deleted, and so
+        # conformant UserStateClients should treat it as if it doesn't exist.
+        if state == {}:
+            return None
+
+        # collect statistics for metric reporting
+        self._nr_block_stat_increment(function_name, usage_key.block_type, 'blocks_out')
+        self._nr_block_stat_accumulate(function_name, usage_key.block_type, 'size', state_length)
+
+        # filter state on fields
+        if fields is not None:
+            state = {
+                field: state[field]
+                for field in fields
+                if field in state
+            }
+        return state
+
     def set_many(self, username, block_keys_to_state, scope=Scope.user_state):
         """
         Set fields for a particular XBlock.
@@ -267,42 +388,25 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
 
         evt_time = time()
 
-        for usage_key, state in block_keys_to_state.items():
-            student_module, created = StudentModule.objects.get_or_create(
-                student=user,
-                course_id=usage_key.course_key,
-                module_state_key=usage_key,
-                defaults={
-                    'state': json.dumps(state),
-                    'module_type': usage_key.block_type,
-                },
-            )
-
-            num_fields_before = num_fields_after = num_new_fields_set = len(state)
-            num_fields_updated = 0
-            if not created:
-                if student_module.state is None:
-                    current_state = {}
-                else:
-                    current_state = json.loads(student_module.state)
-                num_fields_before = len(current_state)
-                current_state.update(state)
-                num_fields_after = len(current_state)
-                student_module.state = json.dumps(current_state)
-                try:
-                    with transaction.atomic():
-                        # Updating the object - force_update guarantees no INSERT will occur.
-                        student_module.save(force_update=True)
-                except IntegrityError:
-                    # The UPDATE above failed. Log information - but ignore the error.
-                    # See https://openedx.atlassian.net/browse/TNL-5365
-                    log.warning("set_many: IntegrityError for student {} - course_id {} - usage key {}".format(
-                        user, repr(unicode(usage_key.course_key)), usage_key
-                    ))
-                    log.warning("set_many: All {} block keys: {}".format(
-                        len(block_keys_to_state), block_keys_to_state.keys()
-                    ))
-
+        try:
+            saved_modules = self._save_student_modules(user, username, block_keys_to_state)
+        except IntegrityError:
+            # Another request created some of the StudentModules since they were read. Try again,
+            # updating them rather than creating them.
+            log.warning("set_many: IntegrityError for student {} - retrying for all {} block keys: {}".format(
+                user, len(block_keys_to_state), block_keys_to_state.keys()
+            ))
+            try:
+                saved_modules = self._save_student_modules(user, username, block_keys_to_state)
+            except IntegrityError:
+                # The retry failed as well. Log information - but ignore the error.
+                # See https://openedx.atlassian.net/browse/TNL-5365
+                log.warning("set_many: IntegrityError again for student {} - not saving {} block keys: {}".format(
+                    user, len(block_keys_to_state), block_keys_to_state.keys()
+                ))
+                saved_modules = []
+
+        for usage_key, state, student_module, created, num_fields_before, num_fields_after in saved_modules:
             # DataDog and New Relic reporting
 
             # record the size of state modifications
@@ -334,6 +438,87 @@ class DjangoXBlockUserStateClient(XBlockUserStateClient):
         self._ddog_histogram(evt_time, 'set_many.response_time', duration)
         self._nr_stat_accumulate('set_many', 'duration', duration)
 
+    def _save_student_modules(self, user, username, block_keys_to_state):
+        """
+        Overlays the given states over the stored states of the user's blocks,
+        reading the existing StudentModules in one query, inserting the missing
+        ones in bulk and updating the others in batches.  A single missing
+        StudentModule, as when a block is first submitted, is saved on its own,
+        which sets its id and sends post_save as usual.
+
+        Returns a list of (usage_key, state, student_module, created,
+        num_fields_before, num_fields_after) tuples.
+
+        Raises IntegrityError if another request created one of the missing
+        StudentModules in the meantime.
+        """
+        # We read the StudentModules of every block (rather than re-using field objects
+        # that were queried in get_many) so that if the score has
+        # been changed by some other piece of the code, we don't overwrite
+        # that score.
+        existing_modules = {
+            usage_key: student_module
+            for student_module, usage_key in self._get_student_modules(username, block_keys_to_state.keys())
+        }
+
+        saved_modules = []
+        created_modules = {}
+        updated_modules = []
+        for usage_key, state in block_keys_to_state.items():
+            student_module = existing_modules.get(usage_key)
+            created = student_module is None
+            num_fields_before = num_fields_after = len(state)
+            if created:
+                student_module = StudentModule(
+                    student=user,
+                    course_id=usage_key.course_key,
+                    module_state_key=usage_key,
+                    module_type=usage_key.block_type,
+                    state=json.dumps(state),
+                )
+                created_modules[usage_key] = student_module
+            else:
+                current_state = {} if student_module.state is None else json.loads(student_module.state)
+                num_fields_before = len(current_state)
+                current_state.update(state)
+                num_fields_after = len(current_state)
+                student_module.state = json.dumps(current_state)
+                updated_modules.append(student_module)
+            saved_modules.append((usage_key, state, student_module, created, num_fields_before, num_fields_after))
+
+        bulk_created_modules = {}
+        with transaction.atomic():
+            if len(created_modules) == 1:
+                created_modules.values()[0].save(force_insert=True)
+            elif created_modules:
+                bulk_created_modules = created_modules
+                StudentModule.objects.bulk_create(bulk_created_modules.values())
+            if updated_modules:
+                modified = timezone.now()
+                for modules_chunk in chunks(updated_modules, self.SET_MANY_CHUNK_SIZE):
+                    # Only the states are updated, so that scores saved since they were read are kept.
+                    states = Case(
+                        *[When(id=module.id, then=Value(module.state)) for module in modules_chunk],
+                        output_field=TextField()
+                    )
+                    StudentModule.objects.filter(
+                        id__in=[module.id for module in modules_chunk]
+                    ).update(state=states, modified=modified)
+                for student_module in updated_modules:
+                    student_module.modified = modified
+
+        # Bulk inserts don't set the ids of the StudentModules, which their history entries need.
+        history_types = BaseStudentModuleHistory.HISTORY_SAVING_TYPES
+        if any(student_module.module_type in history_types for student_module in bulk_created_modules.itervalues()):
+            for student_module, usage_key in self._get_student_modules(username, bulk_created_modules.keys()):
+                if usage_key in bulk_created_modules:
+                    bulk_created_modules[usage_key].id = student_module.id
+
+        student_modules_bulk_saved.send(
+            sender=StudentModule, instances=bulk_created_modules.values() + updated_modules
+        )
+        return saved_modules
+
     def delete_many(self, username, block_keys, scope=Scope.user_state, fields=None):
         """
         Delete the stored XBlock state for a many xblock usages.
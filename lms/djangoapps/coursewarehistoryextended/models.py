@@ -17,7 +17,7 @@ from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 
 from coursewarehistoryextended.fields import UnsignedBigIntAutoField
-from courseware.models import StudentModule, BaseStudentModuleHistory
+from courseware.models import StudentModule, BaseStudentModuleHistory, student_modules_bulk_saved
 
 
 class StudentModuleHistoryExtended(BaseStudentModuleHistory):
@@ -53,6 +53,14 @@ class StudentModuleHistoryExtended(BaseStudentModuleHistory):
                                                          max_grade=instance.max_grade)
             history_entry.save()
 
+    @receiver(student_modules_bulk_saved, sender=StudentModule)
+    def save_history_in_bulk(sender, instances, **kwargs):  # pylint: disable=no-self-argument, unused-argument
+        """
+        Creates the StudentModuleHistoryExtended entries of StudentModules
+        saved in bulk.
+        """
+        StudentModuleHistoryExtended.bulk_create_history(instances)
+
     @receiver(post_delete, sender=StudentModule)
     def delete_history(sender, instance, **kwargs):  # pylint: disable=no-self-argument, unused-argument
         """
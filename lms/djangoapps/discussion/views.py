@@ -409,7 +409,6 @@ def user_profile(request, course_key, user_id):
     nr_transaction = newrelic.agent.current_transaction()
 
     user = cc.User.from_django_user(request.user)
-    user_info = user.to_dict()
     course = get_course_with_access(request.user, 'load', course_key, check_if_enrolled=True)
     course_settings = make_course_settings(course, request.user)
 
@@ -434,10 +433,13 @@ def user_profile(request, course_key, user_id):
         else:
             profiled_user = cc.User(id=user_id, course_id=course_key)
 
-        threads, page, num_pages = profiled_user.active_threads(query_params)
+        # The requests to the comments service are independent of each other.
+        comment_service_calls = [lambda: profiled_user.active_threads(query_params), user.to_dict]
+        if not request.is_ajax():
+            comment_service_calls.append(profiled_user.retrieve)
+        (threads, page, num_pages), user_info = cc.utils.perform_requests_in_parallel(*comment_service_calls)[:2]
         query_params['page'] = page
         query_params['num_pages'] = num_pages
-        user_info = cc.User.from_django_user(request.user).to_dict()
 
         with newrelic.agent.FunctionTrace(nr_transaction, "get_metadata_for_threads"):
             annotated_content_info = utils.get_metadata_for_threads(course_key, threads, request.user, user_info)
@@ -6,7 +6,9 @@ import mock
 from mock import patch, Mock
 from nose.plugins.attrib import attr
 from pytz import UTC
+from django.conf import settings
 from django.utils.timezone import UTC as django_utc
+from django.utils.translation import get_language, override
 
 from django.core.urlresolvers import reverse
 from django.test import TestCase, RequestFactory
@@ -16,8 +18,16 @@ from django_comment_client.tests.factories import RoleFactory
 from django_comment_client.tests.unicode import UnicodeTestMixin
 from django_comment_client.constants import TYPE_ENTRY, TYPE_SUBCATEGORY
 import django_comment_client.utils as utils
-from lms.lib.comment_client.utils import perform_request, CommentClientMaintenanceError
+from lms.lib.comment_client.utils import (
+    CommentClientMaintenanceError,
+    CommentClientRequestError,
+    get_forums_config,
+    get_session,
+    perform_request,
+    perform_requests_in_parallel,
+)
 from django_comment_common.models import ForumsConfig
+from request_cache.middleware import RequestCache
 
 from courseware.tests.factories import InstructorFactory
 from courseware.tabs import get_course_tab_list
@@ -1441,7 +1451,7 @@ class ClientConfigurationTestCase(TestCase):
         with self.assertRaises(CommentClientMaintenanceError):
             perform_request('GET', 'http://www.google.com')
 
-    @patch('requests.request')
+    @patch('requests.Session.request')
     def test_enabled(self, mock_request):
         """Ensures that requests proceed normally when forums are enabled."""
         config = ForumsConfig.current()
@@ -1456,3 +1466,53 @@ class ClientConfigurationTestCase(TestCase):
 
         result = perform_request('GET', 'http://www.google.com')
         self.assertEqual(result, {})
+
+    def test_config_read_once_per_request(self):
+        """Ensures that the configuration is only read once during a request."""
+        self.addCleanup(RequestCache.clear_request_cache)
+        with patch('lms.lib.comment_client.utils.request_cache.get_request', return_value=Mock()):
+            with self.assertNumQueries(1):
+                config = get_forums_config()
+                self.assertIs(get_forums_config(), config)
+
+    def test_session(self):
+        """Ensures that the connections to the comments service are pooled by a single session."""
+        session = get_session()
+        self.assertIs(get_session(), session)
+        adapter = session.get_adapter('http://localhost:4567')
+        self.assertEqual(adapter.max_retries.total, settings.COMMENTS_SERVICE_MAX_RETRIES)
+        self.assertEqual(adapter._pool_maxsize, settings.COMMENTS_SERVICE_POOL_SIZE)  # pylint: disable=protected-access
+
+
+class ParallelRequestsTestCase(TestCase):
+    """Test cases for the requests to the comments service performed in parallel."""
+
+    def setUp(self):
+        super(ParallelRequestsTestCase, self).setUp()
+        ForumsConfig.objects.create(enabled=True)
+
+    def test_results(self):
+        results = perform_requests_in_parallel(*[lambda index=index: index for index in range(5)])
+        self.assertEqual(results, range(5))
+
+    def test_context(self):
+        """Ensures that the functions run with the configuration and language of the calling thread."""
+        config = get_forums_config()
+        with override('eo'):
+            results = perform_requests_in_parallel(*[lambda: (get_forums_config().id, get_language())] * 3)
+        self.assertEqual(results, [(config.id, 'eo')] * 3)
+
+    def test_exception(self):
+        def raise_error():
+            """Fails like a request to the comments service."""
+            raise CommentClientRequestError('not found', 404)
+
+        with self.assertRaises(CommentClientRequestError):
+            perform_requests_in_parallel(lambda: None, raise_error)
+
+    @patch('requests.Session.request')
+    def test_requests(self, mock_request):
+        mock_request.return_value = Mock(status_code=200, json=lambda: {})
+        results = perform_requests_in_parallel(*[lambda: perform_request('get', 'http://www.google.com')] * 3)
+        self.assertEqual(results, [{}] * 3)
+        self.assertEqual(mock_request.call_count, 3)
@@ -370,6 +370,25 @@ class PersistentSubsectionGrade(DeleteGradesMixin, TimeStampedModel):
             course_id=course_key,
         )
 
+    @classmethod
+    def bulk_read_grades_for_users(cls, user_ids, course_key):
+        """
+        Reads all grades for the given users and course.
+
+        Students typically share most of their visible blocks, so rather
+        than joining them onto every grade, each distinct VisibleBlocks
+        record is read once and shared by the grades that reference it.
+
+        Arguments:
+            user_ids: The users associated with the desired grades
+            course_key: The course identifier for the desired grades
+        """
+        grades = list(cls.objects.filter(user_id__in=user_ids, course_id=course_key))
+        visible_blocks_by_id = VisibleBlocks.objects.in_bulk({grade.visible_blocks_id for grade in grades})
+        for grade in grades:
+            grade.visible_blocks = visible_blocks_by_id[grade.visible_blocks_id]
+        return grades
+
     @classmethod
     def update_or_create_grade(cls, **params):
         """
@@ -566,6 +585,17 @@ class PersistentCourseGrade(DeleteGradesMixin, TimeStampedModel):
         """
         return cls.objects.get(user_id=user_id, course_id=course_id)
 
+    @classmethod
+    def bulk_read_course_grades(cls, user_ids, course_id):
+        """
+        Reads the grades of the given users in the given course.
+
+        Arguments:
+            user_ids: The users associated with the desired grades
+            course_id: The id of the course associated with the desired grades
+        """
+        return cls.objects.filter(user_id__in=user_ids, course_id=course_id)
+
     @classmethod
     def update_or_create_course_grade(cls, user_id, course_id, **kwargs):
         """
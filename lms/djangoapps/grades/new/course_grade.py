@@ -3,6 +3,7 @@ CourseGrade Class
 """
 
 from collections import defaultdict, namedtuple, OrderedDict
+from itertools import islice
 from logging import getLogger
 
 from django.conf import settings
@@ -10,13 +11,15 @@ from django.core.exceptions import PermissionDenied
 import dogstats_wrapper as dog_stats_api
 from lazy import lazy
 
+from courseware.model_data import ScoresClient
 from lms.djangoapps.course_blocks.api import get_course_blocks
 from lms.djangoapps.grades.config.models import PersistentGradesEnabledFlag
 from openedx.core.djangoapps.content.block_structure.api import get_block_structure_manager
 from openedx.core.djangoapps.signals.signals import COURSE_GRADE_CHANGED
 from xmodule import block_metadata_utils
 
-from ..models import PersistentCourseGrade
+from ..models import PersistentCourseGrade, PersistentSubsectionGrade
+from ..scores import possibly_scored
 from .subsection_grade import SubsectionGradeFactory
 from ..transformer import GradesTransformer
 
@@ -28,7 +31,7 @@ class CourseGrade(object):
     """
     Course Grade class
     """
-    def __init__(self, student, course, course_structure):
+    def __init__(self, student, course, course_structure, persisted_subsection_grades=None, csm_scores=None):
         self.student = student
         self.course = course
         self.course_version = getattr(course, 'course_version', None)
@@ -36,7 +39,13 @@ class CourseGrade(object):
         self.course_structure = course_structure
         self._percent = None
         self._letter_grade = None
-        self._subsection_grade_factory = SubsectionGradeFactory(self.student, self.course, self.course_structure)
+        self._subsection_grade_factory = SubsectionGradeFactory(
+            self.student,
+            self.course,
+            self.course_structure,
+            persisted_subsection_grades=persisted_subsection_grades,
+            csm_scores=csm_scores,
+        )
 
     @lazy
     def graded_subsections_by_format(self):
@@ -228,20 +237,28 @@ class CourseGrade(object):
             persistent_grade = PersistentCourseGrade.read_course_grade(user.id, course.id)
         except PersistentCourseGrade.DoesNotExist:
             return None
-        course_grade = CourseGrade(user, course, course_structure)
+        return CourseGrade(user, course, course_structure).init_from_model(persistent_grade)
+
+    def init_from_model(self, persistent_grade):
+        """
+        Fills this CourseGrade's members with the values of the given
+        PersistentCourseGrade, and returns it.
 
-        current_grading_policy_hash = course_grade.get_grading_policy_hash(course.location, course_structure)
+        Returns None if the persisted grade was computed with an out of
+        date grading policy.
+        """
+        current_grading_policy_hash = self.get_grading_policy_hash(self.course.location, self.course_structure)
         if current_grading_policy_hash != persistent_grade.grading_policy_hash:
             return None
         else:
-            course_grade._percent = persistent_grade.percent_grade  # pylint: disable=protected-access
-            course_grade._letter_grade = persistent_grade.letter_grade  # pylint: disable=protected-access
-            course_grade.course_version = persistent_grade.course_version
-            course_grade.course_edited_timestamp = persistent_grade.course_edited_timestamp
+            self._percent = persistent_grade.percent_grade
+            self._letter_grade = persistent_grade.letter_grade
+            self.course_version = persistent_grade.course_version
+            self.course_edited_timestamp = persistent_grade.course_edited_timestamp
 
-        course_grade._log_event(log.info, u"load_persisted_grade")  # pylint: disable=protected-access
+        self._log_event(log.info, u"load_persisted_grade")
 
-        return course_grade
+        return self
 
     @classmethod
     def get_persisted_grade(cls, user, course):
@@ -320,15 +337,76 @@ class CourseGrade(object):
         ))
 
 
+class BulkGradesData(object):
+    """
+    The persisted course and subsection grades and the CSM scores of a
+    batch of students in a course, read with a single query each for the
+    whole batch rather than with several queries per student.
+
+    CSM scores are only needed to compute grades, so they are read lazily,
+    and only for the students whose course grade is not persisted or was
+    persisted under an out of date grading policy.
+    """
+    def __init__(self, course, students, collected_block_structure):
+        user_ids = [student.id for student in students]
+        self.course = course
+        self.collected_block_structure = collected_block_structure
+        self.persistent_grades_enabled = PersistentGradesEnabledFlag.feature_enabled(course.id)
+
+        self.course_grades = {}
+        self.subsection_grades = {user_id: {} for user_id in user_ids}
+        if self.persistent_grades_enabled:
+            self.course_grades = {
+                grade.user_id: grade
+                for grade in PersistentCourseGrade.bulk_read_course_grades(user_ids, course.id)
+            }
+            for grade in PersistentSubsectionGrade.bulk_read_grades_for_users(user_ids, course.id):
+                self.subsection_grades[grade.user_id][grade.full_usage_key] = grade
+
+        grading_policy_hash = CourseGrade.get_grading_policy_hash(course.location, collected_block_structure)
+        self._user_ids_to_grade = [
+            user_id for user_id in user_ids
+            if user_id not in self.course_grades or
+            self.course_grades[user_id].grading_policy_hash != grading_policy_hash
+        ]
+        self._csm_scores = None
+
+    def csm_scores(self, user_id):
+        """
+        Returns the ScoresClient holding the CSM scores of the given student
+        if their grade is to be computed, or else None.  The scores of all
+        such students of the batch are read together upon the first call.
+        """
+        if user_id not in self._user_ids_to_grade:
+            return None
+        if self._csm_scores is None:
+            # Scores are fetched for every block of the course that may be scored.
+            # Each student's course structure is a subset of it, so only their
+            # visible blocks' scores end up being used.
+            scorable_locations = [
+                block_key for block_key in self.collected_block_structure if possibly_scored(block_key)
+            ]
+            self._csm_scores = ScoresClient.create_for_users(
+                self.course.id, self._user_ids_to_grade, scorable_locations
+            )
+        return self._csm_scores[user_id]
+
+
 class CourseGradeFactory(object):
     """
     Factory class to create Course Grade objects
     """
-    def create(self, student, course, collected_block_structure=None, read_only=True):
+    # Number of students whose persisted grades are read together by iter.
+    ITER_BATCH_SIZE = 100
+
+    def create(self, student, course, collected_block_structure=None, read_only=True, bulk_grades_data=None):
         """
         Returns the CourseGrade object for the given student and course.
 
         If read_only is True, doesn't save any updates to the grades.
+        If given, the student's persisted grades and scores are taken from
+        bulk_grades_data (a BulkGradesData) instead of being read from the
+        database.
         Raises a PermissionDenied if the user does not have course access.
         """
         course_structure = get_course_blocks(
@@ -341,6 +419,9 @@ class CourseGradeFactory(object):
         if not self._user_has_access_to_course(course_structure):
             raise PermissionDenied("User does not have access to this course")
 
+        if bulk_grades_data is not None:
+            return self._create_from_bulk_data(student, course, course_structure, read_only, bulk_grades_data)
+
         return (
             self._get_saved_grade(student, course, course_structure) or
             self._compute_and_update_grade(student, course, course_structure, read_only)
@@ -348,7 +429,7 @@ class CourseGradeFactory(object):
 
     GradeResult = namedtuple('GradeResult', ['student', 'course_grade', 'err_msg'])
 
-    def iter(self, course, students):
+    def iter(self, course, students, collected_block_structure=None):
         """
         Given a course and an iterable of students (User), yield a GradeResult
         for every student enrolled in the course.  GradeResult is a named tuple of:
@@ -357,6 +438,15 @@ class CourseGradeFactory(object):
 
         If an error occurred, course_grade will be None and err_msg will be an
         exception message. If there was no error, err_msg is an empty string.
+
+        The optional collected_block_structure is used to grade all students
+        instead of the course's current collected block structure.
+
+        Students are graded in batches of ITER_BATCH_SIZE, for which
+        persisted grades and scores are read in bulk; only the grades that
+        are missing or out of date are then computed.  If they can't be read
+        in bulk, the students of the batch are graded one at a time, so that
+        only those who can't be graded get an error.
         """
         # Pre-fetch the collected course_structure so:
         # 1. Correctness: the same version of the course is used to
@@ -364,24 +454,41 @@ class CourseGradeFactory(object):
         # 2. Optimization: the collected course_structure is not
         #    retrieved from the data store multiple times.
 
-        collected_block_structure = get_block_structure_manager(course.id).get_collected()
-        for student in students:
-            with dog_stats_api.timer('lms.grades.CourseGradeFactory.iter', tags=[u'action:{}'.format(course.id)]):
-                try:
-                    course_grade = CourseGradeFactory().create(student, course, collected_block_structure)
-                    yield self.GradeResult(student, course_grade, "")
-
-                except Exception as exc:  # pylint: disable=broad-except
-                    # Keep marching on even if this student couldn't be graded for
-                    # some reason, but log it for future reference.
-                    log.exception(
-                        'Cannot grade student %s (%s) in course %s because of exception: %s',
-                        student.username,
-                        student.id,
-                        course.id,
-                        exc.message
-                    )
-                    yield self.GradeResult(student, None, exc.message)
+        if collected_block_structure is None:
+            collected_block_structure = get_block_structure_manager(course.id).get_collected()
+        students = iter(students)
+        while True:
+            students_batch = list(islice(students, self.ITER_BATCH_SIZE))
+            if not students_batch:
+                return
+            try:
+                bulk_grades_data = BulkGradesData(course, students_batch, collected_block_structure)
+            except Exception:  # pylint: disable=broad-except
+                log.exception(
+                    'Cannot read the grades of students %s in course %s in bulk',
+                    [student.id for student in students_batch],
+                    course.id,
+                )
+                bulk_grades_data = None
+            for student in students_batch:
+                with dog_stats_api.timer('lms.grades.CourseGradeFactory.iter', tags=[u'action:{}'.format(course.id)]):
+                    try:
+                        course_grade = CourseGradeFactory().create(
+                            student, course, collected_block_structure, bulk_grades_data=bulk_grades_data
+                        )
+                        yield self.GradeResult(student, course_grade, "")
+
+                    except Exception as exc:  # pylint: disable=broad-except
+                        # Keep marching on even if this student couldn't be graded for
+                        # some reason, but log it for future reference.
+                        log.exception(
+                            'Cannot grade student %s (%s) in course %s because of exception: %s',
+                            student.username,
+                            student.id,
+                            course.id,
+                            exc.message
+                        )
+                        yield self.GradeResult(student, None, exc.message)
 
     def update(self, student, course, course_structure):
         """
@@ -412,6 +519,28 @@ class CourseGradeFactory(object):
             course_structure
         )
 
+    def _create_from_bulk_data(self, student, course, course_structure, read_only, bulk_grades_data):
+        """
+        Returns the CourseGrade object for the given student and course,
+        built from the student's persisted grades and scores in
+        bulk_grades_data, and computed afresh only if it isn't persisted
+        or is out of date.
+        """
+        course_grade = CourseGrade(
+            student,
+            course,
+            course_structure,
+            persisted_subsection_grades=(
+                bulk_grades_data.subsection_grades[student.id] if bulk_grades_data.persistent_grades_enabled else None
+            ),
+            csm_scores=bulk_grades_data.csm_scores(student.id),
+        )
+        persistent_grade = bulk_grades_data.course_grades.get(student.id)
+        if persistent_grade is not None and course_grade.init_from_model(persistent_grade):
+            return course_grade
+        course_grade.compute_and_update(read_only)
+        return course_grade
+
     def _compute_and_update_grade(self, student, course, course_structure, read_only=False):
         """
         Freshly computes and updates the grade for the student and course.
@@ -203,12 +203,19 @@ class SubsectionGradeFactory(object):
     """
     Factory for Subsection Grades.
     """
-    def __init__(self, student, course, course_structure):
+    def __init__(self, student, course, course_structure, persisted_subsection_grades=None, csm_scores=None):
+        """
+        The student's `persisted_subsection_grades` (a dict of their
+        PersistentSubsectionGrades keyed by subsection usage key) and their
+        `csm_scores` (a ScoresClient) can be passed in if they have already
+        been read, as when grading students in bulk.
+        """
         self.student = student
         self.course = course
         self.course_structure = course_structure
 
-        self._cached_subsection_grades = None
+        self._cached_subsection_grades = persisted_subsection_grades
+        self._prefetched_csm_scores = csm_scores
         self._unsaved_subsection_grades = []
 
     def create(self, subsection, read_only=False):
@@ -283,6 +290,8 @@ class SubsectionGradeFactory(object):
         Lazily queries and returns all the scores stored in the user
         state (in CSM) for the course, while caching the result.
         """
+        if self._prefetched_csm_scores is not None:
+            return self._prefetched_csm_scores
         scorable_locations = [block_key for block_key in self.course_structure if possibly_scored(block_key)]
         return ScoresClient.create_for_locations(self.course.id, self.student.id, scorable_locations)
 
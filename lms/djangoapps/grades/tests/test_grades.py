@@ -4,11 +4,11 @@ Test grade calculation.
 
 import ddt
 import itertools
-from mock import patch
+from mock import ANY, patch
 from nose.plugins.attrib import attr
 
 from capa.tests.response_xml_factory import MultipleChoiceResponseXMLFactory
-from courseware.model_data import set_score
+from courseware.model_data import ScoresClient, set_score
 from courseware.tests.helpers import LoginEnrollmentTestCase
 
 from lms.djangoapps.course_blocks.api import get_course_blocks
@@ -82,6 +82,43 @@ class TestGradeIteration(SharedModuleStoreTestCase):
             self.assertIsNone(course_grade.letter_grade)
             self.assertEqual(course_grade.percent, 0.0)
 
+    @patch('lms.djangoapps.grades.new.course_grade.CourseGradeFactory.ITER_BATCH_SIZE', 2)
+    def test_persisted_grades(self):
+        """
+        Grades that were persisted are read in bulk, and agree with the grades
+        that are read one student at a time.
+        """
+        for student in self.students[:3]:
+            CourseGradeFactory().create(student, self.course, read_only=False)
+
+        all_course_grades, all_errors = self._course_grades_and_errors_for(self.course, self.students)
+        self.assertEqual(len(all_errors), 0)
+        for student, course_grade in all_course_grades.iteritems():
+            expected_course_grade = CourseGradeFactory().create(student, self.course)
+            self.assertEqual(course_grade.percent, expected_course_grade.percent)
+            self.assertEqual(course_grade.letter_grade, expected_course_grade.letter_grade)
+
+    def test_scores_read_for_grades_to_compute(self):
+        """
+        CSM scores are read in bulk only for the students whose grade isn't
+        persisted, and not at all once every grade is.
+        """
+        for student in self.students[:3]:
+            CourseGradeFactory().create(student, self.course, read_only=False)
+
+        with patch.object(ScoresClient, 'create_for_users', wraps=ScoresClient.create_for_users) as mock_read_scores:
+            list(CourseGradeFactory().iter(self.course, self.students))
+        mock_read_scores.assert_called_once_with(
+            self.course.id, [student.id for student in self.students[3:]], ANY
+        )
+
+        for student in self.students[3:]:
+            CourseGradeFactory().create(student, self.course, read_only=False)
+
+        with patch.object(ScoresClient, 'create_for_users', wraps=ScoresClient.create_for_users) as mock_read_scores:
+            list(CourseGradeFactory().iter(self.course, self.students))
+        self.assertFalse(mock_read_scores.called)
+
     @patch('lms.djangoapps.grades.new.course_grade.CourseGradeFactory.create')
     def test_grading_exception(self, mock_course_grade):
         """Test that we correctly capture exception messages that bubble up from
@@ -121,6 +158,26 @@ class TestGradeIteration(SharedModuleStoreTestCase):
         self.assertIsNotNone(all_course_grades[student2])
         self.assertIsNotNone(all_course_grades[student5])
 
+    @patch('lms.djangoapps.grades.new.course_grade.BulkGradesData')
+    @patch('lms.djangoapps.grades.new.course_grade.CourseGradeFactory.create')
+    def test_bulk_read_exception(self, mock_course_grade, mock_bulk_grades_data):
+        """
+        Test that students are still graded one at a time if their grades
+        can't be read in bulk, with errors only for those who can't be graded.
+        """
+        mock_bulk_grades_data.side_effect = Exception("Error reading grades in bulk.")
+        mock_course_grade.side_effect = [
+            Exception("Error for {}.".format(student.username))
+            if student.username == 'student3'
+            else mock_course_grade.return_value
+            for student in self.students
+        ]
+        all_course_grades, all_errors = self._course_grades_and_errors_for(self.course, self.students)
+        self.assertEqual(all_errors, {self.students[2]: "Error for student3."})
+        self.assertEqual(len(all_course_grades), 5)
+        for call_args in mock_course_grade.call_args_list:
+            self.assertIsNone(call_args[1]['bulk_grades_data'])
+
     def _course_grades_and_errors_for(self, course, students):
         """
         Simple helper method to iterate through student grades and give us
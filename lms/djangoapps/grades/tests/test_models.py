@@ -231,6 +231,20 @@ class PersistentSubsectionGradeTest(GradesModelTestCase):
         with self.assertRaises(ValidationError):
             PersistentSubsectionGrade.create_grade(**self.params)
 
+    def test_bulk_read_grades_for_users(self):
+        created_grade = PersistentSubsectionGrade.create_grade(**self.params)
+        other_user_params = dict(self.params, user_id=67890)
+        other_user_grade = PersistentSubsectionGrade.create_grade(**other_user_params)
+        PersistentSubsectionGrade.create_grade(**dict(self.params, user_id=24680))
+        with self.assertNumQueries(2):
+            read_grades = PersistentSubsectionGrade.bulk_read_grades_for_users(
+                [self.params["user_id"], other_user_params["user_id"]],
+                self.course_key,
+            )
+            self.assertEqual(sorted(read_grades, key=lambda grade: grade.user_id), [created_grade, other_user_grade])
+            for read_grade in read_grades:
+                self.assertEqual(read_grade.visible_blocks.blocks, self.block_records)
+
     @ddt.data('course_version', 'subtree_edited_timestamp')
     def test_optional_fields(self, field):
         del self.params[field]
@@ -117,11 +117,15 @@ class GradesTransformer(BlockStructureTransformer):
     def _collect_max_scores(cls, block_structure):
         """
         Collect the `max_score` for every block in the provided `block_structure`.
+
+        The `max_score` of a block depends only on its content, so it is
+        reused for blocks that are unchanged since the previous collection.
         """
         for block_locator in block_structure.post_order_traversal():
             block = block_structure.get_xblock(block_locator)
             if getattr(block, 'has_score', False):
-                cls._collect_max_score(block_structure, block)
+                if not block_structure.reuse_transformer_block_fields(block_locator, cls, 'max_score'):
+                    cls._collect_max_score(block_structure, block)
 
     @classmethod
     def _collect_max_score(cls, block_structure, module):
@@ -17,10 +17,11 @@ import csv
 import json
 import hashlib
 import os.path
+import tempfile
 
 from django.conf import settings
 from django.contrib.auth.models import User
-from django.core.files.base import ContentFile
+from django.core.files.base import File
 from django.db import models, transaction
 
 from openedx.core.storage import get_storage
@@ -31,6 +32,10 @@ from openedx.core.djangoapps.xmodule_django.models import CourseKeyField
 QUEUING = 'QUEUING'
 PROGRESS = 'PROGRESS'
 
+# Reports are written to a temporary file that is kept in memory up to this
+# size (in bytes), and spilled to disk beyond it.
+REPORT_SPOOL_MAX_SIZE = 10 * 1024 * 1024
+
 
 class InstructorTask(models.Model):
     """
@@ -178,9 +183,9 @@ class InstructorTask(models.Model):
 class ReportStore(object):
     """
     Simple abstraction layer that can fetch and store CSV files for reports
-    download. Should probably refactor later to create a ReportFile object that
-    can simply be appended to for the sake of memory efficiency, rather than
-    passing in the whole dataset. Doing that for now just because it's simpler.
+    download.  Rows can be passed in as any iterable, including generators,
+    so that reports can be streamed to the storage backend without holding
+    the whole dataset in memory.
     """
     @classmethod
     def from_config(cls, config_name):
@@ -264,12 +269,45 @@ class DjangoStorageReportStore(ReportStore):
         """
         Given a course_id, filename, and rows (each row is an iterable of
         strings), write the rows to the storage backend in csv format.
+
+        `rows` may be any iterable, such as a generator.  Rows are written
+        as they are produced to a temporary file, which is spilled to disk
+        once it grows beyond REPORT_SPOOL_MAX_SIZE, and the file is then
+        handed to the storage backend, so memory use does not grow with the
+        size of the report.
+        """
+        with tempfile.SpooledTemporaryFile(max_size=REPORT_SPOOL_MAX_SIZE) as output_buffer:
+            csvwriter = csv.writer(output_buffer)
+            csvwriter.writerows(self._get_utf8_encoded_rows(rows))
+            output_buffer.seek(0)
+            self.store(course_id, filename, File(output_buffer))
+
+    def open(self, course_id, filename):
+        """
+        Return a file-like object for reading the file named `filename`
+        that was previously stored for `course_id`.
+        """
+        return self.storage.open(self.path_to(course_id, filename))
+
+    def delete(self, course_id, filename):
         """
-        output_buffer = ContentFile('')
-        csvwriter = csv.writer(output_buffer)
-        csvwriter.writerows(self._get_utf8_encoded_rows(rows))
-        output_buffer.seek(0)
-        self.store(course_id, filename, output_buffer)
+        Remove the file named `filename` that was previously stored for
+        `course_id`.
+        """
+        self.storage.delete(self.path_to(course_id, filename))
+
+    def filenames_in(self, course_id, dirname):
+        """
+        Return a sorted list of the names of the files stored for
+        `course_id` under the sub-directory `dirname`.  Files in
+        sub-directories are not returned by `links_for`, so they can be used
+        for intermediate results that should not be offered for download.
+        """
+        try:
+            _, filenames = self.storage.listdir(self.path_to(course_id, dirname))
+        except OSError:
+            return []
+        return sorted(filenames)
 
     def links_for(self, course_id):
         """
@@ -36,6 +36,7 @@ from lms.djangoapps.instructor_task.tasks_helper import (
     delete_problem_module_state,
     upload_problem_responses_csv,
     upload_grades_csv,
+    upload_grades_csv_shard,
     upload_problem_grade_report,
     upload_students_csv,
     cohort_students_and_upload,
@@ -176,6 +177,22 @@ def calculate_grades_csv(entry_id, xmodule_instance_args):
     return run_main_task(entry_id, task_fn, action_name)
 
 
+@task(routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
+def calculate_grades_csv_shard(entry_id, user_ids, report_timestamp, subtask_status_dict):
+    """
+    Grade one shard of the students of a course for a sharded grade report
+    queued by `calculate_grades_csv`.
+
+    `user_ids` are the ids of the students in this shard, `report_timestamp`
+    is the time (in seconds since the epoch) at which the report was
+    requested, and `subtask_status_dict` is the initial SubtaskStatus of
+    this subtask, as a dict.
+    """
+    # Translators: This is a past-tense verb that is inserted into task progress messages as {action}.
+    action_name = ugettext_noop('graded')
+    return upload_grades_csv_shard(entry_id, user_ids, report_timestamp, subtask_status_dict, action_name)
+
+
 @task(base=BaseInstructorTask, routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY)  # pylint: disable=not-callable
 def calculate_problem_grade_report(entry_id, xmodule_instance_args):
     """
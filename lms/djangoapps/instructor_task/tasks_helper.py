@@ -3,12 +3,16 @@ This file contains tasks that are designed to perform background operations on t
 running state of a course.
 
 """
+import calendar
 import json
 import logging
+import shutil
+import tempfile
+import traceback
 from StringIO import StringIO
 from collections import OrderedDict
 from datetime import datetime
-from itertools import chain
+from itertools import chain, islice
 from time import time
 
 import dogstats_wrapper as dog_stats_api
@@ -18,6 +22,7 @@ from celery import Task, current_task
 from celery.states import SUCCESS, FAILURE
 from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.files.base import ContentFile, File
 from django.core.files.storage import DefaultStorage
 from django.db import reset_queries
 from django.db.models import Q
@@ -36,11 +41,12 @@ from certificates.api import generate_user_certificates
 from certificates.models import (
     CertificateWhitelist,
     certificate_info_for_user,
+    certificate_statuses_for_students,
     CertificateStatuses,
     GeneratedCertificate
 )
 from courseware.courses import get_course_by_id, get_problems_in_section
-from lms.djangoapps.grades.context import grading_context_for_course
+from lms.djangoapps.grades.context import grading_context as grading_context_from_structure, grading_context_for_course
 from lms.djangoapps.grades.new.course_grade import CourseGradeFactory
 from courseware.model_data import DjangoKeyValueStore, FieldDataCache
 from courseware.models import StudentModule
@@ -58,10 +64,17 @@ from shoppingcart.models import (
     Invoice, CouponRedemption, RegistrationCodeRedemption, CourseRegistrationCode
 )
 from openassessment.data import OraAggregateData
-from lms.djangoapps.instructor_task.models import ReportStore, InstructorTask, PROGRESS
-from lms.djangoapps.lms_xblock.runtime import LmsPartitionService
-from openedx.core.djangoapps.course_groups.cohorts import get_cohort
-from openedx.core.djangoapps.course_groups.models import CourseUserGroup
+from lms.djangoapps.instructor_task.models import ReportStore, InstructorTask, PROGRESS, REPORT_SPOOL_MAX_SIZE
+from lms.djangoapps.instructor_task.subtasks import (
+    SubtaskStatus,
+    check_subtask_is_valid,
+    queue_subtasks_for_query,
+    update_subtask_status,
+)
+from openedx.core.djangoapps.course_groups.models import CohortMembership, CourseUserGroup
+from openedx.core.djangoapps.content.block_structure.api import get_block_structure_manager
+from openedx.core.djangoapps.user_api.course_tag.api import get_course_tags_for_users
+from openedx.core.lib.cache_utils import zpickle, zunpickle
 from opaque_keys.edx.keys import UsageKey
 from openedx.core.djangoapps.course_groups.cohorts import add_user_to_cohort, is_course_cohorted
 from student.models import CourseEnrollment, CourseAccessRole
@@ -71,6 +84,7 @@ from track.views import task_track
 from util.db import outer_atomic
 from util.file import course_filename_prefix_generator, UniversalNewlineIterator
 from xblock.runtime import KvsFieldData
+from xmodule.partitions.partitions import NoSuchUserPartitionGroupError
 
 # define different loggers for use within tasks and on client side
 TASK_LOG = logging.getLogger('edx.celery.task')
@@ -89,6 +103,15 @@ GRADES_RESCORE_EVENT_TYPE = 'edx.grades.problem.rescored'
 # The setting name used for events when "settings" (account settings, preferences, profile information) change.
 REPORT_REQUESTED_EVENT_NAME = u'edx.instructor.report.requested'
 
+# Number of students whose grade report rows are computed together, sharing
+# the queries that fetch their cohorts, teams, enrollments, verifications
+# and certificates.
+GRADE_REPORT_STUDENT_BATCH_SIZE = 200
+
+# Number of StudentModules, along with their students, read with each query
+# by perform_module_state_update.
+MODULE_STATE_UPDATE_BATCH_SIZE = 500
+
 
 class BaseInstructorTask(Task):
     """
@@ -175,6 +198,14 @@ class BaseInstructorTask(Task):
             entry.save_now()
 
 
+class GradeReportShardError(Exception):
+    """
+    Error signaling that some shards of a sharded grade report failed, so
+    that no report could be generated.
+    """
+    pass
+
+
 class UpdateProblemModuleStateError(Exception):
     """
     Error signaling a fatal condition while updating problem modules.
@@ -382,7 +413,7 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
     task_progress = TaskProgress(action_name, modules_to_update.count(), start_time)
     task_progress.update_task_state()
 
-    for module_to_update in modules_to_update:
+    for module_to_update in _iter_in_batches(modules_to_update, MODULE_STATE_UPDATE_BATCH_SIZE):
         task_progress.attempted += 1
         module_descriptor = problems[unicode(module_to_update.module_state_key)]
         # There is no try here:  if there's an error, we let it throw, and the task will
@@ -403,6 +434,25 @@ def perform_module_state_update(update_fcn, filter_fcn, _entry_id, course_id, ta
     return task_progress.update_task_state()
 
 
+def _iter_in_batches(student_modules, batch_size):
+    """
+    Yields the StudentModules of the given queryset, with their students,
+    reading them with one query per batch of `batch_size` modules instead
+    of all at once and then one query per student.
+
+    Batches are paged on the module id, so that updating or deleting the
+    modules already yielded doesn't affect the following batches.
+    """
+    student_modules = student_modules.select_related('student').order_by('id')
+    batch = list(student_modules[:batch_size])
+    while batch:
+        for student_module in batch:
+            yield student_module
+        if len(batch) < batch_size:
+            break
+        batch = list(student_modules.filter(id__gt=batch[-1].id)[:batch_size])
+
+
 def _get_task_id_from_xmodule_args(xmodule_instance_args):
     """Gets task_id from `xmodule_instance_args` dict, or returns default value if missing."""
     return xmodule_instance_args.get('task_id', UNKNOWN_TASK_ID) if xmodule_instance_args is not None else UNKNOWN_TASK_ID
@@ -638,6 +688,18 @@ def delete_problem_module_state(xmodule_instance_args, _module_descriptor, stude
     return UPDATE_STATUS_SUCCEEDED
 
 
+def _get_report_filename(course_id, csv_name, timestamp):
+    """
+    Return the name under which the CSV report `csv_name` generated at
+    `timestamp` for `course_id` is stored in the ReportStore.
+    """
+    return u"{course_prefix}_{csv_name}_{timestamp_str}.csv".format(
+        course_prefix=course_filename_prefix_generator(course_id),
+        csv_name=csv_name,
+        timestamp_str=timestamp.strftime("%Y-%m-%d-%H%M")
+    )
+
+
 def upload_csv_to_report_store(rows, csv_name, course_id, timestamp, config_name='GRADES_DOWNLOAD'):
     """
     Upload data as a CSV using ReportStore.
@@ -655,11 +717,7 @@ def upload_csv_to_report_store(rows, csv_name, course_id, timestamp, config_name
     report_store = ReportStore.from_config(config_name)
     report_store.store_rows(
         course_id,
-        u"{course_prefix}_{csv_name}_{timestamp_str}.csv".format(
-            course_prefix=course_filename_prefix_generator(course_id),
-            csv_name=csv_name,
-            timestamp_str=timestamp.strftime("%Y-%m-%d-%H%M")
-        ),
+        _get_report_filename(course_id, csv_name, timestamp),
         rows
     )
     tracker.emit(REPORT_REQUESTED_EVENT_NAME, {"report_type": csv_name, })
@@ -691,22 +749,250 @@ def upload_exec_summary_to_store(data_dict, report_name, course_id, generated_at
     tracker.emit(REPORT_REQUESTED_EVENT_NAME, {"report_type": report_name})
 
 
-def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):  # pylint: disable=too-many-statements
+class _GradeReportContext(object):
+    """
+    Course-wide data shared by every row of a grade report: the graded
+    assignments that make up the grade columns, and the optional columns
+    (cohorts, experiment groups, teams) that apply to the course.
+
+    When given a `collected_block_structure`, the grade columns are
+    computed from it, so that all shards of a sharded report agree on
+    the layout of the rows.
+    """
+    def __init__(self, course, collected_block_structure=None):
+        self.course = course
+        self.course_id = course.id
+        self.collected_block_structure = collected_block_structure
+        self.course_is_cohorted = is_course_cohorted(course.id)
+        self.teams_enabled = course.teams_enabled
+        self.experiment_partitions = get_split_user_partitions(course.user_partitions)
+        self.graded_assignments = _graded_assignments(course.id, collected_block_structure)
+        certificate_whitelist = CertificateWhitelist.objects.filter(course_id=course.id, whitelist=True)
+        self.whitelisted_user_ids = set(entry.user_id for entry in certificate_whitelist)
+
+    @property
+    def header_row(self):
+        """
+        Returns the header row of the grade report.
+        """
+        grade_header = []
+        for assignment_info in self.graded_assignments.itervalues():
+            if assignment_info['use_subsection_headers']:
+                grade_header.extend(assignment_info['subsection_headers'].itervalues())
+            grade_header.append(assignment_info['average_header'])
+
+        cohorts_header = ['Cohort Name'] if self.course_is_cohorted else []
+        teams_header = ['Team Name'] if self.teams_enabled else []
+        group_configs_header = [
+            u'Experiment Group ({})'.format(partition.name) for partition in self.experiment_partitions
+        ]
+        certificate_info_header = ['Certificate Eligible', 'Certificate Delivered', 'Certificate Type']
+
+        return (
+            ["Student ID", "Email", "Username", "Grade"] +
+            grade_header +
+            cohorts_header +
+            group_configs_header +
+            teams_header +
+            ['Enrollment Track', 'Verification Status'] +
+            certificate_info_header
+        )
+
+
+class _GradeReportStudentsContext(object):
+    """
+    Per-student data of the non-grade columns of a grade report, fetched
+    for a whole batch of `students` with one query per column rather than
+    with several queries per student.
+    """
+    def __init__(self, report_context, students):
+        course_id = report_context.course_id
+        user_ids = [student.id for student in students]
+
+        self.cohorts_by_user_id = {}
+        if report_context.course_is_cohorted:
+            self.cohorts_by_user_id = {
+                membership.user_id: membership.course_user_group
+                for membership in CohortMembership.objects.filter(
+                    course_id=course_id, user_id__in=user_ids
+                ).select_related('course_user_group')
+            }
+
+        self.experiment_group_ids = get_course_tags_for_users(
+            user_ids,
+            course_id,
+            [partition.scheme.key_for_partition(partition) for partition in report_context.experiment_partitions],
+        )
+
+        self.team_names_by_user_id = {}
+        if report_context.teams_enabled:
+            self.team_names_by_user_id = dict(
+                CourseTeamMembership.objects.filter(
+                    team__course_id=course_id, user_id__in=user_ids
+                ).values_list('user_id', 'team__name')
+            )
+
+        self.enrollment_modes_by_user_id = dict(
+            CourseEnrollment.objects.filter(course_id=course_id, user_id__in=user_ids).values_list('user_id', 'mode')
+        )
+        self.verified_user_ids = set(
+            SoftwareSecurePhotoVerification.verified_query().filter(
+                user_id__in=user_ids
+            ).values_list('user_id', flat=True)
+        )
+        self.certificate_statuses_by_user_id = certificate_statuses_for_students(students, course_id)
+
+    def experiment_group(self, student, partition):
+        """
+        Returns the group of the (random scheme) `partition` that `student`
+        is assigned to, or None if they have not been assigned a group.
+        """
+        group_id = self.experiment_group_ids.get((student.id, partition.scheme.key_for_partition(partition)))
+        if group_id is None:
+            return None
+        try:
+            return partition.get_group(int(group_id))
+        except NoSuchUserPartitionGroupError:
+            return None
+
+
+def _batches(iterable, batch_size):
+    """
+    Yields lists of up to `batch_size` consecutive items of `iterable`.
+    """
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _grade_report_rows(report_context, students, task_progress, err_rows, log_progress, status_interval=100):
+    """
+    Grades each of the given `students` and yields their rows in the grade
+    report described by `report_context`.
+
+    Students who could not be graded are counted as failed in
+    `task_progress`, and their error rows are appended to `err_rows`.
+    `log_progress` is called with the number of students graded so far
+    after each student.
+    """
+    course = report_context.course
+    current_step = {'step': 'Calculating Grades'}
+    student_counter = 0
+
+    for students_batch in _batches(students, GRADE_REPORT_STUDENT_BATCH_SIZE):
+        students_context = _GradeReportStudentsContext(report_context, students_batch)
+        grade_results_iter = CourseGradeFactory().iter(
+            course,
+            students_batch,
+            collected_block_structure=report_context.collected_block_structure,
+        )
+        for student, course_grade, err_msg in grade_results_iter:
+            # Periodically update task status (this is a cache write)
+            if task_progress.attempted % status_interval == 0:
+                task_progress.update_task_state(extra_meta=current_step)
+            task_progress.attempted += 1
+
+            # Now add a log entry after each student is graded to get a sense
+            # of the task's progress
+            student_counter += 1
+            log_progress(student_counter)
+
+            if not course_grade:
+                # An empty gradeset means we failed to grade a student.
+                task_progress.failed += 1
+                err_rows.append([student.id, student.username, err_msg])
+                continue
+
+            # We were able to successfully grade this student for this course.
+            task_progress.succeeded += 1
+
+            yield _grade_report_row(report_context, students_context, student, course_grade)
+
+
+def _grade_report_row(report_context, students_context, student, course_grade):
+    """
+    Returns the row of `student` in the grade report described by
+    `report_context`, given their `course_grade` and the
+    `students_context` of their batch of students.
+    """
+    course_id = report_context.course_id
+
+    cohorts_group_name = []
+    if report_context.course_is_cohorted:
+        group = students_context.cohorts_by_user_id.get(student.id)
+        cohorts_group_name.append(group.name if group else '')
+
+    group_configs_group_names = []
+    for partition in report_context.experiment_partitions:
+        group = students_context.experiment_group(student, partition)
+        group_configs_group_names.append(group.name if group else '')
+
+    team_name = []
+    if report_context.teams_enabled:
+        team_name.append(students_context.team_names_by_user_id.get(student.id, ''))
+
+    enrollment_mode = students_context.enrollment_modes_by_user_id.get(student.id)
+    verification_status = SoftwareSecurePhotoVerification.verification_status_for_user(
+        student,
+        course_id,
+        enrollment_mode,
+        user_is_verified=student.id in students_context.verified_user_ids,
+    )
+    certificate_info = certificate_info_for_user(
+        student,
+        course_id,
+        course_grade.letter_grade,
+        student.id in report_context.whitelisted_user_ids,
+        certificate_status=students_context.certificate_statuses_by_user_id[student.id],
+    )
+
+    grade_results = []
+    for assignment_type, assignment_info in report_context.graded_assignments.iteritems():
+        for subsection_location in assignment_info['subsection_headers']:
+            try:
+                subsection_grade = course_grade.graded_subsections_by_format[assignment_type][subsection_location]
+            except KeyError:
+                grade_results.append([u'Not Available'])
+            else:
+                if subsection_grade.graded_total.attempted:
+                    grade_results.append(
+                        [subsection_grade.graded_total.earned / subsection_grade.graded_total.possible]
+                    )
+                else:
+                    grade_results.append([u'Not Attempted'])
+        if assignment_info['use_subsection_headers']:
+            assignment_average = course_grade.grade_value['grade_breakdown'].get(assignment_type, {}).get('percent')
+            grade_results.append([assignment_average])
+
+    grade_results = list(chain.from_iterable(grade_results))
+
+    return (
+        [student.id, student.email, student.username, course_grade.percent] +
+        grade_results + cohorts_group_name + group_configs_group_names + team_name +
+        [enrollment_mode] + [verification_status] + certificate_info
+    )
+
+
+def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
     """
     For a given `course_id`, generate a grades CSV file for all students that
     are enrolled, and store using a `ReportStore`. Once created, the files can
     be accessed by instantiating another `ReportStore` (via
     `ReportStore.from_config()`) and calling `link_for()` on it. Writes are
     buffered, so we'll never write part of a CSV file to S3 -- i.e. any files
-    that are visible in ReportStore will be complete ones.
+    that are visible in ReportStore will be complete ones.  Rows are streamed
+    to the ReportStore as students are graded, rather than built in memory.
 
-    As we start to add more CSV downloads, it will probably be worthwhile to
-    make a more general CSVDoc class instead of building out the rows like we
-    do here.
+    If the course has more enrollees than `settings.GRADES_DOWNLOAD_STUDENTS_PER_SHARD`,
+    the work is instead split into shards that are graded in parallel subtasks
+    (see `upload_grades_csv_shard`), and merged into a single report once the
+    last shard completes.
     """
     start_time = time()
     start_date = datetime.now(UTC)
-    status_interval = 100
     enrolled_students = CourseEnrollment.objects.users_enrolled_in(course_id)
     total_enrolled_students = enrolled_students.count()
     task_progress = TaskProgress(action_name, total_enrolled_students, start_time)
@@ -720,25 +1006,33 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
     )
     TASK_LOG.info(u'%s, Task type: %s, Starting task execution', task_info_string, action_name)
 
-    course = get_course_by_id(course_id)
-    course_is_cohorted = is_course_cohorted(course.id)
-    teams_enabled = course.teams_enabled
-    cohorts_header = ['Cohort Name'] if course_is_cohorted else []
-    teams_header = ['Team Name'] if teams_enabled else []
-
-    experiment_partitions = get_split_user_partitions(course.user_partitions)
-    group_configs_header = [u'Experiment Group ({})'.format(partition.name) for partition in experiment_partitions]
+    students_per_shard = getattr(settings, 'GRADES_DOWNLOAD_STUDENTS_PER_SHARD', None)
+    if students_per_shard and total_enrolled_students > students_per_shard:
+        TASK_LOG.info(
+            u'%s, Task type: %s, Sharding grade calculation for total students: %s into shards of %s',
+            task_info_string,
+            action_name,
+            total_enrolled_students,
+            students_per_shard,
+        )
+        return _queue_grade_report_shards(
+            _entry_id,
+            course_id,
+            enrolled_students,
+            total_enrolled_students,
+            students_per_shard,
+            action_name,
+            start_date,
+        )
 
-    certificate_info_header = ['Certificate Eligible', 'Certificate Delivered', 'Certificate Type']
-    certificate_whitelist = CertificateWhitelist.objects.filter(course_id=course_id, whitelist=True)
-    whitelisted_user_ids = [entry.user_id for entry in certificate_whitelist]
+    course = get_course_by_id(course_id)
+    report_context = _GradeReportContext(course)
 
-    # Loop over all our students and build our CSV lists in memory
-    rows = []
+    # Students are graded as their rows are streamed to the report store,
+    # so the rows of the report are never all held in memory.
     err_rows = [["id", "username", "error_msg"]]
     current_step = {'step': 'Calculating Grades'}
 
-    student_counter = 0
     TASK_LOG.info(
         u'%s, Task type: %s, Current step: %s, Starting grade calculation for total students: %s',
         task_info_string,
@@ -747,32 +1041,10 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
         total_enrolled_students,
     )
 
-    graded_assignments = _graded_assignments(course_id)
-    grade_header = []
-    for assignment_info in graded_assignments.itervalues():
-        if assignment_info['use_subsection_headers']:
-            grade_header.extend(assignment_info['subsection_headers'].itervalues())
-        grade_header.append(assignment_info['average_header'])
-
-    rows.append(
-        ["Student ID", "Email", "Username", "Grade"] +
-        grade_header +
-        cohorts_header +
-        group_configs_header +
-        teams_header +
-        ['Enrollment Track', 'Verification Status'] +
-        certificate_info_header
-    )
-
-    for student, course_grade, err_msg in CourseGradeFactory().iter(course, enrolled_students):
-        # Periodically update task status (this is a cache write)
-        if task_progress.attempted % status_interval == 0:
-            task_progress.update_task_state(extra_meta=current_step)
-        task_progress.attempted += 1
-
-        # Now add a log entry after each student is graded to get a sense
-        # of the task's progress
-        student_counter += 1
+    def log_progress(student_counter):
+        """
+        Log the number of students graded so far.
+        """
         TASK_LOG.info(
             u'%s, Task type: %s, Current step: %s, Grade calculation in-progress for students: %s/%s',
             task_info_string,
@@ -782,89 +1054,27 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
             total_enrolled_students
         )
 
-        if not course_grade:
-            # An empty gradeset means we failed to grade a student.
-            task_progress.failed += 1
-            err_rows.append([student.id, student.username, err_msg])
-            continue
-
-        # We were able to successfully grade this student for this course.
-        task_progress.succeeded += 1
-
-        cohorts_group_name = []
-        if course_is_cohorted:
-            group = get_cohort(student, course_id, assign=False)
-            cohorts_group_name.append(group.name if group else '')
-
-        group_configs_group_names = []
-        for partition in experiment_partitions:
-            group = LmsPartitionService(student, course_id).get_group(partition, assign=False)
-            group_configs_group_names.append(group.name if group else '')
-
-        team_name = []
-        if teams_enabled:
-            try:
-                membership = CourseTeamMembership.objects.get(user=student, team__course_id=course_id)
-                team_name.append(membership.team.name)
-            except CourseTeamMembership.DoesNotExist:
-                team_name.append('')
-
-        enrollment_mode = CourseEnrollment.enrollment_mode_for_user(student, course_id)[0]
-        verification_status = SoftwareSecurePhotoVerification.verification_status_for_user(
-            student,
-            course_id,
-            enrollment_mode
-        )
-        certificate_info = certificate_info_for_user(
-            student,
-            course_id,
-            course_grade.letter_grade,
-            student.id in whitelisted_user_ids
-        )
-
-        grade_results = []
-        for assignment_type, assignment_info in graded_assignments.iteritems():
-            for subsection_location in assignment_info['subsection_headers']:
-                try:
-                    subsection_grade = course_grade.graded_subsections_by_format[assignment_type][subsection_location]
-                except KeyError:
-                    grade_results.append([u'Not Available'])
-                else:
-                    if subsection_grade.graded_total.attempted:
-                        grade_results.append(
-                            [subsection_grade.graded_total.earned / subsection_grade.graded_total.possible]
-                        )
-                    else:
-                        grade_results.append([u'Not Attempted'])
-            if assignment_info['use_subsection_headers']:
-                assignment_average = course_grade.grade_value['grade_breakdown'].get(assignment_type, {}).get('percent')
-                grade_results.append([assignment_average])
-
-        grade_results = list(chain.from_iterable(grade_results))
-
-        rows.append(
-            [student.id, student.email, student.username, course_grade.percent] +
-            grade_results + cohorts_group_name + group_configs_group_names + team_name +
-            [enrollment_mode] + [verification_status] + certificate_info
-        )
+    rows = chain(
+        [report_context.header_row],
+        _grade_report_rows(
+            report_context, enrolled_students.select_related('profile'), task_progress, err_rows, log_progress
+        ),
+    )
+    upload_csv_to_report_store(rows, 'grade_report', course_id, start_date)
 
     TASK_LOG.info(
         u'%s, Task type: %s, Current step: %s, Grade calculation completed for students: %s/%s',
         task_info_string,
         action_name,
         current_step,
-        student_counter,
+        task_progress.attempted,
         total_enrolled_students
     )
 
-    # By this point, we've got the rows we're going to stuff into our CSV files.
     current_step = {'step': 'Uploading CSVs'}
     task_progress.update_task_state(extra_meta=current_step)
     TASK_LOG.info(u'%s, Task type: %s, Current step: %s', task_info_string, action_name, current_step)
 
-    # Perform the actual upload
-    upload_csv_to_report_store(rows, 'grade_report', course_id, start_date)
-
     # If there are any error rows (don't count the header), write them out as well
     if len(err_rows) > 1:
         upload_csv_to_report_store(err_rows, 'grade_report_err', course_id, start_date)
@@ -874,11 +1084,273 @@ def upload_grades_csv(_xmodule_instance_args, _entry_id, course_id, _task_input,
     return task_progress.update_task_state(extra_meta=current_step)
 
 
-def _graded_assignments(course_key):
+def _grade_report_shard_dirname(entry_id):
+    """
+    Returns the ReportStore sub-directory holding the partial CSVs
+    written by the shards of the grade report task `entry_id`.
+    """
+    return u'grade_report_shards/{}'.format(entry_id)
+
+
+def _grade_report_pinned_structure_filename(entry_id):
+    """
+    Returns the ReportStore filename of the collected block structure
+    pinned for the shards of the grade report task `entry_id`.
+    """
+    return u'{}/block_structure.pickle'.format(_grade_report_shard_dirname(entry_id))
+
+
+def _pin_collected_block_structure(entry_id, course_key):
+    """
+    Stores the course's current collected block structure in the ReportStore
+    for the grade report task `entry_id`, so that all of its shards grade
+    against the same version of the course even if it is published while the
+    report is running.  Unlike the cache, the ReportStore does not limit the
+    size of the values it holds, so the structure of large courses is pinned
+    as well.
+    """
+    collected_block_structure = get_block_structure_manager(course_key).get_collected()
+    ReportStore.from_config('GRADES_DOWNLOAD').store(
+        course_key,
+        _grade_report_pinned_structure_filename(entry_id),
+        ContentFile(zpickle(collected_block_structure)),
+    )
+    return collected_block_structure
+
+
+def _get_pinned_collected_block_structure(entry_id, course_key):
+    """
+    Returns the collected block structure pinned for the grade report task
+    `entry_id`.  Raises an exception if it can't be read, rather than
+    grading against another version of the course.
+    """
+    pinned_file = ReportStore.from_config('GRADES_DOWNLOAD').open(
+        course_key, _grade_report_pinned_structure_filename(entry_id)
+    )
+    try:
+        return zunpickle(pinned_file.read())
+    finally:
+        pinned_file.close()
+
+
+def _queue_grade_report_shards(
+        entry_id,
+        course_id,
+        enrolled_students,
+        total_enrolled_students,
+        students_per_shard,
+        action_name,
+        start_date,
+):
+    """
+    Splits the enrolled students into chunks of `students_per_shard` and
+    queues a `calculate_grades_csv_shard` subtask for each of them.
+
+    Returns the task progress as stored in the InstructorTask object.
+    """
+    # Imported here since the tasks module imports this one.
+    from lms.djangoapps.instructor_task.tasks import calculate_grades_csv_shard
+
+    entry = InstructorTask.objects.get(pk=entry_id)
+
+    # As in bulk email, if the task has been requeued after its subtasks
+    # were already defined, don't queue another set of them.
+    if len(entry.subtasks) > 0 and len(entry.task_output) > 0:
+        TASK_LOG.warning(u'Task %s has already queued grade report shards', entry.task_id)
+        return json.loads(entry.task_output)
+
+    _pin_collected_block_structure(entry_id, course_id)
+    report_timestamp = calendar.timegm(start_date.utctimetuple())
+
+    def _create_grade_report_shard_subtask(item_list, initial_subtask_status):
+        """Creates a subtask to grade the students in `item_list`."""
+        return calculate_grades_csv_shard.subtask(
+            (
+                entry_id,
+                [item['pk'] for item in item_list],
+                report_timestamp,
+                initial_subtask_status.to_dict(),
+            ),
+            task_id=initial_subtask_status.task_id,
+            routing_key=settings.GRADES_DOWNLOAD_ROUTING_KEY,
+        )
+
+    return queue_subtasks_for_query(
+        entry,
+        action_name,
+        _create_grade_report_shard_subtask,
+        [enrolled_students.order_by('id')],
+        [],
+        students_per_shard,
+        total_enrolled_students,
+    )
+
+
+def upload_grades_csv_shard(entry_id, user_ids, report_timestamp, subtask_status_dict, action_name):
+    """
+    Grades the students with the given `user_ids` for the course of the
+    sharded grade report task `entry_id`, and stores their rows as a partial
+    CSV in the ReportStore.  Once every shard of the task is done, the one
+    that completes last merges the partial CSVs into the final report, and
+    only then marks the task as complete.
+
+    Progress within the shard is reported through a `TaskProgress` of the
+    current (sub)task; the overall progress is accumulated in the
+    InstructorTask entry through `update_subtask_status`.
+    """
+    subtask_status = SubtaskStatus.from_dict(subtask_status_dict)
+    current_task_id = subtask_status.task_id
+    check_subtask_is_valid(entry_id, current_task_id, subtask_status)
+
+    course_id = InstructorTask.objects.get(pk=entry_id).course_id
+    task_info_string = u'Task: {task_id}, InstructorTask ID: {entry_id}, Course: {course_id}'.format(
+        task_id=current_task_id,
+        entry_id=entry_id,
+        course_id=course_id,
+    )
+    TASK_LOG.info(
+        u'%s, Task type: %s, Starting grade calculation for shard of %s students',
+        task_info_string,
+        action_name,
+        len(user_ids),
+    )
+
+    task_progress = TaskProgress(action_name, len(user_ids), time())
+    try:
+        course = get_course_by_id(course_id)
+        report_context = _GradeReportContext(course, _get_pinned_collected_block_structure(entry_id, course_id))
+        students = User.objects.filter(id__in=user_ids).select_related('profile').order_by('id')
+        err_rows = []
+
+        def log_progress(student_counter):
+            """
+            Log the number of students of this shard graded so far.
+            """
+            TASK_LOG.debug(
+                u'%s, Task type: %s, Grade calculation in-progress for shard students: %s/%s',
+                task_info_string,
+                action_name,
+                student_counter,
+                len(user_ids),
+            )
+
+        rows = _grade_report_rows(report_context, students, task_progress, err_rows, log_progress)
+
+        # Name the partial files after the first student of the shard, so
+        # that the merged report is ordered by student id.
+        shard_filename = u'{dirname}/{first_user_id:012d}_{{csv_name}}.csv'.format(
+            dirname=_grade_report_shard_dirname(entry_id),
+            first_user_id=min(user_ids),
+        )
+        report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+        report_store.store_rows(course_id, shard_filename.format(csv_name='grade_report'), rows)
+        if err_rows:
+            report_store.store_rows(course_id, shard_filename.format(csv_name='grade_report_err'), err_rows)
+    except Exception:
+        # Count every student of the shard as failed, so that the counts of
+        # the parent task remain consistent.
+        TASK_LOG.exception(u'%s, Task type: %s, Grade report shard failed unexpectedly', task_info_string, action_name)
+        subtask_status.increment(failed=len(user_ids), state=FAILURE)
+        entry = update_subtask_status(entry_id, current_task_id, subtask_status, mark_complete=False)
+        _merge_grade_report_shards_if_complete(entry, report_timestamp)
+        raise
+
+    subtask_status.increment(
+        succeeded=task_progress.succeeded,
+        failed=task_progress.failed,
+        state=SUCCESS,
+    )
+    entry = update_subtask_status(entry_id, current_task_id, subtask_status, mark_complete=False)
+    task_progress.update_task_state(extra_meta={'step': 'Grade report shard completed'})
+    TASK_LOG.info(u'%s, Task type: %s, Grade report shard completed: %s', task_info_string, action_name, subtask_status)
+
+    _merge_grade_report_shards_if_complete(entry, report_timestamp)
+    return subtask_status.to_dict()
+
+
+def _merge_grade_report_shards_if_complete(entry, report_timestamp):
+    """
+    If all the shards of the grade report task `entry` are done, merges
+    their partial CSVs into the final grade report (and error report), and
+    then marks the task as complete.
+
+    `entry` is the InstructorTask as updated by the shard that just
+    completed.  Since the updates are serialized, only the shard completing
+    last sees all of them done, so the merge is done exactly once.  If any
+    shard failed, or the merge itself fails, no report is uploaded and the
+    task is marked as failed.
+    """
+    subtask_dict = json.loads(entry.subtasks)
+    if subtask_dict['succeeded'] + subtask_dict['failed'] < subtask_dict['total']:
+        return
+
+    course_id = entry.course_id
+    report_store = ReportStore.from_config('GRADES_DOWNLOAD')
+    shard_dirname = _grade_report_shard_dirname(entry.id)
+    shard_filenames = report_store.filenames_in(course_id, shard_dirname)
+    try:
+        if subtask_dict['failed']:
+            raise GradeReportShardError(
+                u'{} grade report shards failed; not uploading a report'.format(subtask_dict['failed'])
+            )
+
+        course = get_course_by_id(course_id)
+        report_context = _GradeReportContext(course, _get_pinned_collected_block_structure(entry.id, course_id))
+        start_date = datetime.fromtimestamp(report_timestamp, UTC)
+        for csv_name, header_row in (
+                ('grade_report', report_context.header_row),
+                ('grade_report_err', ["id", "username", "error_msg"]),
+        ):
+            part_filenames = [
+                u'{}/{}'.format(shard_dirname, filename)
+                for filename in shard_filenames
+                if filename.endswith(u'_{}.csv'.format(csv_name))
+            ]
+            if csv_name == 'grade_report' or part_filenames:
+                _merge_csv_parts(report_store, course_id, csv_name, start_date, header_row, part_filenames)
+    except Exception as exc:  # pylint: disable=broad-except
+        TASK_LOG.exception(u'InstructorTask ID: %s, Course: %s, Grade report merge failed', entry.id, course_id)
+        entry.task_output = InstructorTask.create_output_for_failure(exc, traceback.format_exc())
+        entry.task_state = FAILURE
+    else:
+        entry.task_state = SUCCESS
+    finally:
+        for filename in shard_filenames:
+            report_store.delete(course_id, u'{}/{}'.format(shard_dirname, filename))
+    entry.save_now()
+
+
+def _merge_csv_parts(report_store, course_id, csv_name, timestamp, header_row, part_filenames):
+    """
+    Concatenates the partial CSVs named `part_filenames`, preceded by
+    `header_row`, into the report `csv_name` in the given `report_store`.
+    The parts are copied through a spooled temporary file, so large reports
+    are not held in memory.
+    """
+    with tempfile.SpooledTemporaryFile(max_size=REPORT_SPOOL_MAX_SIZE) as merged_file:
+        unicodecsv.writer(merged_file, encoding='utf-8').writerow(header_row)
+        for part_filename in part_filenames:
+            part_file = report_store.open(course_id, part_filename)
+            try:
+                shutil.copyfileobj(part_file, merged_file)
+            finally:
+                part_file.close()
+        merged_file.seek(0)
+        report_store.store(course_id, _get_report_filename(course_id, csv_name, timestamp), File(merged_file))
+    tracker.emit(REPORT_REQUESTED_EVENT_NAME, {"report_type": csv_name, })
+
+
+def _graded_assignments(course_key, course_structure=None):
     """
     Returns an OrderedDict that maps an assignment type to a dict of subsection-headers and average-header.
+
+    If `course_structure` is given, the grading context is computed from it
+    rather than from the course's current collected block structure.
     """
-    grading_context = grading_context_for_course(course_key)
+    if course_structure is not None:
+        grading_context = grading_context_from_structure(course_structure)
+    else:
+        grading_context = grading_context_for_course(course_key)
     graded_assignments_map = OrderedDict()
     for assignment_type_name, subsection_infos in grading_context['all_graded_subsections_by_type'].iteritems():
         graded_subsections_map = OrderedDict()
@@ -965,32 +1437,19 @@ def upload_problem_responses_csv(_xmodule_instance_args, _entry_id, course_id, t
     return task_progress.update_task_state(extra_meta=current_step)
 
 
-def upload_problem_grade_report(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
-    """
-    Generate a CSV containing all students' problem grades within a given
-    `course_id`.
+def _problem_grade_report_rows(course, students, student_field_names, graded_scorable_blocks, task_progress,
+                               error_rows, status_interval=100):
     """
-    start_time = time()
-    start_date = datetime.now(UTC)
-    status_interval = 100
-    enrolled_students = CourseEnrollment.objects.users_enrolled_in(course_id)
-    task_progress = TaskProgress(action_name, enrolled_students.count(), start_time)
+    Grades each of the given `students` and yields their rows in the
+    problem grade report, with one pair of earned/possible columns for each
+    of the `graded_scorable_blocks`.
 
-    # This struct encapsulates both the display names of each static item in the
-    # header row as values as well as the django User field names of those items
-    # as the keys.  It is structured in this way to keep the values related.
-    header_row = OrderedDict([('id', 'Student ID'), ('email', 'Email'), ('username', 'Username')])
-
-    graded_scorable_blocks = _graded_scorable_blocks_to_header(course_id)
-
-    # Just generate the static fields for now.
-    rows = [list(header_row.values()) + ['Grade'] + list(chain.from_iterable(graded_scorable_blocks.values()))]
-    error_rows = [list(header_row.values()) + ['error_msg']]
+    Students who could not be graded are counted as failed in
+    `task_progress`, and their error rows are appended to `error_rows`.
+    """
     current_step = {'step': 'Calculating Grades'}
-
-    course = get_course_by_id(course_id)
-    for student, course_grade, err_msg in CourseGradeFactory().iter(course, enrolled_students):
-        student_fields = [getattr(student, field_name) for field_name in header_row]
+    for student, course_grade, err_msg in CourseGradeFactory().iter(course, students):
+        student_fields = [getattr(student, field_name) for field_name in student_field_names]
         task_progress.attempted += 1
 
         if not course_grade:
@@ -1013,15 +1472,43 @@ def upload_problem_grade_report(_xmodule_instance_args, _entry_id, course_id, _t
                 else:
                     earned_possible_values.append([u'Not Attempted', problem_score.possible])
 
-        rows.append(student_fields + [course_grade.percent] + list(chain.from_iterable(earned_possible_values)))
+        yield student_fields + [course_grade.percent] + list(chain.from_iterable(earned_possible_values))
 
         task_progress.succeeded += 1
         if task_progress.attempted % status_interval == 0:
             task_progress.update_task_state(extra_meta=current_step)
 
+
+def upload_problem_grade_report(_xmodule_instance_args, _entry_id, course_id, _task_input, action_name):
+    """
+    Generate a CSV containing all students' problem grades within a given
+    `course_id`.  Rows are streamed to the ReportStore as students are graded.
+    """
+    start_time = time()
+    start_date = datetime.now(UTC)
+    enrolled_students = CourseEnrollment.objects.users_enrolled_in(course_id)
+    task_progress = TaskProgress(action_name, enrolled_students.count(), start_time)
+
+    # This struct encapsulates both the display names of each static item in the
+    # header row as values as well as the django User field names of those items
+    # as the keys.  It is structured in this way to keep the values related.
+    header_row = OrderedDict([('id', 'Student ID'), ('email', 'Email'), ('username', 'Username')])
+
+    graded_scorable_blocks = _graded_scorable_blocks_to_header(course_id)
+
+    # Just generate the static fields for now.
+    header = list(header_row.values()) + ['Grade'] + list(chain.from_iterable(graded_scorable_blocks.values()))
+    error_rows = [list(header_row.values()) + ['error_msg']]
+
+    course = get_course_by_id(course_id)
+    rows = _problem_grade_report_rows(
+        course, enrolled_students, header_row.keys(), graded_scorable_blocks, task_progress, error_rows
+    )
+
     # Perform the upload if any students have been successfully graded
-    if len(rows) > 1:
-        upload_csv_to_report_store(rows, 'problem_grade_report', course_id, start_date)
+    first_row = next(rows, None)
+    if first_row is not None:
+        upload_csv_to_report_store(chain([header, first_row], rows), 'problem_grade_report', course_id, start_date)
     # If there are any error rows, write them out as well
     if len(error_rows) > 1:
         upload_csv_to_report_store(error_rows, 'problem_grade_report_err', course_id, start_date)
@@ -1083,13 +1570,11 @@ def upload_enrollment_report(_xmodule_instance_args, _entry_id, course_id, _task
     )
     TASK_LOG.info(u'%s, Task type: %s, Starting task execution', task_info_string, action_name)
 
-    # Loop over all our students and build our CSV lists in memory
-    rows = []
-    header = None
+    # Rows are generated as they are streamed to the ReportStore, rather
+    # than built in memory.
     current_step = {'step': 'Gathering Profile Information'}
     enrollment_report_provider = PaidCourseEnrollmentReportProvider()
     total_students = students_in_course.count()
-    student_counter = 0
     TASK_LOG.info(
         u'%s, Task type: %s, Current step: %s, generating detailed enrollment report for total students: %s',
         task_info_string,
@@ -1098,86 +1583,94 @@ def upload_enrollment_report(_xmodule_instance_args, _entry_id, course_id, _task
         total_students
     )
 
-    for student in students_in_course:
-        # Periodically update task status (this is a cache write)
-        if task_progress.attempted % status_interval == 0:
-            task_progress.update_task_state(extra_meta=current_step)
-        task_progress.attempted += 1
+    def enrollment_report_rows():
+        """
+        Yields the header row followed by a row for each student, so that the
+        report can be streamed to the ReportStore.
+        """
+        header = None
+        student_counter = 0
+        for student in students_in_course.iterator():
+            # Periodically update task status (this is a cache write)
+            if task_progress.attempted % status_interval == 0:
+                task_progress.update_task_state(extra_meta=current_step)
+            task_progress.attempted += 1
 
-        # Now add a log entry after certain intervals to get a hint that task is in progress
-        student_counter += 1
-        if student_counter % 100 == 0:
-            TASK_LOG.info(
-                u'%s, Task type: %s, Current step: %s, gathering enrollment profile for students in progress: %s/%s',
-                task_info_string,
-                action_name,
-                current_step,
-                student_counter,
-                total_students
-            )
+            # Now add a log entry after certain intervals to get a hint that task is in progress
+            student_counter += 1
+            if student_counter % 100 == 0:
+                TASK_LOG.info(
+                    u'%s, Task type: %s, Current step: %s, '
+                    u'gathering enrollment profile for students in progress: %s/%s',
+                    task_info_string,
+                    action_name,
+                    current_step,
+                    student_counter,
+                    total_students
+                )
 
-        user_data = enrollment_report_provider.get_user_profile(student.id)
-        course_enrollment_data = enrollment_report_provider.get_enrollment_info(student, course_id)
-        payment_data = enrollment_report_provider.get_payment_info(student, course_id)
-
-        # display name map for the column headers
-        enrollment_report_headers = {
-            'User ID': _('User ID'),
-            'Username': _('Username'),
-            'Full Name': _('Full Name'),
-            'First Name': _('First Name'),
-            'Last Name': _('Last Name'),
-            'Company Name': _('Company Name'),
-            'Title': _('Title'),
-            'Language': _('Language'),
-            'Year of Birth': _('Year of Birth'),
-            'Gender': _('Gender'),
-            'Level of Education': _('Level of Education'),
-            'Mailing Address': _('Mailing Address'),
-            'Goals': _('Goals'),
-            'City': _('City'),
-            'Country': _('Country'),
-            'Enrollment Date': _('Enrollment Date'),
-            'Currently Enrolled': _('Currently Enrolled'),
-            'Enrollment Source': _('Enrollment Source'),
-            'Manual (Un)Enrollment Reason': _('Manual (Un)Enrollment Reason'),
-            'Enrollment Role': _('Enrollment Role'),
-            'List Price': _('List Price'),
-            'Payment Amount': _('Payment Amount'),
-            'Coupon Codes Used': _('Coupon Codes Used'),
-            'Registration Code Used': _('Registration Code Used'),
-            'Payment Status': _('Payment Status'),
-            'Transaction Reference Number': _('Transaction Reference Number')
-        }
+            user_data = enrollment_report_provider.get_user_profile(student.id)
+            course_enrollment_data = enrollment_report_provider.get_enrollment_info(student, course_id)
+            payment_data = enrollment_report_provider.get_payment_info(student, course_id)
+
+            # display name map for the column headers
+            enrollment_report_headers = {
+                'User ID': _('User ID'),
+                'Username': _('Username'),
+                'Full Name': _('Full Name'),
+                'First Name': _('First Name'),
+                'Last Name': _('Last Name'),
+                'Company Name': _('Company Name'),
+                'Title': _('Title'),
+                'Language': _('Language'),
+                'Year of Birth': _('Year of Birth'),
+                'Gender': _('Gender'),
+                'Level of Education': _('Level of Education'),
+                'Mailing Address': _('Mailing Address'),
+                'Goals': _('Goals'),
+                'City': _('City'),
+                'Country': _('Country'),
+                'Enrollment Date': _('Enrollment Date'),
+                'Currently Enrolled': _('Currently Enrolled'),
+                'Enrollment Source': _('Enrollment Source'),
+                'Manual (Un)Enrollment Reason': _('Manual (Un)Enrollment Reason'),
+                'Enrollment Role': _('Enrollment Role'),
+                'List Price': _('List Price'),
+                'Payment Amount': _('Payment Amount'),
+                'Coupon Codes Used': _('Coupon Codes Used'),
+                'Registration Code Used': _('Registration Code Used'),
+                'Payment Status': _('Payment Status'),
+                'Transaction Reference Number': _('Transaction Reference Number')
+            }
 
-        if not header:
-            header = user_data.keys() + course_enrollment_data.keys() + payment_data.keys()
-            display_headers = []
-            for header_element in header:
-                # translate header into a localizable display string
-                display_headers.append(enrollment_report_headers.get(header_element, header_element))
-            rows.append(display_headers)
+            if not header:
+                header = user_data.keys() + course_enrollment_data.keys() + payment_data.keys()
+                display_headers = []
+                for header_element in header:
+                    # translate header into a localizable display string
+                    display_headers.append(enrollment_report_headers.get(header_element, header_element))
+                yield display_headers
 
-        rows.append(user_data.values() + course_enrollment_data.values() + payment_data.values())
-        task_progress.succeeded += 1
+            yield user_data.values() + course_enrollment_data.values() + payment_data.values()
+            task_progress.succeeded += 1
+
+    upload_csv_to_report_store(
+        enrollment_report_rows(), 'enrollment_report', course_id, start_date, config_name='FINANCIAL_REPORTS'
+    )
 
     TASK_LOG.info(
         u'%s, Task type: %s, Current step: %s, Detailed enrollment report generated for students: %s/%s',
         task_info_string,
         action_name,
         current_step,
-        student_counter,
+        task_progress.attempted,
         total_students
     )
 
-    # By this point, we've got the rows we're going to stuff into our CSV files.
     current_step = {'step': 'Uploading CSVs'}
     task_progress.update_task_state(extra_meta=current_step)
     TASK_LOG.info(u'%s, Task type: %s, Current step: %s', task_info_string, action_name, current_step)
 
-    # Perform the actual upload
-    upload_csv_to_report_store(rows, 'enrollment_report', course_id, start_date, config_name='FINANCIAL_REPORTS')
-
     # One last update before we close out...
     TASK_LOG.info(u'%s, Task type: %s, Finalizing detailed enrollment task', task_info_string, action_name)
     return task_progress.update_task_state(extra_meta=current_step)
@@ -1706,7 +2199,7 @@ def upload_ora2_data(
 
     try:
         header, datarows = OraAggregateData.collect_ora2_data(course_id)
-        rows = [header] + [row for row in datarows]
+        rows = chain([header], datarows)
     # Update progress to failed regardless of error type
     except Exception:  # pylint: disable=broad-except
         TASK_LOG.exception('Failed to get ORA data.')
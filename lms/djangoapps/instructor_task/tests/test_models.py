@@ -6,6 +6,7 @@ from cStringIO import StringIO
 import time
 
 import boto
+import unicodecsv
 from django.conf import settings
 from django.test import SimpleTestCase, override_settings, TestCase
 from mock import patch
@@ -49,6 +50,30 @@ class ReportStoreTestMixin(object):
             ['new_file', 'middle_file', 'old_file']
         )
 
+    def test_store_rows_from_generator(self):
+        """
+        Test that ReportStore.store_rows() accepts a generator of rows,
+        including rows that do not fit in the in-memory spool.
+        """
+        report_store = self.create_report_store()
+        num_rows = 100
+
+        def rows():
+            """Generate rows large enough to spill the spool to disk."""
+            for index in range(num_rows):
+                yield [index, u'\u00fc' * 1024]
+
+        with patch('lms.djangoapps.instructor_task.models.REPORT_SPOOL_MAX_SIZE', 1024):
+            report_store.store_rows(self.course_id, 'generated.csv', rows())
+
+        csv_file = report_store.open(self.course_id, 'generated.csv')
+        try:
+            stored_rows = list(unicodecsv.reader(csv_file, encoding='utf-8'))
+        finally:
+            csv_file.close()
+        self.assertEqual(len(stored_rows), num_rows)
+        self.assertEqual(stored_rows[-1], [unicode(num_rows - 1), u'\u00fc' * 1024])
+
 
 class LocalFSReportStoreTestCase(ReportStoreTestMixin, TestReportMixin, SimpleTestCase):
     """
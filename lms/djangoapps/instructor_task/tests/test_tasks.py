@@ -428,6 +428,15 @@ class TestResetAttemptsInstructorTask(TestInstructorTasks):
         # check that entries were reset
         self._assert_num_attempts(students, 0)
 
+    @patch('lms.djangoapps.instructor_task.tasks_helper.MODULE_STATE_UPDATE_BATCH_SIZE', 3)
+    def test_reset_in_batches(self):
+        initial_attempts = 3
+        input_state = json.dumps({'attempts': initial_attempts})
+        num_students = 10
+        students = self._create_students_with_state(num_students, input_state)
+        self._test_run_with_task(reset_problem_attempts, 'reset', num_students)
+        self._assert_num_attempts(students, 0)
+
     def _test_reset_with_student(self, use_email):
         """Run a reset task for one student, with several StudentModules for the problem defined."""
         num_students = 10
@@ -521,6 +530,18 @@ class TestDeleteStateInstructorTask(TestInstructorTasks):
                                           student=student,
                                           module_state_key=self.location)
 
+    @patch('lms.djangoapps.instructor_task.tasks_helper.MODULE_STATE_UPDATE_BATCH_SIZE', 3)
+    def test_delete_in_batches(self):
+        """
+        Test that the states of all students are deleted when they're deleted in several batches
+        """
+        num_students = 10
+        students = self._create_students_with_state(num_students)
+        self._test_run_with_task(delete_problem_state, 'deleted', num_students)
+        self.assertFalse(
+            StudentModule.objects.filter(course_id=self.course.id, student__in=students).exists()
+        )
+
 
 class TestCertificateGenerationnstructorTask(TestInstructorTasks):
     """Tests instructor task that generates student certificates."""
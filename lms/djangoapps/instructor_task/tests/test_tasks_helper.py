@@ -8,12 +8,15 @@ Unit tests for LMS instructor-initiated background tasks helper functions.
 
 """
 
+import json
 import os
 import shutil
 from datetime import datetime
 import urllib
+from uuid import uuid4
 
 import ddt
+from celery.states import SUCCESS, FAILURE
 from freezegun import freeze_time
 from mock import Mock, patch, MagicMock
 from nose.plugins.attrib import attr
@@ -48,7 +51,8 @@ from student.models import CourseEnrollment, CourseEnrollmentAllowed, ManualEnro
 from lms.djangoapps.verify_student.tests.factories import SoftwareSecurePhotoVerificationFactory
 from xmodule.modulestore.tests.factories import CourseFactory, ItemFactory
 from xmodule.partitions.partitions import Group, UserPartition
-from lms.djangoapps.instructor_task.models import ReportStore
+from lms.djangoapps.instructor_task.models import InstructorTask, ReportStore
+from lms.djangoapps.instructor_task.tests.factories import InstructorTaskFactory
 from survey.models import SurveyForm, SurveyAnswer
 from lms.djangoapps.instructor_task.tasks_helper import (
     cohort_students_and_upload,
@@ -130,6 +134,71 @@ class TestInstructorGradeReport(InstructorGradeReportTestCase):
         report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
         self.assertTrue(any('grade_report_err' in item[0] for item in report_store.links_for(self.course.id)))
 
+    @override_settings(GRADES_DOWNLOAD_STUDENTS_PER_SHARD=2)
+    @patch('lms.djangoapps.instructor_task.tasks_helper._get_current_task')
+    def test_sharded_grade_report(self, _mock_current_task):
+        """
+        Test that courses with more students than fit in a shard are
+        graded in subtasks whose results are merged into a single report.
+        """
+        students = [
+            self.create_student(u'student{}'.format(index), u'student{}@example.com'.format(index))
+            for index in range(5)
+        ]
+        entry = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_id=str(uuid4()),
+            task_key='dummy_task_key',
+            task_type='grade_course',
+        )
+        upload_grades_csv(None, entry.id, self.course.id, None, 'graded')
+
+        entry = InstructorTask.objects.get(pk=entry.id)
+        self.assertEqual(entry.task_state, SUCCESS)
+        self.assertEqual(json.loads(entry.subtasks)['total'], 3)
+        self.assertDictContainsSubset(
+            {'attempted': 5, 'succeeded': 5, 'failed': 0},
+            json.loads(entry.task_output),
+        )
+
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        links = report_store.links_for(self.course.id)
+        self.assertEqual(len(links), 1)
+        with report_store.open(self.course.id, links[0][0]) as csv_file:
+            usernames = [row['Username'] for row in unicodecsv.DictReader(csv_file)]
+        self.assertEqual(usernames, [student.username for student in students])
+        self.assertEqual(report_store.filenames_in(self.course.id, u'grade_report_shards/{}'.format(entry.id)), [])
+
+    @override_settings(GRADES_DOWNLOAD_STUDENTS_PER_SHARD=2)
+    @patch('lms.djangoapps.instructor_task.tasks_helper._get_current_task')
+    def test_sharded_grade_report_failure(self, _mock_current_task):
+        """
+        Test that a sharded grade report fails, without uploading a report,
+        if any of its shards fails.
+        """
+        for index in range(5):
+            self.create_student(u'student{}'.format(index), u'student{}@example.com'.format(index))
+        entry = InstructorTaskFactory.create(
+            course_id=self.course.id,
+            task_id=str(uuid4()),
+            task_key='dummy_task_key',
+            task_type='grade_course',
+        )
+        with patch(
+            'lms.djangoapps.instructor_task.tasks_helper._get_pinned_collected_block_structure',
+            side_effect=IOError('Pinned block structure not found'),
+        ):
+            upload_grades_csv(None, entry.id, self.course.id, None, 'graded')
+
+        entry = InstructorTask.objects.get(pk=entry.id)
+        self.assertEqual(entry.task_state, FAILURE)
+        self.assertEqual(json.loads(entry.subtasks)['failed'], 3)
+        self.assertEqual(json.loads(entry.task_output)['exception'], 'GradeReportShardError')
+
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        self.assertEqual(report_store.links_for(self.course.id), [])
+        self.assertEqual(report_store.filenames_in(self.course.id, u'grade_report_shards/{}'.format(entry.id)), [])
+
     def test_cohort_data_in_grading(self):
         """
         Test that cohort data is included in grades csv if cohort configuration is enabled for course.
@@ -172,6 +241,35 @@ class TestInstructorGradeReport(InstructorGradeReportTestCase):
         self._verify_cell_data_for_user(user1.username, course.id, 'Cohort Name', professor_x)
         self._verify_cell_data_for_user(user2.username, course.id, 'Cohort Name', magneto)
 
+    @patch('lms.djangoapps.instructor_task.tasks_helper.GRADE_REPORT_STUDENT_BATCH_SIZE', 2)
+    @patch('lms.djangoapps.instructor_task.tasks_helper._get_current_task')
+    def test_cohort_and_team_data_across_batches(self, _mock_current_task):
+        """
+        Test that the cohort and team of each student are reported correctly
+        when students are graded in several batches.
+        """
+        course = CourseFactory.create(cohort_config={'cohorted': True}, teams_configuration={
+            'max_size': 4, 'topics': [{'topic_id': 'topic', 'name': 'Topic', 'description': 'A Topic'}]
+        })
+        cohort = CohortFactory(course_id=course.id, name=u'Cöhort')
+        team = CourseTeamFactory.create(name=u'Téam', course_id=course.id, topic_id='topic')
+        students = [UserFactory.create(username='student_{}'.format(index)) for index in range(5)]
+        for index, student in enumerate(students):
+            CourseEnrollment.enroll(student, course.id)
+            if index % 2:
+                CohortMembership(course_user_group=cohort, user=student).save()
+                CourseTeamMembershipFactory.create(team=team, user=student)
+
+        result = upload_grades_csv(None, None, course.id, None, 'graded')
+        self.assertDictContainsSubset({'attempted': 5, 'succeeded': 5, 'failed': 0}, result)
+        report_store = ReportStore.from_config(config_name='GRADES_DOWNLOAD')
+        with report_store.open(course.id, report_store.links_for(course.id)[0][0]) as csv_file:
+            rows = {row['Username']: row for row in unicodecsv.DictReader(csv_file)}
+        for index, student in enumerate(students):
+            self.assertEqual(rows[student.username]['Cohort Name'], cohort.name if index % 2 else '')
+            self.assertEqual(rows[student.username]['Team Name'], team.name if index % 2 else '')
+            self.assertEqual(rows[student.username]['Enrollment Track'], 'audit')
+
     def test_unicode_user_partitions(self):
         """
         Test that user partition groups can contain unicode characters.
@@ -2346,4 +2444,7 @@ class TestInstructorOra2Report(SharedModuleStoreTestCase):
                     filename = u'{}_ORA_data_{}.csv'.format(course_id_string, timestamp_str)
 
                     self.assertEqual(return_val, UPDATE_STATUS_SUCCEEDED)
-                    mock_store_rows.assert_called_once_with(self.course.id, filename, [test_header] + test_rows)
+                    self.assertEqual(mock_store_rows.call_count, 1)
+                    stored_course_id, stored_filename, stored_rows = mock_store_rows.call_args[0]
+                    self.assertEqual((stored_course_id, stored_filename), (self.course.id, filename))
+                    self.assertEqual(list(stored_rows), [test_header] + test_rows)
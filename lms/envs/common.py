@@ -749,6 +749,10 @@ MODULESTORE = {
                         'default_class': 'xmodule.hidden_module.HiddenDescriptor',
                         'fs_root': DATA_DIR,
                         'render_template': 'edxmako.shortcuts.render_to_string',
+                        # Maximum total size, in bytes, of the course structures and
+                        # definitions kept decoded in each process' memory, shared
+                        # across requests.  Set to 0 to disable.
+                        'local_cache_max_size': 100 * 1024 * 1024,
                     }
                 },
                 {
@@ -1193,6 +1197,14 @@ MIDDLEWARE_CLASSES = (
     'openedx.core.djangoapps.site_configuration.middleware.SessionCookieDomainOverrideMiddleware',
 )
 
+# Directory where the contentserver keeps copies of course assets too large for
+# the cache, to serve them from the local disk, and the maximum total size in
+# bytes of the copies.  The least recently used copies are deleted when a new
+# one goes over it.  If the size is None, copies are never deleted, and
+# operators must clean up the directory themselves.
+CONTENTSERVER_DISK_CACHE_DIR = None
+CONTENTSERVER_DISK_CACHE_MAX_SIZE = 10 * 1024 * 1024 * 1024
+
 # Clickjacking protection can be enabled by setting this to 'DENY'
 X_FRAME_OPTIONS = 'ALLOW'
 
@@ -1823,6 +1835,11 @@ BLOCK_STRUCTURES_SETTINGS = dict(
 
     # Maximum number of retries per task.
     BLOCK_STRUCTURES_TASK_MAX_RETRIES=5,
+
+    # Maximum total size, in bytes, of the (uncompressed) serialized
+    # block structures kept deserialized in each process' memory, in
+    # front of the block structures cache.  Set to 0 to disable.
+    BLOCK_STRUCTURES_LOCAL_CACHE_MAX_SIZE=50 * 1024 * 1024,
 )
 
 ################################ Bulk Email ###################################
@@ -2436,6 +2453,11 @@ GRADES_DOWNLOAD = {
     'ROOT_PATH': '/tmp/edx-s3/grades',
 }
 
+# Grade reports for courses with more enrolled students than this are split
+# into shards of this many students, which are graded in parallel subtasks
+# and merged into a single report.  Set to None to never shard.
+GRADES_DOWNLOAD_STUDENTS_PER_SHARD = None
+
 FINANCIAL_REPORTS = {
     'STORAGE_TYPE': 'localfs',
     'BUCKET': 'edx-financial-reports',
@@ -3049,6 +3071,24 @@ AFFILIATE_COOKIE_NAME = 'affiliate_id'
 REDIRECT_CACHE_TIMEOUT = None  # The length of time we cache Redirect model data
 REDIRECT_CACHE_KEY_PREFIX = 'redirects'
 
+############## Settings for course access roles ###############
+
+# The length of time the roles of a user are cached across requests.
+# The cache is cleared when the user's CourseAccessRoles are saved/deleted
+COURSE_ACCESS_ROLES_CACHE_TIMEOUT = 5 * 60
+
+############## Settings for the comments service client ###############
+
+# The maximum number of connections to the comments service kept alive by each process.
+COMMENTS_SERVICE_POOL_SIZE = 10
+
+# The number of times the requests to the comments service failing with
+# connection errors are retried, as well as the GET requests failing to read the response.
+COMMENTS_SERVICE_MAX_RETRIES = 2
+
+# The number of threads of each process performing independent requests to the comments service in parallel.
+COMMENTS_SERVICE_PARALLEL_REQUESTS = 4
+
 ############## Settings for LMS Context Sensitive Help ##############
 
 DOC_LINK_BASE_URL = None
@@ -2,14 +2,34 @@
 from contextlib import contextmanager
 import dogstats_wrapper as dog_stats_api
 import logging
+import os
+import threading
+from multiprocessing.pool import ThreadPool
 import requests
+from requests.adapters import HTTPAdapter
+from requests.packages.urllib3.util.retry import Retry
 from django.conf import settings
 from time import time
 from uuid import uuid4
-from django.utils.translation import get_language
+from django.utils.translation import get_language, override
+
+import request_cache
 
 log = logging.getLogger(__name__)
 
+# Name of the request cache holding the ForumsConfig used during the current request.
+FORUMS_CONFIG_REQUEST_CACHE_NAME = 'comment_client.forums_config'
+
+# The session and thread pool of the process, created on first use by each process.
+_session = None
+_session_pid = None
+_thread_pool = None
+_thread_pool_pid = None
+_lock = threading.Lock()
+
+# The ForumsConfig and language of the request on whose behalf a thread of the thread pool performs requests.
+_thread_context = threading.local()
+
 
 def strip_none(dic):
     return dict([(k, v) for k, v in dic.iteritems() if v is not None])
@@ -51,11 +71,110 @@ def request_timer(request_id, method, url, tags=None):
     )
 
 
-def perform_request(method, url, data_or_params=None, raw=False,
-                    metric_action=None, metric_tags=None, paged_results=False):
+def get_forums_config():
+    """
+    Returns the current ForumsConfig, which is only read once per request.
+    """
+    config = getattr(_thread_context, 'forums_config', None)
+    if config is not None:
+        return config
+
     # To avoid dependency conflict
     from django_comment_common.models import ForumsConfig
-    config = ForumsConfig.current()
+
+    # The request cache is only cleared between requests.
+    if request_cache.get_request() is None:
+        return ForumsConfig.current()
+    config_cache = request_cache.get_cache(FORUMS_CONFIG_REQUEST_CACHE_NAME)
+    if 'config' not in config_cache:
+        config_cache['config'] = ForumsConfig.current()
+    return config_cache['config']
+
+
+def get_session():
+    """
+    Returns the requests session of the process, which keeps up to
+    COMMENTS_SERVICE_POOL_SIZE connections to the comments service alive and
+    retries the requests failing to connect, as well as the GET requests
+    failing to read the response, up to COMMENTS_SERVICE_MAX_RETRIES times.
+    """
+    global _session, _session_pid  # pylint: disable=global-statement
+    with _lock:
+        # Connections can't be shared with the processes forked after the session was created.
+        if _session is None or _session_pid != os.getpid():
+            retries = Retry(
+                total=settings.COMMENTS_SERVICE_MAX_RETRIES,
+                method_whitelist=frozenset(['GET', 'HEAD']),
+                backoff_factor=0.1,
+            )
+            adapter = HTTPAdapter(pool_maxsize=settings.COMMENTS_SERVICE_POOL_SIZE, max_retries=retries)
+            session = requests.Session()
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+            _session_pid = os.getpid()
+        return _session
+
+
+def _get_thread_pool():
+    """
+    Returns the thread pool of the process, with COMMENTS_SERVICE_PARALLEL_REQUESTS threads.
+    """
+    global _thread_pool, _thread_pool_pid  # pylint: disable=global-statement
+    with _lock:
+        # Threads aren't copied to forked processes.
+        if _thread_pool is None or _thread_pool_pid != os.getpid():
+            _thread_pool = ThreadPool(settings.COMMENTS_SERVICE_PARALLEL_REQUESTS)
+            _thread_pool_pid = os.getpid()
+        return _thread_pool
+
+
+def _call_in_context(function, forums_config, language):
+    """
+    Calls the given function in a thread of the thread pool, performing
+    requests with the given ForumsConfig and language.
+    """
+    _thread_context.forums_config = forums_config
+    try:
+        with override(language):
+            return function()
+    finally:
+        _thread_context.forums_config = None
+
+
+def perform_requests_in_parallel(*functions):
+    """
+    Calls the given functions, which perform independent requests to the
+    comments service, in parallel and returns the list of their results.
+    The first function is called by the current thread, the others by the
+    threads of the thread pool.  If any of the functions raises an
+    exception, the first one is re-raised once they all returned.
+
+    The functions run on behalf of the current request, with its ForumsConfig
+    and language, but they must not use the database nor anything else bound
+    to the current thread.
+    """
+    if len(functions) <= 1 or getattr(_thread_context, 'forums_config', None) is not None:
+        # Threads of the thread pool don't wait for each other, which could exhaust the pool.
+        return [function() for function in functions]
+
+    forums_config = get_forums_config()
+    thread_pool = _get_thread_pool()
+    async_results = [
+        thread_pool.apply_async(_call_in_context, (function, forums_config, get_language()))
+        for function in functions[1:]
+    ]
+    try:
+        first_result = functions[0]()
+    finally:
+        for async_result in async_results:
+            async_result.wait()
+    return [first_result] + [async_result.get() for async_result in async_results]
+
+
+def perform_request(method, url, data_or_params=None, raw=False,
+                    metric_action=None, metric_tags=None, paged_results=False):
+    config = get_forums_config()
 
     if not config.enabled:
         raise CommentClientMaintenanceError('service disabled')
@@ -83,7 +202,7 @@ def perform_request(method, url, data_or_params=None, raw=False,
         data = None
         params = merge_dict(data_or_params, request_id_dict)
     with request_timer(request_id, method, url, metric_tags):
-        response = requests.request(
+        response = get_session().request(
             method,
             url,
             data=data,
@@ -1,10 +1,32 @@
 """
 Higher order functions built on the BlockStructureManager to interact with a django cache.
 """
+from django.conf import settings
 from django.core.cache import cache
+from waffle import switch_is_active
+
+from openedx.core.lib.block_structure.cache import LocalBlockStructureCache
 from openedx.core.lib.block_structure.manager import BlockStructureManager
+from openedx.core.lib.cache_utils import memoized
 from xmodule.modulestore.django import modulestore
 
+from .models import BlockStructureModelStore
+
+
+# Switch to have block structures collected incrementally, reusing
+# data collected for blocks that are unchanged since the cached block
+# structure was collected.
+INCREMENTAL_COLLECT_SWITCH = 'block_structure_incremental_collect'
+
+# Switch to verify incremental collections against collections from
+# scratch, logging any difference.
+CHECK_INCREMENTAL_COLLECT_SWITCH = 'block_structure_check_incremental_collect'
+
+# Switch to have block structures also stored durably, behind the
+# cache, so that cache misses are repopulated from storage rather than
+# collected again from the modulestore.
+STORAGE_BACKING_FOR_CACHE_SWITCH = 'block_structure_storage_backing_for_cache'
+
 
 def get_course_in_cache(course_key):
     """
@@ -25,7 +47,10 @@ def update_course_in_cache(course_key):
     block_structure.updated_collected function that updates the block
     structure in the cache for the given course_key.
     """
-    return get_block_structure_manager(course_key).update_collected()
+    return get_block_structure_manager(course_key).update_collected(
+        incremental=switch_is_active(INCREMENTAL_COLLECT_SWITCH),
+        check_incremental=switch_is_active(CHECK_INCREMENTAL_COLLECT_SWITCH),
+    )
 
 
 def clear_course_from_cache(course_key):
@@ -42,13 +67,23 @@ def clear_course_from_cache(course_key):
     get_block_structure_manager(course_key).clear()
 
 
+def clear_course_from_local_cache(course_key):
+    """
+    Evicts the block structure for the given course_key from this
+    process' local cache, if there is one.
+    """
+    local_cache = get_local_cache()
+    if local_cache is not None:
+        local_cache.delete(modulestore().make_course_usage_key(course_key))
+
+
 def get_block_structure_manager(course_key):
     """
     Returns the manager for managing Block Structures for the given course.
     """
     store = modulestore()
     course_usage_key = store.make_course_usage_key(course_key)
-    return BlockStructureManager(course_usage_key, store, get_cache())
+    return BlockStructureManager(course_usage_key, store, get_cache(), get_local_cache(), get_store())
 
 
 def get_cache():
@@ -56,3 +91,22 @@ def get_cache():
     Returns the storage for caching Block Structures.
     """
     return cache
+
+
+def get_store():
+    """
+    Returns the durable storage for Block Structures, which sits behind
+    the storage returned by get_cache, or None if it is disabled.
+    """
+    return BlockStructureModelStore(modulestore()) if switch_is_active(STORAGE_BACKING_FOR_CACHE_SWITCH) else None
+
+
+@memoized
+def get_local_cache():
+    """
+    Returns the process-local cache of Block Structures, which sits in
+    front of the storage returned by get_cache, or None if it is
+    disabled.
+    """
+    max_size = settings.BLOCK_STRUCTURES_SETTINGS.get('BLOCK_STRUCTURES_LOCAL_CACHE_MAX_SIZE')
+    return LocalBlockStructureCache(max_size) if max_size else None
@@ -0,0 +1,151 @@
+"""
+Models used by the block structure framework.
+"""
+from logging import getLogger
+
+from django.core.files.base import ContentFile
+from django.db import models, transaction
+from django.db.utils import IntegrityError
+from model_utils.models import TimeStampedModel
+
+from openedx.core.djangoapps.xmodule_django.models import UsageKeyField
+from xmodule.modulestore.exceptions import ItemNotFoundError
+
+
+log = getLogger(__name__)
+
+
+def _path_name(bs_model, filename):  # pylint: disable=unused-argument
+    """
+    Returns the path name to use for the data file of the given
+    BlockStructureModel.
+    """
+    return u'block_structures/{usage_key}/v{schema_version}/{data_version}'.format(
+        usage_key=unicode(bs_model.data_usage_key),
+        schema_version=bs_model.block_structure_schema_version,
+        data_version=bs_model.data_version or u'unversioned',
+    )
+
+
+class BlockStructureModel(TimeStampedModel):
+    """
+    Model for storing the serialized data of collected block structures,
+    so that they outlive their entries in the block structures cache.
+
+    The data itself is stored in a file, in the default file storage.
+    """
+    data_usage_key = UsageKeyField(
+        u'Identifier of the root block of the block structure.',
+        max_length=255,
+        unique=True,
+    )
+    data_version = models.CharField(
+        u'Version of the content of the block structure, such as the course version.',
+        max_length=255,
+        blank=True,
+        null=True,
+    )
+    block_structure_schema_version = models.CharField(
+        u'Version of the block structure schema the data was serialized with.',
+        max_length=255,
+    )
+    data = models.FileField(
+        upload_to=_path_name,
+        max_length=500,
+    )
+
+    def __unicode__(self):
+        return u'BlockStructureModel: {}, version: {}, schema version: {}'.format(
+            self.data_usage_key,
+            self.data_version,
+            self.block_structure_schema_version,
+        )
+
+
+class BlockStructureModelStore(object):
+    """
+    Durable storage of serialized block structures in the
+    BlockStructureModel, to use behind the block structures cache.
+    See openedx.core.lib.block_structure.cache.BlockStructureCache.
+    """
+    def __init__(self, modulestore):
+        """
+        Arguments:
+            modulestore (ModuleStoreRead) - The modulestore from which
+                the current version of the stored block structures'
+                content is read.
+        """
+        self.modulestore = modulestore
+
+    def get(self, root_block_usage_key, schema_version):
+        """
+        Returns the stored data for the given root block, if it was
+        stored with the given schema version and from the current
+        version of the root block's content, or else None.
+        """
+        try:
+            bs_model = BlockStructureModel.objects.get(data_usage_key=root_block_usage_key)
+        except BlockStructureModel.DoesNotExist:
+            return None
+        if bs_model.block_structure_schema_version != unicode(schema_version):
+            return None
+        try:
+            data_version = self._get_data_version(root_block_usage_key)
+        except ItemNotFoundError:
+            return None
+        if bs_model.data_version != data_version:
+            log.info("Stored data of %s is out of date; current version: %s.", bs_model, data_version)
+            return None
+        try:
+            bs_model.data.open('rb')
+            try:
+                return bs_model.data.read()
+            finally:
+                bs_model.data.close()
+        except IOError:
+            log.exception("Could not read the stored data of %s.", bs_model)
+            return None
+
+    def add(self, root_block_usage_key, schema_version, data_version, data):
+        """
+        Stores the given data for the given root block, replacing any
+        previously stored data.
+        """
+        try:
+            bs_model = BlockStructureModel.objects.get(data_usage_key=root_block_usage_key)
+            old_file_name = bs_model.data.name
+        except BlockStructureModel.DoesNotExist:
+            bs_model = BlockStructureModel(data_usage_key=root_block_usage_key)
+            old_file_name = None
+
+        bs_model.data_version = data_version
+        bs_model.block_structure_schema_version = unicode(schema_version)
+        try:
+            with transaction.atomic():
+                bs_model.data.save(u'data', ContentFile(data))
+        except IntegrityError:
+            # The data was stored concurrently by another process.
+            log.info("Data of %s was stored concurrently.", bs_model)
+            bs_model.data.storage.delete(bs_model.data.name)
+            return
+
+        if old_file_name and old_file_name != bs_model.data.name:
+            bs_model.data.storage.delete(old_file_name)
+
+    def delete(self, root_block_usage_key):
+        """
+        Deletes the stored data for the given root block, if any.
+        """
+        for bs_model in BlockStructureModel.objects.filter(data_usage_key=root_block_usage_key):
+            if bs_model.data:
+                bs_model.data.delete(save=False)
+            bs_model.delete()
+
+    def _get_data_version(self, root_block_usage_key):
+        """
+        Returns the current version of the content of the given root
+        block (such as the course version), as it is stored along with
+        the data, or None if its modulestore doesn't version content.
+        """
+        data_version = getattr(self.modulestore.get_item(root_block_usage_key), 'course_version', None)
+        return unicode(data_version) if data_version is not None else None
@@ -7,7 +7,7 @@ from django.dispatch.dispatcher import receiver
 from xmodule.modulestore.django import SignalHandler
 from waffle import switch_is_active
 
-from .api import clear_course_from_cache
+from .api import clear_course_from_cache, clear_course_from_local_cache
 from .tasks import update_course_in_cache
 
 
@@ -22,6 +22,8 @@ def _listen_for_course_publish(sender, course_key, **kwargs):  # pylint: disable
     """
     if switch_is_active(INVALIDATE_CACHE_ON_PUBLISH_SWITCH):
         clear_course_from_cache(course_key)
+    else:
+        clear_course_from_local_cache(course_key)
 
     update_course_in_cache.apply_async(
         [unicode(course_key)],
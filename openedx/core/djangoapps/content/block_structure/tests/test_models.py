@@ -0,0 +1,110 @@
+"""
+Unit tests for the Block Structure models
+"""
+from django.test import TestCase
+from mock import Mock, patch
+from opaque_keys.edx.locator import CourseLocator
+from waffle.testutils import override_switch
+
+from xmodule.modulestore.exceptions import ItemNotFoundError
+from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
+from xmodule.modulestore.tests.factories import CourseFactory
+
+from ..api import STORAGE_BACKING_FOR_CACHE_SWITCH, clear_course_from_cache, get_cache, get_course_in_cache
+from ..models import BlockStructureModel, BlockStructureModelStore
+
+
+class BlockStructureModelStoreTest(TestCase):
+    """
+    Tests for BlockStructureModelStore
+    """
+    def setUp(self):
+        super(BlockStructureModelStoreTest, self).setUp()
+        self.modulestore = Mock()
+        self.set_course_version(u'version_1')
+        self.store = BlockStructureModelStore(self.modulestore)
+        self.usage_key = CourseLocator('org', 'course', 'run').make_usage_key('course', 'course')
+
+    def tearDown(self):
+        self.store.delete(self.usage_key)
+        super(BlockStructureModelStoreTest, self).tearDown()
+
+    def set_course_version(self, course_version):
+        """
+        Sets the current version of the course in the mock modulestore.
+        """
+        self.modulestore.get_item.return_value = Mock(course_version=course_version)
+
+    def test_get_none(self):
+        self.assertIsNone(self.store.get(self.usage_key, 1))
+
+    def test_add_and_get(self):
+        self.store.add(self.usage_key, 1, u'version_1', 'data_1')
+        self.assertEquals(self.store.get(self.usage_key, 1), 'data_1')
+
+        bs_model = BlockStructureModel.objects.get(data_usage_key=self.usage_key)
+        self.assertEquals(bs_model.data_version, u'version_1')
+        self.assertEquals(bs_model.block_structure_schema_version, u'1')
+
+    def test_get_other_schema_version(self):
+        self.store.add(self.usage_key, 1, u'version_1', 'data_1')
+        self.assertIsNone(self.store.get(self.usage_key, 2))
+
+    def test_get_other_data_version(self):
+        self.store.add(self.usage_key, 1, u'version_1', 'data_1')
+        self.set_course_version(u'version_2')
+        self.assertIsNone(self.store.get(self.usage_key, 1))
+
+    def test_get_unversioned(self):
+        self.set_course_version(None)
+        self.store.add(self.usage_key, 1, None, 'data_1')
+        self.assertEquals(self.store.get(self.usage_key, 1), 'data_1')
+
+    def test_get_missing_root_block(self):
+        self.store.add(self.usage_key, 1, u'version_1', 'data_1')
+        self.modulestore.get_item.side_effect = ItemNotFoundError(self.usage_key)
+        self.assertIsNone(self.store.get(self.usage_key, 1))
+
+    def test_replace(self):
+        self.store.add(self.usage_key, 1, u'version_1', 'data_1')
+        old_file_name = BlockStructureModel.objects.get(data_usage_key=self.usage_key).data.name
+        self.set_course_version(u'version_2')
+        self.store.add(self.usage_key, 2, u'version_2', 'data_2')
+        self.assertEquals(self.store.get(self.usage_key, 2), 'data_2')
+        self.assertEquals(BlockStructureModel.objects.filter(data_usage_key=self.usage_key).count(), 1)
+
+        bs_model = BlockStructureModel.objects.get(data_usage_key=self.usage_key)
+        self.assertFalse(bs_model.data.storage.exists(old_file_name))
+
+    def test_delete(self):
+        self.store.add(self.usage_key, 1, u'version_1', 'data_1')
+        file_name = BlockStructureModel.objects.get(data_usage_key=self.usage_key).data.name
+        self.store.delete(self.usage_key)
+        self.assertIsNone(self.store.get(self.usage_key, 1))
+        self.assertFalse(BlockStructureModel.data.field.storage.exists(file_name))
+
+
+class StorageBackedCacheTest(ModuleStoreTestCase):
+    """
+    Tests for the block structures cache backed by BlockStructureModel
+    """
+    def setUp(self):
+        super(StorageBackedCacheTest, self).setUp()
+        self.course = CourseFactory.create()
+
+    def tearDown(self):
+        with override_switch(STORAGE_BACKING_FOR_CACHE_SWITCH, active=True):
+            clear_course_from_cache(self.course.id)
+        super(StorageBackedCacheTest, self).tearDown()
+
+    @override_switch(STORAGE_BACKING_FOR_CACHE_SWITCH, active=True)
+    def test_cache_flush(self):
+        get_course_in_cache(self.course.id)
+        get_cache().clear()
+
+        with patch(
+            'openedx.core.lib.block_structure.factory.BlockStructureFactory.create_from_modulestore'
+        ) as mock_create_from_modulestore:
+            block_structure = get_course_in_cache(self.course.id)
+        self.assertFalse(mock_create_from_modulestore.called)
+        self.assertIn(self.store.make_course_usage_key(self.course.id), block_structure)
@@ -18,7 +18,8 @@ for no more than a few dozen courses per user.
 In this app we declare the model CourseOverview, which caches course metadata
 and a MySQL table and allows very quick access to it (according to NewRelic,
 less than 1 ms). To load a CourseOverview, call CourseOverview.get_from_id
-with the appropriate course key. The use cases for this app include things like
+with the appropriate course key, or CourseOverview.get_from_ids to load those of
+several courses at once. The use cases for this app include things like
 a user enrollment dashboard, a course metadata API, or a course marketing
 page.
 """
@@ -1,10 +1,12 @@
 """
 Declaration of CourseOverview model
 """
+import copy
 import json
 import logging
 from urlparse import urlparse, urlunparse
 
+from django.core.cache import cache
 from django.db import models, transaction
 from django.db.models.fields import BooleanField, DateTimeField, DecimalField, TextField, FloatField, IntegerField
 from django.db.utils import IntegrityError
@@ -23,9 +25,22 @@ from xmodule.course_module import CourseDescriptor, DEFAULT_START_DATE
 from xmodule.error_module import ErrorDescriptor
 from xmodule.modulestore.django import modulestore
 from openedx.core.djangoapps.xmodule_django.models import CourseKeyField, UsageKeyField
+from openedx.core.lib.cache_utils import ProcessLocalCache
 
 log = logging.getLogger(__name__)
 
+# The maximum number of CourseOverviews kept by each process, and the number
+# of seconds they're kept.  Callers key the overviews by their ids and
+# modification times, so that an overview that is regenerated is never served
+# from the cache, and store and get copies of them.
+COURSE_OVERVIEW_CACHE_SIZE = 1000
+COURSE_OVERVIEW_CACHE_TIMEOUT = 10 * 60
+COURSE_OVERVIEW_CACHE = ProcessLocalCache(COURSE_OVERVIEW_CACHE_SIZE, COURSE_OVERVIEW_CACHE_TIMEOUT)
+
+# The number of seconds after queueing the creation of a course's image set
+# before get_from_ids queues it again, if the image set is still missing.
+IMAGE_SET_PENDING_TIMEOUT = 60 * 5
+
 
 class CourseOverview(TimeStampedModel):
     """
@@ -274,6 +289,65 @@ class CourseOverview(TimeStampedModel):
 
         return course_overview or cls.load_from_module_store(course_id)
 
+    @classmethod
+    def get_from_ids(cls, course_ids):
+        """
+        Load the CourseOverview objects of the given course IDs at once.
+
+        The overviews that exist and are up to date are fetched, along with
+        their tabs and image sets, in a few queries, unless they are cached by
+        the process.  The others are loaded as by get_from_id.  Missing image
+        sets are generated by a background task rather than during the call,
+        so the overviews use their course images until then.
+
+        Arguments:
+            course_ids (iterable[CourseKey]): the IDs of the course overviews
+                to be loaded.
+
+        Returns:
+            dict[CourseKey, CourseOverview]: overviews of the requested
+                courses, or None for the courses that were not found or could
+                not be loaded from the module store.
+        """
+        course_ids = set(course_ids)
+        course_overviews = {}
+
+        uncached_ids = []
+        current_entries = cls.objects.filter(id__in=course_ids, version__gte=cls.VERSION).values_list('id', 'modified')
+        for course_id, modified in current_entries:
+            course_overview = COURSE_OVERVIEW_CACHE.get((course_id, modified))
+            if course_overview is None:
+                uncached_ids.append(course_id)
+            else:
+                course_overviews[course_id] = copy.copy(course_overview)
+
+        if uncached_ids:
+            uncached_overviews = cls.objects.filter(
+                id__in=uncached_ids, version__gte=cls.VERSION
+            ).select_related('image_set').prefetch_related('tabs')
+            for course_overview in uncached_overviews:
+                course_overviews[course_overview.id] = course_overview
+                COURSE_OVERVIEW_CACHE.set((course_overview.id, course_overview.modified), copy.copy(course_overview))
+
+        if CourseOverviewImageConfig.current().enabled:
+            # Imported here to avoid a circular import.
+            from openedx.core.djangoapps.content.course_overviews.tasks import create_course_overview_image_set
+            for course_overview in course_overviews.itervalues():
+                if not hasattr(course_overview, 'image_set'):
+                    # cache.add fails if the task was already queued by any process.
+                    pending_key = u'course_overviews.image_set_pending.{}'.format(course_overview.id)
+                    if cache.add(pending_key, True, IMAGE_SET_PENDING_TIMEOUT):
+                        create_course_overview_image_set.delay(unicode(course_overview.id))
+
+        # Outdated and missing overviews are regenerated from the module store.
+        for course_id in course_ids.difference(course_overviews):
+            try:
+                course_overviews[course_id] = cls.get_from_id(course_id)
+            except (cls.DoesNotExist, IOError):
+                course_overviews[course_id] = None
+
+        return course_overviews
+
     def clean_id(self, padding_char='='):
         """
         Returns a unique deterministic base32-encoded ID for the course.
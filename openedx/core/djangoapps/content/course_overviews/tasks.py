@@ -0,0 +1,32 @@
+"""
+Asynchronous tasks related to the Course Overviews sub-application.
+"""
+import logging
+
+from celery.task import task
+from django.utils import timezone
+from opaque_keys.edx.keys import CourseKey
+
+from openedx.core.djangoapps.content.course_overviews.models import CourseOverview, CourseOverviewImageSet
+
+
+log = logging.getLogger('edx.celery.task')
+
+
+@task(name=u'openedx.core.djangoapps.content.course_overviews.tasks.create_course_overview_image_set')
+def create_course_overview_image_set(course_id):
+    """
+    Creates the image set of the CourseOverview of the given course, unless
+    it already exists.
+    """
+    course_key = CourseKey.from_string(course_id)
+    try:
+        course_overview = CourseOverview.objects.select_related('image_set').get(id=course_key)
+    except CourseOverview.DoesNotExist:
+        log.info("Not creating the image set of the missing course overview of %s", course_id)
+        return
+
+    if not hasattr(course_overview, 'image_set'):
+        CourseOverviewImageSet.create_for_course(course_overview)
+        # Mark the overview as modified so that copies cached without the image set aren't used anymore.
+        CourseOverview.objects.filter(id=course_key).update(modified=timezone.now())
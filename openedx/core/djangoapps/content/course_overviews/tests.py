@@ -11,6 +11,7 @@ from nose.plugins.attrib import attr
 import pytz
 
 from django.conf import settings
+from django.core.cache import cache
 from django.test.utils import override_settings
 from django.utils import timezone
 from PIL import Image
@@ -34,7 +35,7 @@ from xmodule.modulestore.django import modulestore
 from xmodule.modulestore.tests.django_utils import ModuleStoreTestCase
 from xmodule.modulestore.tests.factories import CourseFactory, check_mongo_calls, check_mongo_calls_range
 
-from .models import CourseOverview, CourseOverviewImageSet, CourseOverviewImageConfig
+from .models import COURSE_OVERVIEW_CACHE, CourseOverview, CourseOverviewImageSet, CourseOverviewImageConfig
 
 
 @attr(shard=3)
@@ -455,6 +456,42 @@ class CourseOverviewTestCase(ModuleStoreTestCase):
             set(select_course_ids),
         )
 
+    def test_get_from_ids(self):
+        self.addCleanup(COURSE_OVERVIEW_CACHE.clear)
+        course_ids = [CourseFactory.create(emit_signals=True).id for __ in range(3)]
+        missing_course_id = self.store.make_course_key('Non', 'Existent', 'Course')
+
+        course_overviews = CourseOverview.get_from_ids(course_ids + [missing_course_id])
+        self.assertEqual(set(course_overviews), set(course_ids + [missing_course_id]))
+        self.assertIsNone(course_overviews[missing_course_id])
+        for course_id in course_ids:
+            self.assertEqual(course_overviews[course_id].id, course_id)
+            self.assertEqual({tab.tab_id for tab in course_overviews[course_id].tabs.all()}, self.COURSE_OVERVIEW_TABS)
+
+        # The overviews are now cached by the process, along with their tabs.
+        with check_mongo_calls(0):
+            cached_overviews = CourseOverview.get_from_ids(course_ids)
+        for course_id in course_ids:
+            self.assertIsNot(cached_overviews[course_id], course_overviews[course_id])
+            with self.assertNumQueries(0):
+                tab_ids = {tab.tab_id for tab in cached_overviews[course_id].tabs.all()}
+            self.assertEqual(tab_ids, self.COURSE_OVERVIEW_TABS)
+
+    def test_get_from_ids_modified_overview(self):
+        self.addCleanup(COURSE_OVERVIEW_CACHE.clear)
+        course = CourseFactory.create(emit_signals=True)
+        course_overview = CourseOverview.get_from_ids([course.id])[course.id]
+
+        # Saving the overview changes its modification time, so it's not served from the cache.
+        course_overview.display_name = u'Updated Name'
+        course_overview.save()
+        self.assertEqual(CourseOverview.get_from_ids([course.id])[course.id].display_name, u'Updated Name')
+
+    def test_get_from_ids_outdated_overview(self):
+        course = CourseFactory.create(emit_signals=True)
+        CourseOverview.objects.filter(id=course.id).update(version=CourseOverview.VERSION - 1)
+        self.assertEqual(CourseOverview.get_from_ids([course.id])[course.id].version, CourseOverview.VERSION)
+
     def test_get_all_courses(self):
         course_ids = [CourseFactory.create(emit_signals=True).id for __ in range(3)]
         self.assertEqual(
@@ -586,6 +623,31 @@ class CourseOverviewImageSetTestCase(ModuleStoreTestCase):
         # Because we are disabled, no image set should have been generated.
         self.assertFalse(hasattr(course_overview, 'image_set'))
 
+    def test_get_from_ids_creates_image_set_in_background(self):
+        """
+        Test that get_from_ids creates missing image sets in a background task.
+        """
+        self.addCleanup(COURSE_OVERVIEW_CACHE.clear)
+        self.set_config(enabled=False)
+        course = CourseFactory.create(emit_signals=True)
+        self.assertFalse(hasattr(CourseOverview.get_from_id(course.id), 'image_set'))
+
+        self.set_config(enabled=True)
+        with mock.patch(
+            'openedx.core.djangoapps.content.course_overviews.tasks.create_course_overview_image_set.delay'
+        ) as mock_delay:
+            course_overview = CourseOverview.get_from_ids([course.id])[course.id]
+            # The task is only queued once while it's pending.
+            CourseOverview.get_from_ids([course.id])
+        self.assertFalse(hasattr(course_overview, 'image_set'))
+        mock_delay.assert_called_once_with(unicode(course.id))
+
+        # The task runs eagerly in tests.
+        cache.clear()
+        CourseOverview.get_from_ids([course.id])
+        self.assertTrue(CourseOverviewImageSet.objects.filter(course_overview_id=course.id).exists())
+        self.assertTrue(hasattr(CourseOverview.get_from_ids([course.id])[course.id], 'image_set'))
+
     @ddt.data(ModuleStoreEnum.Type.mongo, ModuleStoreEnum.Type.split)
     def test_disabled_with_prior_data(self, modulestore_type):
         """
@@ -1,10 +1,15 @@
 """
 Helper functions for caching course assets.
 """
+import errno
+import os
+from tempfile import NamedTemporaryFile
+from uuid import uuid4
+
 from django.core.cache import caches
 from django.core.cache.backends.base import InvalidCacheBackendError
 from opaque_keys import InvalidKeyError
-from xmodule.contentstore.content import STATIC_CONTENT_VERSION
+from xmodule.contentstore.content import STATIC_CONTENT_VERSION, StaticContentStream
 
 # See if there's a "course_assets" cache configured, and if not, fallback to the default cache.
 CONTENT_CACHE = caches['default']
@@ -13,6 +18,12 @@ try:
 except InvalidCacheBackendError:
     pass
 
+# The prefix of the names of copies being written to the disk cache.
+DISK_CACHE_TEMP_PREFIX = 'tmp'
+
+# The key of the token identifying the current version of a course's assets.
+ASSETS_VERSION_CACHE_KEY = u'course_assets.version.{course_key}'
+
 
 def set_cached_content(content):
     """
@@ -47,3 +58,125 @@ def del_cached_content(location):
         pass
 
     CONTENT_CACHE.delete_many(locations, version=STATIC_CONTENT_VERSION)
+    _bump_course_assets_version(location.course_key)
+
+
+def _course_assets_version_key(course_key):
+    """
+    Returns the cache key of the version token of the given course's assets.
+    """
+    return ASSETS_VERSION_CACHE_KEY.format(course_key=unicode(course_key)).encode("utf-8")
+
+
+def get_course_assets_version(course_key):
+    """
+    Returns a token identifying the current version of the given course's assets,
+    which changes whenever one of them is updated or deleted, so that values derived
+    from the assets can be cached under it.
+    """
+    key = _course_assets_version_key(course_key)
+    version = CONTENT_CACHE.get(key)
+    if version is None:
+        version = uuid4().hex
+        if not CONTENT_CACHE.add(key, version, None):
+            # Another process set the version first, unless the cache doesn't store anything.
+            version = CONTENT_CACHE.get(key, version)
+    return version
+
+
+def _bump_course_assets_version(course_key):
+    """
+    Replaces the version token of the given course's assets.
+    """
+    CONTENT_CACHE.set(_course_assets_version_key(course_key), uuid4().hex, None)
+
+
+def get_disk_cached_content(content, cache_dir, max_size=None):
+    """
+    Returns a StaticContentStream of the given content, which must have a digest,
+    read from a copy in cache_dir.  The copy is written first if it doesn't exist.
+
+    Copies are keyed by the content digest, so they never need to be invalidated.
+    If max_size is given, the least recently used copies are deleted whenever a
+    new copy brings the total size of cache_dir above max_size bytes.
+    """
+    directory = os.path.join(cache_dir, content.content_digest[:2])
+    path = os.path.join(directory, content.content_digest)
+    written = not os.path.exists(path)
+    if written:
+        try:
+            os.makedirs(directory)
+        except OSError as error:
+            if error.errno != errno.EEXIST:
+                raise
+
+        # Write to a temporary file first, so that a partial copy is never served.
+        with NamedTemporaryFile(dir=directory, prefix=DISK_CACHE_TEMP_PREFIX, delete=False) as temp_file:
+            try:
+                for chunk in content.stream_data():
+                    temp_file.write(chunk)
+            except Exception:
+                os.remove(temp_file.name)
+                raise
+        os.rename(temp_file.name, path)
+    else:
+        # The modification time of a copy is the time it was last used.
+        _touch(path)
+    content.close()
+
+    # Copies being served stay readable after they're deleted, until they're closed.
+    data_file = open(path, 'rb')
+    if written and max_size is not None:
+        _prune_disk_cache(cache_dir, max_size)
+
+    return StaticContentStream(
+        content.location, content.name, content.content_type, data_file,
+        last_modified_at=content.last_modified_at, thumbnail_location=content.thumbnail_location,
+        import_path=content.import_path, length=content.length, locked=content.locked,
+        content_digest=content.content_digest
+    )
+
+
+def _touch(path):
+    """
+    Sets the modification time of the given file to now, unless it was deleted.
+    """
+    try:
+        os.utime(path, None)
+    except OSError as error:
+        if error.errno != errno.ENOENT:
+            raise
+
+
+def _prune_disk_cache(cache_dir, max_size):
+    """
+    Deletes the least recently used copies in cache_dir until their total size
+    is at most max_size bytes.  Copies being written are left alone.
+    """
+    copies = []
+    total_size = 0
+    for directory, __, filenames in os.walk(cache_dir):
+        for filename in filenames:
+            if filename.startswith(DISK_CACHE_TEMP_PREFIX):
+                continue
+            path = os.path.join(directory, filename)
+            try:
+                stat = os.stat(path)
+            except OSError as error:
+                # Another process deleted the copy first.
+                if error.errno != errno.ENOENT:
+                    raise
+                continue
+            copies.append((stat.st_mtime, stat.st_size, path))
+            total_size += stat.st_size
+
+    copies.sort()
+    for __, size, path in copies:
+        if total_size <= max_size:
+            break
+        try:
+            os.remove(path)
+        except OSError as error:
+            if error.errno != errno.ENOENT:
+                raise
+        total_size -= size
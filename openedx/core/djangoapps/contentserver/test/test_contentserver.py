@@ -6,10 +6,14 @@ import copy
 import datetime
 import ddt
 import logging
+import os
+import shutil
 import unittest
+from tempfile import mkdtemp
 from uuid import uuid4
 
 from django.conf import settings
+from django.core.cache.backends.locmem import LocMemCache
 from django.test import RequestFactory
 from django.test.client import Client
 from django.test.utils import override_settings
@@ -22,11 +26,13 @@ from xmodule.modulestore.tests.django_utils import SharedModuleStoreTestCase
 from xmodule.modulestore.xml_importer import import_course_from_xml
 from xmodule.assetstore.assetmgr import AssetManager
 from opaque_keys import InvalidKeyError
+from opaque_keys.edx.locations import SlashSeparatedCourseKey
 from xmodule.modulestore.exceptions import ItemNotFoundError
 
 from student.models import CourseEnrollment
 from student.tests.factories import UserFactory, AdminFactory
 
+from ..caching import del_cached_content, get_course_assets_version, get_disk_cached_content
 from ..middleware import parse_range_header, HTTP_DATE_FORMAT, StaticContentServer
 
 log = logging.getLogger(__name__)
@@ -242,16 +248,82 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
 
     def test_range_request_multiple_ranges(self):
         """
-        Test that multiple ranges in request outputs the full content.
+        Test that multiple ranges in request outputs a multipart message with each range.
         """
         first_byte = self.length_unlocked / 4
         last_byte = self.length_unlocked / 2
         resp = self.client.get(self.url_unlocked, HTTP_RANGE='bytes={first}-{last}, -100'.format(
             first=first_byte, last=last_byte))
 
-        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.status_code, 206)  # HTTP_206_PARTIAL_CONTENT
         self.assertNotIn('Content-Range', resp)
-        self.assertEqual(resp['Content-Length'], str(self.length_unlocked))
+        self.assertTrue(resp['Content-Type'].startswith('multipart/byteranges; boundary='))
+        body = ''.join(resp.streaming_content)
+        self.assertEqual(resp['Content-Length'], str(len(body)))
+
+        data = self.contentstore.find(self.unlocked_asset).data
+        boundary = resp['Content-Type'].split('boundary=')[1]
+        parts = body.split('--{}'.format(boundary))
+        self.assertEqual(parts[0], '')
+        self.assertEqual(parts[-1], '--\r\n')
+        self.assertEqual(len(parts), 4)
+        expected_ranges = [(first_byte, last_byte), (self.length_unlocked - 100, self.length_unlocked - 1)]
+        for part, (first, last) in zip(parts[1:3], expected_ranges):
+            headers, part_data = part.split('\r\n\r\n', 1)
+            self.assertIn('Content-Range: bytes {first}-{last}/{length}'.format(
+                first=first, last=last, length=self.length_unlocked), headers)
+            self.assertEqual(part_data, data[first:last + 1] + '\r\n')
+
+    def test_etag(self):
+        """
+        Test that the asset digest is sent as an ETag, and that a matching
+        If-None-Match outputs 304 Not Modified.
+        """
+        resp = self.client.get(self.url_unlocked)
+        self.assertEqual(resp.status_code, 200)
+        etag = resp['ETag']
+
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp['ETag'], etag)
+
+        resp = self.client.get(self.url_unlocked, HTTP_IF_NONE_MATCH='"{}"'.format(FAKE_MD5_HASH))
+        self.assertEqual(resp.status_code, 200)
+
+    def test_disk_cached_content(self):
+        """
+        Test that content cached on disk is read from a copy named after its digest.
+        """
+        cache_dir = mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        content = AssetManager.find(self.unlocked_asset, as_stream=True)
+        digest = content.content_digest
+
+        cached_content = get_disk_cached_content(content, cache_dir)
+        self.addCleanup(cached_content.close)
+        self.assertTrue(os.path.isfile(os.path.join(cache_dir, digest[:2], digest)))
+        self.assertEqual(cached_content.content_digest, digest)
+        self.assertEqual(''.join(cached_content.stream_data()), self.contentstore.find(self.unlocked_asset).data)
+
+    def test_disk_cache_max_size(self):
+        """
+        Test that the least recently used copies are deleted when the disk cache grows above its maximum size.
+        """
+        cache_dir = mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir)
+        os.mkdir(os.path.join(cache_dir, 'ab'))
+        old_path = os.path.join(cache_dir, 'ab', 'abcdef')
+        with open(old_path, 'wb') as old_file:
+            old_file.write('old copy')
+        os.utime(old_path, (0, 0))
+        content = AssetManager.find(self.unlocked_asset, as_stream=True)
+        digest = content.content_digest
+
+        cached_content = get_disk_cached_content(content, cache_dir, max_size=content.length)
+        self.addCleanup(cached_content.close)
+        self.assertFalse(os.path.exists(old_path))
+        self.assertTrue(os.path.isfile(os.path.join(cache_dir, digest[:2], digest)))
+        self.assertEqual(''.join(cached_content.stream_data()), self.contentstore.find(self.unlocked_asset).data)
 
     @ddt.data(
         'bytes 0-',
@@ -403,6 +475,35 @@ class ContentStoreToyCourseTest(SharedModuleStoreTestCase):
         self.assertEqual(is_from_cdn, True)
 
 
+class CourseAssetsVersionTestCase(unittest.TestCase):
+    """
+    Tests for the version of the assets of a course.
+    """
+    def setUp(self):
+        super(CourseAssetsVersionTestCase, self).setUp()
+        patcher = patch(
+            'openedx.core.djangoapps.contentserver.caching.CONTENT_CACHE',
+            LocMemCache('course-assets-version-{}'.format(uuid4().hex), {})
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.course_key = SlashSeparatedCourseKey('edX', 'toy', '2012_Fall')
+        self.other_course_key = SlashSeparatedCourseKey('edX', 'other', '2012_Fall')
+
+    def test_version_stable(self):
+        self.assertEqual(get_course_assets_version(self.course_key), get_course_assets_version(self.course_key))
+        self.assertNotEqual(
+            get_course_assets_version(self.course_key), get_course_assets_version(self.other_course_key)
+        )
+
+    def test_version_changed_by_deleted_content(self):
+        version = get_course_assets_version(self.course_key)
+        other_version = get_course_assets_version(self.other_course_key)
+        del_cached_content(StaticContent.compute_location(self.course_key, 'sample_static.txt'))
+        self.assertNotEqual(get_course_assets_version(self.course_key), version)
+        self.assertEqual(get_course_assets_version(self.other_course_key), other_version)
+
+
 @ddt.ddt
 class ParseRangeHeaderTestCase(unittest.TestCase):
     """
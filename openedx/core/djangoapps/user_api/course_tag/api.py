@@ -39,6 +39,31 @@ def get_course_tag(user, course_id, key):
         return None
 
 
+def get_course_tags_for_users(users, course_id, keys):
+    """
+    Gets the values of the given users' course tags for the specified keys in the
+    specified course_id, using a single query.
+
+    Args:
+        users: the User objects (or ids) for the course tags
+        course_id: course identifier (string)
+        keys: list of arbitrary (<=255 char string) keys
+
+    Returns:
+        dict mapping (user id, key) to the string value, for each tag that is saved
+    """
+    if not keys:
+        return {}
+    return {
+        (user_id, key): value
+        for user_id, key, value in UserCourseTag.objects.filter(
+            user__in=users,
+            course_id=course_id,
+            key__in=keys,
+        ).values_list('user_id', 'key', 'value')
+    }
+
+
 def set_course_tag(user, course_id, key, value):
     """
     Sets the value of the user's course tag for the specified key in the specified
@@ -36,3 +36,21 @@ class TestCourseTagAPI(TestCase):
         course_tag_api.set_course_tag(self.user, self.course_id, self.test_key, test_value)
         tag = course_tag_api.get_course_tag(self.user, self.course_id, self.test_key)
         self.assertEqual(tag, test_value)
+
+    def test_get_course_tags_for_users(self):
+        other_user = UserFactory.create()
+        other_key = 'other_key'
+        course_tag_api.set_course_tag(self.user, self.course_id, self.test_key, 'value')
+        course_tag_api.set_course_tag(self.user, self.course_id, other_key, 'other value')
+        course_tag_api.set_course_tag(other_user, self.course_id, self.test_key, 'value2')
+        course_tag_api.set_course_tag(other_user, self.course_id, 'unrequested_key', 'value3')
+
+        with self.assertNumQueries(1):
+            tags = course_tag_api.get_course_tags_for_users(
+                [self.user, other_user], self.course_id, [self.test_key, other_key]
+            )
+        self.assertEqual(tags, {
+            (self.user.id, self.test_key): 'value',
+            (self.user.id, other_key): 'other value',
+            (other_user.id, self.test_key): 'value2',
+        })
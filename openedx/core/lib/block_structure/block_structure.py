@@ -23,12 +23,23 @@ logger = getLogger(__name__)  # pylint: disable=invalid-name
 # A dictionary key value for storing a transformer's version number.
 TRANSFORMER_VERSION_KEY = '_version'
 
+# The name of the xBlock field holding the time of the last change to a
+# block's content, children or settings, which is collected for every
+# block to detect the blocks that are unchanged since a previous
+# collection.
+EDITED_ON_XBLOCK_FIELD = 'edited_on'
+
+# Sentinel for values that are not found.
+_MISSING = object()
+
 
 class _BlockRelations(object):
     """
     Data structure to encapsulate relationships for a single block,
     including its children and parents.
     """
+    __slots__ = ('parents', 'children')
+
     def __init__(self):
 
         # List of usage keys of this block's parents.
@@ -39,6 +50,16 @@ class _BlockRelations(object):
         # list [UsageKey]
         self.children = []
 
+    def copy(self):
+        """
+        Returns a copy of this instance, whose relations can be
+        modified independently of this instance's.
+        """
+        block_relations = _BlockRelations()
+        block_relations.parents = list(self.parents)
+        block_relations.children = list(self.children)
+        return block_relations
+
 
 class BlockStructure(object):
     """
@@ -62,6 +83,13 @@ class BlockStructure(object):
         # dict {UsageKey: _BlockRelations}
         self._block_relations = {}
 
+        # When this structure is a copy-on-write copy of another
+        # structure (see BlockStructureBlockData.copy_on_write), the
+        # other structure's map of block relations.  Its values are
+        # shared with this structure until they are modified.
+        # dict {UsageKey: _BlockRelations} or None
+        self._shared_block_relations = None
+
         # Add the root block.
         self._add_block(self._block_relations, root_block_usage_key)
 
@@ -91,7 +119,8 @@ class BlockStructure(object):
         Returns:
             [UsageKey] - A list of usage keys of the block's parents.
         """
-        return self._block_relations[usage_key].parents if usage_key in self else []
+        block_relations = self._block_relations.get(usage_key)
+        return block_relations.parents if block_relations is not None else []
 
     def get_children(self, usage_key):
         """
@@ -105,7 +134,8 @@ class BlockStructure(object):
         Returns:
             [UsageKey] - A list of usage keys of the block's children.
         """
-        return self._block_relations[usage_key].children if usage_key in self else []
+        block_relations = self._block_relations.get(usage_key)
+        return block_relations.children if block_relations is not None else []
 
     def set_root_block(self, usage_key):
         """
@@ -120,7 +150,7 @@ class BlockStructure(object):
                 new root of the block structure.
         """
         self.root_block_usage_key = usage_key
-        self._block_relations[usage_key].parents = []
+        self._get_block_relations_for_update(usage_key).parents = []
 
     def __contains__(self, usage_key):
         """
@@ -226,8 +256,10 @@ class BlockStructure(object):
                     if child in pruned_block_relations:
                         self._add_to_relations(pruned_block_relations, block_key, child)
 
-        # Replace this structure's relations with the newly pruned one.
+        # Replace this structure's relations with the newly pruned one,
+        # which no longer shares any relations with another structure.
         self._block_relations = pruned_block_relations
+        self._shared_block_relations = None
 
     def _add_relation(self, parent_key, child_key):
         """
@@ -237,8 +269,27 @@ class BlockStructure(object):
             parent_key (UsageKey) - Usage key of the parent block.
             child_key (UsageKey) - Usage key of the child block.
         """
+        for block_key in (parent_key, child_key):
+            if block_key in self._block_relations:
+                self._get_block_relations_for_update(block_key)
         self._add_to_relations(self._block_relations, parent_key, child_key)
 
+    def _get_block_relations_for_update(self, usage_key):
+        """
+        Returns the relations of the block identified by the given
+        usage_key, for them to be modified.  Relations that are still
+        shared with the structure that this structure is a
+        copy-on-write copy of are copied first.
+        """
+        block_relations = self._block_relations[usage_key]
+        if (
+                self._shared_block_relations is not None and
+                block_relations is self._shared_block_relations.get(usage_key)
+        ):
+            block_relations = block_relations.copy()
+            self._block_relations[usage_key] = block_relations
+        return block_relations
+
     @staticmethod
     def _add_to_relations(block_relations, parent_key, child_key):
         """
@@ -281,22 +332,50 @@ class FieldData(object):
     """
     Data structure to encapsulate collected fields.
     """
+    __slots__ = ('fields',)
+
+    # Names of the fields that are defined directly on the class, as
+    # slots.  Subclasses that define additional slots add them here.
+    # All other fields are stored in the self.fields dict.
+    _OWN_FIELD_NAMES = frozenset(__slots__)
+
     def class_field_names(self):
         """
         Returns list of names of fields that are defined directly
-        on the class. Can be overridden by subclasses. All other
-        fields are assumed to be stored in the self.fields dict.
+        on the class. All other fields are assumed to be stored in
+        the self.fields dict.
         """
-        return ['fields']
+        return list(self._OWN_FIELD_NAMES)
 
     def __init__(self):
         # Map of field name to the field's value for this block.
         # dict {string: any picklable type}
         self.fields = {}
 
+    def copy(self):
+        """
+        Returns a copy of this instance, whose fields can be modified
+        independently of this instance's.
+        """
+        field_data = type(self)()
+        field_data.fields = dict(self.fields)
+        return field_data
+
+    def get_field(self, field_name, default=None):
+        """
+        Returns the value of the given field, or default if not found.
+        Equivalent to getattr(self, field_name, default), without the
+        overhead of __getattr__ for the fields in the self.fields dict.
+        """
+        if field_name in self._OWN_FIELD_NAMES:
+            return getattr(self, field_name, default)
+        return self.fields.get(field_name, default)
+
     def __getattr__(self, field_name):
+        # Only called when the attribute is not found on the instance
+        # or class, so own fields that are reached here are unset.
         if self._is_own_field(field_name):
-            return super(FieldData, self).__getattr__(field_name)
+            raise AttributeError("Field {0} is not set".format(field_name))
         try:
             return self.fields[field_name]
         except KeyError:
@@ -319,14 +398,14 @@ class FieldData(object):
         Returns whether the given field_name is the name of an
         actual field of this class.
         """
-        return field_name in self.class_field_names()
+        return field_name in self._OWN_FIELD_NAMES
 
 
 class TransformerData(FieldData):
     """
     Data structure to encapsulate collected data for a transformer.
     """
-    pass
+    __slots__ = ()
 
 
 class TransformerDataMap(dict):
@@ -347,6 +426,10 @@ class TransformerDataMap(dict):
         key = self._translate_key(key)
         dict.__delitem__(self, key)
 
+    def get(self, key, default=None):
+        key = self._translate_key(key)
+        return dict.get(self, key, default)
+
     def get_or_create(self, key):
         """
         Returns the TransformerData associated with the given
@@ -369,6 +452,8 @@ class TransformerDataMap(dict):
             map[TransformerClass] or
             map['transformer_name']
         """
+        if isinstance(key, basestring):
+            return key
         try:
             return key.name()
         except AttributeError:
@@ -379,8 +464,9 @@ class BlockData(FieldData):
     """
     Data structure to encapsulate collected data for a single block.
     """
-    def class_field_names(self):
-        return super(BlockData, self).class_field_names() + ['location', 'transformer_data']
+    __slots__ = ('location', 'transformer_data')
+
+    _OWN_FIELD_NAMES = FieldData._OWN_FIELD_NAMES | frozenset(__slots__)
 
     def __init__(self, usage_key):
         super(BlockData, self).__init__()
@@ -391,6 +477,19 @@ class BlockData(FieldData):
         # Map of transformer name to its block-specific data.
         self.transformer_data = TransformerDataMap()
 
+    def copy(self):
+        """
+        Returns a copy of this instance, whose fields and transformer
+        data can be modified independently of this instance's.
+        """
+        block_data = BlockData(self.location)
+        block_data.fields = dict(self.fields)
+        block_data.transformer_data = TransformerDataMap(
+            (transformer_name, transformer_data.copy())
+            for transformer_name, transformer_data in self.transformer_data.iteritems()
+        )
+        return block_data
+
 
 class BlockStructureBlockData(BlockStructure):
     """
@@ -401,7 +500,8 @@ class BlockStructureBlockData(BlockStructure):
     # update this value whenever the data structure changes. Dependent storage
     # layers can then use this value when serializing/deserializing block
     # structures, and invalidating any previously cached/stored data.
-    VERSION = 1
+    # Version 2: compact serialization of the cacheable data.
+    VERSION = 2
 
     def __init__(self, root_block_usage_key):
         super(BlockStructureBlockData, self).__init__(root_block_usage_key)
@@ -414,6 +514,13 @@ class BlockStructureBlockData(BlockStructure):
         # Map of a transformer's name to its non-block-specific data.
         self.transformer_data = TransformerDataMap()
 
+        # When this structure is a copy-on-write copy of another
+        # structure, the other structure's maps of block data and of
+        # transformer data, whose values are shared with this
+        # structure until they are modified.
+        self._shared_block_data_map = None
+        self._shared_transformer_data = None
+
     def copy(self):
         """
         Returns a new instance of BlockStructureBlockData with a
@@ -427,6 +534,31 @@ class BlockStructureBlockData(BlockStructure):
             deepcopy(self._block_data_map),
         )
 
+    def copy_on_write(self):
+        """
+        Returns a new instance of BlockStructureBlockData that shares
+        this instance's contents.  The new instance copies the
+        relations and data of a block, and the data of a transformer,
+        only when they are first modified through its methods, which
+        makes it much cheaper to create than a copy for structures
+        that are only partially modified, such as when transformed.
+
+        This instance must not be modified while the new instance is
+        in use, and values returned by the new instance's getters must
+        not be modified in place.
+        """
+        from .factory import BlockStructureFactory
+        block_structure = BlockStructureFactory.create_new(
+            self.root_block_usage_key,
+            dict(self._block_relations),
+            TransformerDataMap(self.transformer_data),
+            dict(self._block_data_map),
+        )
+        block_structure._shared_block_relations = self._block_relations
+        block_structure._shared_transformer_data = self.transformer_data
+        block_structure._shared_block_data_map = self._block_data_map
+        return block_structure
+
     def iteritems(self):
         """
         Returns iterator of (UsageKey, BlockData) pairs for all
@@ -464,7 +596,7 @@ class BlockStructureBlockData(BlockStructure):
                 not found.
         """
         block_data = self._block_data_map.get(usage_key)
-        return getattr(block_data, field_name, default) if block_data else default
+        return block_data.get_field(field_name, default) if block_data is not None else default
 
     def get_transformer_data(self, transformer, key, default=None):
         """
@@ -478,10 +610,8 @@ class BlockStructureBlockData(BlockStructure):
             key (string) - A dictionary key to the transformer's data
                 that is requested.
         """
-        try:
-            return getattr(self.transformer_data[transformer], key, default)
-        except KeyError:
-            return default
+        transformer_data = self.transformer_data.get(transformer)
+        return transformer_data.get_field(key, default) if transformer_data is not None else default
 
     def set_transformer_data(self, transformer, key, value):
         """
@@ -497,7 +627,14 @@ class BlockStructureBlockData(BlockStructure):
             value (any picklable type) - The value to associate with the
                 given key for the given transformer's data.
         """
-        setattr(self.transformer_data.get_or_create(transformer), key, value)
+        transformer_data = self.transformer_data.get_or_create(transformer)
+        if (
+                self._shared_transformer_data is not None and
+                transformer_data is self._shared_transformer_data.get(transformer)
+        ):
+            transformer_data = transformer_data.copy()
+            self.transformer_data[transformer] = transformer_data
+        setattr(transformer_data, key, value)
 
     def get_transformer_block_data(self, usage_key, transformer):
         """
@@ -534,11 +671,11 @@ class BlockStructureBlockData(BlockStructure):
             default (any type) - The value to return if a dictionary
                 entry is not found.
         """
-        try:
-            transformer_data = self.get_transformer_block_data(usage_key, transformer)
-        except KeyError:
+        block_data = self._block_data_map.get(usage_key)
+        if block_data is None:
             return default
-        return getattr(transformer_data, key, default)
+        transformer_data = block_data.transformer_data.get(transformer)
+        return transformer_data.get_field(key, default) if transformer_data is not None else default
 
     def set_transformer_block_field(self, usage_key, transformer, key, value):
         """
@@ -577,7 +714,7 @@ class BlockStructureBlockData(BlockStructure):
                 whose data entry is to be deleted.
         """
         try:
-            transformer_block_data = self.get_transformer_block_data(usage_key, transformer)
+            transformer_block_data = self._get_or_create_block(usage_key).transformer_data[transformer]
             delattr(transformer_block_data, key)
         except (AttributeError, KeyError):
             pass
@@ -607,11 +744,11 @@ class BlockStructureBlockData(BlockStructure):
 
         # Remove block from its children.
         for child in children:
-            self._block_relations[child].parents.remove(usage_key)
+            self._get_block_relations_for_update(child).parents.remove(usage_key)
 
         # Remove block from its parents.
         for parent in parents:
-            self._block_relations[parent].children.remove(usage_key)
+            self._get_block_relations_for_update(parent).children.remove(usage_key)
 
         # Remove block.
         self._block_relations.pop(usage_key, None)
@@ -736,16 +873,25 @@ class BlockStructureBlockData(BlockStructure):
 
     def _get_or_create_block(self, usage_key):
         """
-        Returns the BlockData associated with the given usage_key.
-        If not found, creates and returns a new BlockData and
-        maps it to the given key.
+        Returns the BlockData associated with the given usage_key,
+        for it to be modified.  If not found, creates and returns a
+        new BlockData and maps it to the given key.  BlockData that is
+        still shared with the structure that this structure is a
+        copy-on-write copy of is copied first.
         """
         try:
-            return self._block_data_map[usage_key]
+            block_data = self._block_data_map[usage_key]
         except KeyError:
             block_data = BlockData(usage_key)
             self._block_data_map[usage_key] = block_data
             return block_data
+        if (
+                self._shared_block_data_map is not None and
+                block_data is self._shared_block_data_map.get(usage_key)
+        ):
+            block_data = block_data.copy()
+            self._block_data_map[usage_key] = block_data
+        return block_data
 
 
 class BlockStructureModulestoreData(BlockStructureBlockData):
@@ -770,6 +916,17 @@ class BlockStructureModulestoreData(BlockStructureBlockData):
         # set(string)
         self._requested_xblock_fields = set()
 
+        # A previously collected block structure for the same root,
+        # whose collected data may be reused for unchanged blocks.
+        # BlockStructureBlockData or None
+        self._previous_block_structure = None
+
+        # Set of usage keys of the blocks that, along with all their
+        # ancestors, are unchanged since the previous block structure
+        # was collected.
+        # set(UsageKey)
+        self._unchanged_blocks = set()
+
     def request_xblock_fields(self, *field_names):
         """
         Records request for collecting data for the given xBlock fields.
@@ -796,6 +953,41 @@ class BlockStructureModulestoreData(BlockStructureBlockData):
         """
         return self._xblock_map[usage_key]
 
+    def reuse_transformer_block_fields(self, usage_key, transformer, *keys):
+        """
+        If the block identified by the given usage_key and all its
+        ancestors are unchanged since the previous block structure was
+        collected, copies the values of the given keys of the given
+        transformer's data for the block from that structure.  Keys
+        that have no value in that structure are left unset.
+
+        A transformer can call this method in its collect method,
+        instead of computing values that only depend on the content
+        of the block and its ancestors, such as values that are
+        expensive to compute from the xBlock.
+
+        Arguments:
+            usage_key (UsageKey) - Usage key of the block whose
+                transformer data is to be reused.
+
+            transformer (BlockStructureTransformer) - The transformer
+                whose data is to be reused.
+
+            keys (list(string)) - Dictionary keys to the transformer's
+                data that are to be reused.
+
+        Returns:
+            bool - Whether the block is unchanged and its values were
+                reused.
+        """
+        if usage_key not in self._unchanged_blocks:
+            return False
+        for key in keys:
+            value = self._previous_block_structure.get_transformer_block_field(usage_key, transformer, key, _MISSING)
+            if value is not _MISSING:
+                self.set_transformer_block_field(usage_key, transformer, key, value)
+        return True
+
     #--- Internal methods ---#
     # To be used within the block_structure framework or by tests.
 
@@ -814,6 +1006,34 @@ class BlockStructureModulestoreData(BlockStructureBlockData):
         """
         self._xblock_map[usage_key] = xblock
 
+    def _set_previous_block_structure(self, previous_block_structure):
+        """
+        Sets the previously collected block structure whose data may be
+        reused through reuse_transformer_block_fields, and determines
+        which blocks are unchanged since it was collected.
+
+        A block is unchanged if its edited_on value is the one
+        collected in the previous block structure and its parents are
+        unchanged.  A changed block thus invalidates its entire
+        subtree, as blocks inherit field values from their ancestors.
+
+        Arguments:
+            previous_block_structure (BlockStructureBlockData) - A
+                block structure collected with the same transformer
+                versions, for the same root.
+        """
+        self._previous_block_structure = previous_block_structure
+        self._unchanged_blocks = set()
+        for block_key in self.topological_traversal():
+            edited_on = getattr(self.get_xblock(block_key), EDITED_ON_XBLOCK_FIELD, None)
+            if (
+                    edited_on is not None and
+                    block_key in previous_block_structure and
+                    edited_on == previous_block_structure.get_xblock_field(block_key, EDITED_ON_XBLOCK_FIELD) and
+                    all(parent_key in self._unchanged_blocks for parent_key in self.get_parents(block_key))
+            ):
+                self._unchanged_blocks.add(block_key)
+
     def _collect_requested_xblock_fields(self):
         """
         Iterates through all instantiated xBlocks that were added and
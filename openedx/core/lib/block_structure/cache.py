@@ -2,29 +2,149 @@
 Module for the Cache class for BlockStructure objects.
 """
 # pylint: disable=protected-access
+from collections import OrderedDict
+import cPickle as pickle
 from logging import getLogger
+from threading import Lock
+from uuid import uuid4
+import zlib
 
-from openedx.core.lib.cache_utils import zpickle, zunpickle
+from openedx.core.lib.cache_utils import zpickle
 
 from .block_structure import BlockStructureBlockData
 from .factory import BlockStructureFactory
+from .serialization import deserialize_block_structure, serialize_block_structure
 
 
 logger = getLogger(__name__)  # pylint: disable=C0103
 
 
+class LocalBlockStructureCache(object):
+    """
+    Process-local, least recently used cache of deserialized
+    BlockStructure objects, bounded by the total size of their
+    serializations.
+
+    Block structures are keyed by their root block usage key and by the
+    version under which they were added to the shared cache, so that a
+    block structure that was updated by another process is never
+    returned.
+    """
+    def __init__(self, max_size):
+        """
+        Arguments:
+            max_size (int) - The maximum total size, in bytes, of the
+                uncompressed serializations of the cached block
+                structures.
+        """
+        self.max_size = max_size
+        self._size = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, root_block_usage_key, version):
+        """
+        Returns the cached block structure for the given
+        root_block_usage_key and version, or None if not found.
+        """
+        with self._lock:
+            entry = self._entries.pop(root_block_usage_key, None)
+            if entry is None:
+                return None
+            # Re-insert the entry to mark it as the most recently used.
+            self._entries[root_block_usage_key] = entry
+        entry_version, block_structure, _ = entry
+        return block_structure if entry_version == version else None
+
+    def add(self, root_block_usage_key, version, block_structure, size):
+        """
+        Caches the given block structure for the given
+        root_block_usage_key and version, evicting the least recently
+        used block structures as needed to stay within max_size.
+
+        Arguments:
+            size (int) - The size, in bytes, of the uncompressed
+                serialization of the block structure.
+        """
+        if size > self.max_size:
+            return
+        with self._lock:
+            self._pop(root_block_usage_key)
+            while self._entries and self._size + size > self.max_size:
+                self._pop(next(iter(self._entries)))
+            self._entries[root_block_usage_key] = (version, block_structure, size)
+            self._size += size
+
+    def delete(self, root_block_usage_key):
+        """
+        Evicts the block structure for the given root_block_usage_key.
+        """
+        with self._lock:
+            self._pop(root_block_usage_key)
+
+    def clear(self):
+        """
+        Evicts all block structures.
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _pop(self, root_block_usage_key):
+        """
+        Evicts the block structure for the given root_block_usage_key,
+        while the lock is held.
+        """
+        entry = self._entries.pop(root_block_usage_key, None)
+        if entry is not None:
+            self._size -= entry[2]
+
+
 class BlockStructureCache(object):
     """
     Cache for BlockStructure objects.
     """
-    def __init__(self, cache):
+    # Timeout value, in seconds, for the cache.  Block structures are
+    # kept for 1 day as a fail-safe in case the signal to invalidate
+    # the cache doesn't come through.
+    TIMEOUT_IN_SECONDS = 60 * 60 * 24
+
+    def __init__(self, cache, local_cache=None, store=None):
         """
         Arguments:
             cache (django.core.cache.backends.base.BaseCache) - The
                 cache into which cacheable data of the block structure
                 is to be serialized.
+
+            local_cache (LocalBlockStructureCache) - An optional
+                process-local cache of deserialized block structures,
+                consulted before the given cache.  Callers get a
+                copy-on-write copy of a locally cached block structure,
+                instead of deserializing it again.
+
+            store - An optional durable storage of the serialized
+                block structures, used as a second tier behind the
+                given cache, from which the cache is repopulated when
+                it misses.  It must provide the following methods:
+
+                get(root_block_usage_key, schema_version) - Returns
+                    the stored data for the given root block, if it
+                    was stored with the given schema version and from
+                    the current version of the block structure's
+                    content, or else None.
+
+                add(root_block_usage_key, schema_version,
+                    data_version, data) - Stores the given data for the
+                    given root block, along with the given schema
+                    version and the version of the block structure's
+                    content (such as the course version).
+
+                delete(root_block_usage_key) - Deletes the stored data
+                    for the given root block, if any.
         """
         self._cache = cache
+        self._local_cache = local_cache
+        self._store = store
 
     def add(self, block_structure):
         """
@@ -33,27 +153,23 @@ class BlockStructureCache(object):
 
         The key in the cache is 'root.key.<root_block_usage_key>'.
         The data stored in the cache includes the structure's
-        block relations, transformer data, and block data.
+        block relations, transformer data, and block data, in the
+        compact format of serialize_block_structure.
 
         Arguments:
             block_structure (BlockStructure) - The block structure
                 that is to be serialized to the given cache.
         """
-        data_to_cache = (
-            block_structure._block_relations,
-            block_structure.transformer_data,
-            block_structure._block_data_map,
-        )
-        zp_data_to_cache = zpickle(data_to_cache)
-
-        # Set the timeout value for the cache to 1 day as a fail-safe
-        # in case the signal to invalidate the cache doesn't come through.
-        timeout_in_seconds = 60 * 60 * 24
-        self._cache.set(
-            self._encode_root_cache_key(block_structure.root_block_usage_key),
-            zp_data_to_cache,
-            timeout=timeout_in_seconds,
-        )
+        zp_data_to_cache = zpickle(serialize_block_structure(block_structure))
+        self._add_to_cache(block_structure, zp_data_to_cache)
+        if self._store is not None:
+            content_version = self._get_content_version(block_structure)
+            self._store.add(
+                block_structure.root_block_usage_key,
+                BlockStructureBlockData.VERSION,
+                unicode(content_version) if content_version is not None else None,
+                zp_data_to_cache,
+            )
 
         logger.info(
             "Wrote BlockStructure %s to cache, size: %s",
@@ -80,9 +196,20 @@ class BlockStructureCache(object):
 
             NoneType - If the root_block_usage_key is not found in the cache.
         """
+        version = None
+        if self._local_cache is not None:
+            version = self._cache.get(self._encode_version_cache_key(root_block_usage_key))
+            if version is not None:
+                block_structure = self._local_cache.get(root_block_usage_key, version)
+                if block_structure is not None:
+                    return block_structure.copy_on_write()
 
-        # Find root_block_usage_key in the cache.
+        # Find root_block_usage_key in the cache, or else in the store.
         zp_data_from_cache = self._cache.get(self._encode_root_cache_key(root_block_usage_key))
+        read_from_store = False
+        if not zp_data_from_cache and self._store is not None:
+            zp_data_from_cache = self._store.get(root_block_usage_key, BlockStructureBlockData.VERSION)
+            read_from_store = bool(zp_data_from_cache)
         if not zp_data_from_cache:
             logger.info(
                 "Did not find BlockStructure %r in the cache.",
@@ -91,19 +218,30 @@ class BlockStructureCache(object):
             return None
         else:
             logger.info(
-                "Read BlockStructure %r from cache, size: %s",
+                "Read BlockStructure %r from %s, size: %s",
                 root_block_usage_key,
+                "store" if read_from_store else "cache",
                 len(zp_data_from_cache),
             )
 
         # Deserialize and construct the block structure.
-        block_relations, transformer_data, block_data_map = zunpickle(zp_data_from_cache)
-        return BlockStructureFactory.create_new(
+        p_data_from_cache = zlib.decompress(zp_data_from_cache)
+        block_relations, transformer_data, block_data_map = deserialize_block_structure(
+            root_block_usage_key,
+            pickle.loads(p_data_from_cache),
+        )
+        block_structure = BlockStructureFactory.create_new(
             root_block_usage_key,
             block_relations,
             transformer_data,
             block_data_map,
         )
+        if read_from_store:
+            version = self._add_to_cache(block_structure, zp_data_from_cache)
+        if version is not None:
+            self._local_cache.add(root_block_usage_key, version, block_structure, len(p_data_from_cache))
+            return block_structure.copy_on_write()
+        return block_structure
 
     def delete(self, root_block_usage_key):
         """
@@ -116,11 +254,47 @@ class BlockStructureCache(object):
                 the cache.
         """
         self._cache.delete(self._encode_root_cache_key(root_block_usage_key))
+        if self._local_cache is not None:
+            self._cache.delete(self._encode_version_cache_key(root_block_usage_key))
+            self._local_cache.delete(root_block_usage_key)
+        if self._store is not None:
+            self._store.delete(root_block_usage_key)
         logger.info(
             "Deleted BlockStructure %r from the cache.",
             root_block_usage_key,
         )
 
+    def _add_to_cache(self, block_structure, zp_data):
+        """
+        Sets the given compressed and pickled serialization of the given
+        block structure in the cache.
+
+        Returns:
+            unicode - The new version of the block structure, if it is
+            versioned for a local cache.
+
+            NoneType - If there is no local cache.
+        """
+        self._cache.set(
+            self._encode_root_cache_key(block_structure.root_block_usage_key),
+            zp_data,
+            timeout=self.TIMEOUT_IN_SECONDS,
+        )
+        if self._local_cache is None:
+            return None
+
+        # The version is set after the block structure itself, so that
+        # a block structure is never read as being of a newer version
+        # than it is.
+        self._local_cache.delete(block_structure.root_block_usage_key)
+        version = self._new_version(block_structure)
+        self._cache.set(
+            self._encode_version_cache_key(block_structure.root_block_usage_key),
+            version,
+            timeout=self.TIMEOUT_IN_SECONDS,
+        )
+        return version
+
     @classmethod
     def _encode_root_cache_key(cls, root_block_usage_key):
         """
@@ -131,3 +305,32 @@ class BlockStructureCache(object):
             version=unicode(BlockStructureBlockData.VERSION),
             root_usage_key=unicode(root_block_usage_key),
         )
+
+    @classmethod
+    def _encode_version_cache_key(cls, root_block_usage_key):
+        """
+        Returns the cache key to use for storing the version of the
+        block structure for the given root_block_usage_key.
+        """
+        return "{root_cache_key}.version".format(root_cache_key=cls._encode_root_cache_key(root_block_usage_key))
+
+    @staticmethod
+    def _get_content_version(block_structure):
+        """
+        Returns the version of the content of the given block structure,
+        that is, of its root block (such as a course version), if
+        collected.
+        """
+        return block_structure.get_xblock_field(block_structure.root_block_usage_key, 'course_version')
+
+    @classmethod
+    def _new_version(cls, block_structure):
+        """
+        Returns a new version identifier for the given block structure,
+        made of the version of its content and a unique suffix, since
+        block structures may be collected anew for the same content.
+        """
+        return u"{content_version}.{unique_id}".format(
+            content_version=cls._get_content_version(block_structure),
+            unique_id=uuid4().hex,
+        )
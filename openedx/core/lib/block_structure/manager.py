@@ -3,6 +3,8 @@ Top-level module for the Block Structure framework with a class for managing
 BlockStructures.
 """
 from contextlib import contextmanager
+import cPickle as pickle
+from logging import getLogger
 
 from .cache import BlockStructureCache
 from .factory import BlockStructureFactory
@@ -10,12 +12,15 @@ from .exceptions import UsageKeyNotInBlockStructure
 from .transformers import BlockStructureTransformers
 
 
+logger = getLogger(__name__)  # pylint: disable=invalid-name
+
+
 class BlockStructureManager(object):
     """
     Top-level class for managing Block Structures.
     """
 
-    def __init__(self, root_block_usage_key, modulestore, cache):
+    def __init__(self, root_block_usage_key, modulestore, cache, local_cache=None, store=None):
         """
         Arguments:
             root_block_usage_key (UsageKey) - The usage_key for the root
@@ -28,10 +33,16 @@ class BlockStructureManager(object):
             cache (django.core.cache.backends.base.BaseCache) - The
                 cache to use for storing/retrieving the block structure's
                 collected data.
+
+            local_cache (LocalBlockStructureCache) - An optional
+                process-local cache to use in front of the given cache.
+
+            store - An optional durable storage to use behind the given
+                cache.  See BlockStructureCache.
         """
         self.root_block_usage_key = root_block_usage_key
         self.modulestore = modulestore
-        self.block_structure_cache = BlockStructureCache(cache)
+        self.block_structure_cache = BlockStructureCache(cache, local_cache, store)
 
     def get_transformed(self, transformers, starting_block_usage_key=None, collected_block_structure=None):
         """
@@ -98,19 +109,49 @@ class BlockStructureManager(object):
             block_structure = self.update_collected()
         return block_structure
 
-    def update_collected(self):
+    def update_collected(self, incremental=False, check_incremental=False):
         """
         Updates the collected Block Structure for the root_block_usage_key.
 
         Details: The cache is updated by collecting transformers data from
         the modulestore.
+
+        Arguments:
+            incremental (bool) - Whether transformers may reuse the data
+                collected in the currently cached block structure for
+                blocks that are unchanged since then, rather than
+                computing it again.  See
+                BlockStructureModulestoreData.reuse_transformer_block_fields.
+
+            check_incremental (bool) - Whether to verify an incremental
+                collection against a collection from scratch.  Any
+                difference is logged, and the block structure
+                collected from scratch is the one that is cached.
         """
-        with self._bulk_operations():
-            block_structure = BlockStructureFactory.create_from_modulestore(
+        previous_block_structure = None
+        if incremental:
+            previous_block_structure = BlockStructureFactory.create_from_cache(
                 self.root_block_usage_key,
-                self.modulestore,
+                self.block_structure_cache,
             )
-            BlockStructureTransformers.collect(block_structure)
+            if (
+                    previous_block_structure is not None and
+                    BlockStructureTransformers.is_collected_outdated(previous_block_structure)
+            ):
+                previous_block_structure = None
+
+        with self._bulk_operations():
+            block_structure = self._collect(previous_block_structure)
+            if check_incremental and previous_block_structure is not None:
+                full_block_structure = self._collect()
+                differences = _get_collected_differences(block_structure, full_block_structure)
+                if differences:
+                    logger.error(
+                        "Incrementally collected BlockStructure %s differs from a full collection for: %s",
+                        self.root_block_usage_key,
+                        differences,
+                    )
+                block_structure = full_block_structure
             self.block_structure_cache.add(block_structure)
             return block_structure
 
@@ -121,6 +162,31 @@ class BlockStructureManager(object):
         """
         self.block_structure_cache.delete(self.root_block_usage_key)
 
+    def _collect(self, previous_block_structure=None):
+        """
+        Returns a block structure for the root_block_usage_key, created
+        from the modulestore, with collected transformers data.
+
+        Arguments:
+            previous_block_structure (BlockStructureBlockData) - An
+                optional, previously collected block structure, whose
+                data may be reused for unchanged blocks.
+        """
+        block_structure = BlockStructureFactory.create_from_modulestore(
+            self.root_block_usage_key,
+            self.modulestore,
+        )
+        if previous_block_structure is not None:
+            block_structure._set_previous_block_structure(previous_block_structure)  # pylint: disable=protected-access
+            logger.info(
+                "Collecting BlockStructure %s incrementally, with %d of %d blocks unchanged.",
+                self.root_block_usage_key,
+                len(block_structure._unchanged_blocks),  # pylint: disable=protected-access
+                len(block_structure),
+            )
+        BlockStructureTransformers.collect(block_structure)
+        return block_structure
+
     @contextmanager
     def _bulk_operations(self):
         """
@@ -132,3 +198,62 @@ class BlockStructureManager(object):
             course_key = None
         with self.modulestore.bulk_operations(course_key):
             yield
+
+
+def _get_collected_differences(block_structure, other_block_structure):
+    """
+    Returns a sorted list of the usage keys of the blocks whose relations,
+    xBlock fields or transformer data differ between the two given
+    collected block structures, along with the names of the transformers
+    whose structure-wide data differ.
+    """
+    differences = set()
+    for usage_key in set(block_structure) | set(other_block_structure):
+        if (
+                block_structure.get_children(usage_key) != other_block_structure.get_children(usage_key) or
+                block_structure.get_parents(usage_key) != other_block_structure.get_parents(usage_key)
+        ):
+            differences.add(usage_key)
+
+    block_data_map = block_structure._block_data_map  # pylint: disable=protected-access
+    other_block_data_map = other_block_structure._block_data_map  # pylint: disable=protected-access
+    for usage_key in set(block_data_map) | set(other_block_data_map):
+        block_data = block_data_map.get(usage_key)
+        other_block_data = other_block_data_map.get(usage_key)
+        if block_data is None or other_block_data is None:
+            differences.add(usage_key)
+        elif not _are_equal(block_data.fields, other_block_data.fields) or not _are_equal(
+                _get_fields_by_transformer(block_data.transformer_data),
+                _get_fields_by_transformer(other_block_data.transformer_data),
+        ):
+            differences.add(usage_key)
+
+    transformer_data = _get_fields_by_transformer(block_structure.transformer_data)
+    other_transformer_data = _get_fields_by_transformer(other_block_structure.transformer_data)
+    for transformer_name in set(transformer_data) | set(other_transformer_data):
+        if not _are_equal(transformer_data.get(transformer_name), other_transformer_data.get(transformer_name)):
+            differences.add(transformer_name)
+
+    return sorted(unicode(difference) for difference in differences)
+
+
+def _get_fields_by_transformer(transformer_data_map):
+    """
+    Returns a dict of transformer name to the fields of its data, from
+    the given TransformerDataMap.
+    """
+    return {
+        transformer_name: transformer_data.fields
+        for transformer_name, transformer_data in transformer_data_map.iteritems()
+    }
+
+
+def _are_equal(value, other_value):
+    """
+    Returns whether the given collected values are equal, comparing
+    their serializations for values whose classes do not implement
+    equality.
+    """
+    return value == other_value or (
+        pickle.dumps(value, pickle.HIGHEST_PROTOCOL) == pickle.dumps(other_value, pickle.HIGHEST_PROTOCOL)
+    )
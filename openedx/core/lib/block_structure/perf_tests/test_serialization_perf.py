@@ -0,0 +1,109 @@
+"""
+Performance test comparing the compact serialization of block structures
+with pickling their block relations and block data maps directly.
+"""
+# pylint: disable=protected-access
+import cPickle as pickle
+from datetime import datetime
+import zlib
+
+from nose.plugins.skip import SkipTest
+from opaque_keys.edx.locator import CourseLocator
+from unittest import TestCase
+
+from openedx.core.lib.cache_utils import zpickle
+
+from ..block_structure import BlockStructureBlockData
+from ..serialization import deserialize_block_structure, serialize_block_structure
+from ..tests.helpers import MockTransformer
+
+# The dependency below needs to be installed manually from the development.txt file, which doesn't
+# get installed during unit tests!
+try:
+    from code_block_timer import CodeBlockTimer
+except ImportError:
+    CodeBlockTimer = None
+
+# Number of children of each block, per level of the generated course,
+# for a total of 1 + 10 + 100 + 500 + 4500 = 5111 blocks.
+CHILDREN_PER_LEVEL = (
+    ('chapter', 10),
+    ('sequential', 10),
+    ('vertical', 5),
+    ('problem', 9),
+)
+
+# Number of times each serialization is loaded per timed run.
+LOAD_COUNT = 10
+
+
+def create_course_block_structure():
+    """
+    Returns a collected block structure of a course with about 5000
+    blocks, with typical xblock fields and transformer block data.
+    """
+    course_key = CourseLocator('PerfX', 'BlockStructures', '2016')
+    root_key = course_key.make_usage_key('course', 'course')
+    block_structure = BlockStructureBlockData(root_key)
+    block_structure._add_transformer(MockTransformer)
+
+    parent_keys = [root_key]
+    for block_type, num_children in CHILDREN_PER_LEVEL:
+        child_keys = []
+        for parent_key in parent_keys:
+            for index in range(num_children):
+                child_key = course_key.make_usage_key(
+                    block_type, '{}_{}'.format(parent_key.block_id, index)
+                )
+                block_structure._add_relation(parent_key, child_key)
+                child_keys.append(child_key)
+        parent_keys = child_keys
+
+    for usage_key in block_structure:
+        block_data = block_structure._get_or_create_block(usage_key)
+        block_data.category = usage_key.block_type
+        block_data.display_name = u'Block {}'.format(usage_key.block_id)
+        block_data.graded = usage_key.block_type == 'problem'
+        block_data.start = datetime(2016, 1, 1)
+        block_data.visible_to_staff_only = False
+        block_structure.set_transformer_block_field(usage_key, MockTransformer, 'merged_start', [datetime(2016, 1, 1)])
+        block_structure.set_transformer_block_field(usage_key, MockTransformer, 'merged_visible_to_staff_only', False)
+    block_structure._get_or_create_block(root_key).course_version = 'version'
+    return block_structure
+
+
+class TestSerializationPerformance(TestCase):
+    """
+    Compares the size and load time of a 5000 block course serialized
+    in the compact format with those of its pickled block relations
+    and block data maps.
+    """
+    def setUp(self):
+        super(TestSerializationPerformance, self).setUp()
+        self.block_structure = create_course_block_structure()
+        self.root_block_usage_key = self.block_structure.root_block_usage_key
+        self.zp_compact_data = zpickle(serialize_block_structure(self.block_structure))
+        self.zp_pickled_data = zpickle((
+            self.block_structure._block_relations,
+            self.block_structure.transformer_data,
+            self.block_structure._block_data_map,
+        ))
+
+    def test_size(self):
+        self.assertLess(len(self.zp_compact_data), len(self.zp_pickled_data))
+        self.assertLess(len(zlib.decompress(self.zp_compact_data)), len(zlib.decompress(self.zp_pickled_data)))
+
+    def test_load_time(self):
+        if CodeBlockTimer is None:
+            raise SkipTest("CodeBlockTimer undefined.")
+
+        with CodeBlockTimer("load_pickled_block_structure"):
+            for __ in range(LOAD_COUNT):
+                pickle.loads(zlib.decompress(self.zp_pickled_data))
+
+        with CodeBlockTimer("load_compact_block_structure"):
+            for __ in range(LOAD_COUNT):
+                deserialize_block_structure(
+                    self.root_block_usage_key,
+                    pickle.loads(zlib.decompress(self.zp_compact_data)),
+                )
@@ -0,0 +1,216 @@
+"""
+Compact serialization of the cacheable data of BlockStructure objects.
+
+Rather than pickling the structure's maps of _BlockRelations and
+BlockData objects, each with its own instance dict and full copies of
+the usage keys it refers to, the data is laid out as:
+
+    * a table of the structure's block keys, in which each key is
+      stored once, and, when it belongs to the root block's course, only
+      by its block type and block id,
+    * parent and child adjacency lists of integer indices into the
+      block key table, and
+    * columns of per-block field values, one for each xblock field and
+      transformer block field, holding the indices of the blocks that
+      have the field alongside their values.
+
+This makes the pickled data considerably smaller and faster to load, as
+the bulk of it is made of small integers and strings.
+"""
+# pylint: disable=protected-access
+from .block_structure import _BlockRelations, BlockData, TransformerData, TransformerDataMap
+
+
+def serialize_block_structure(block_structure):
+    """
+    Returns a compact, picklable representation of the block relations,
+    transformer data and block data of the given block structure.
+
+    Arguments:
+        block_structure (BlockStructureBlockData) - The block structure
+            that is to be serialized.
+
+    Returns:
+        tuple - To be passed to deserialize_block_structure.
+    """
+    course_key = _get_course_key(block_structure.root_block_usage_key)
+
+    block_keys = list(block_structure._block_relations)
+    block_indices = {usage_key: index for index, usage_key in enumerate(block_keys)}
+
+    children = []
+    parents = []
+    for usage_key in block_keys:
+        block_relations = block_structure._block_relations[usage_key]
+        children.append([block_indices[child_key] for child_key in block_relations.children])
+        parents.append([block_indices[parent_key] for parent_key in block_relations.parents])
+
+    block_data_indices = []
+    xblock_field_columns = {}
+    transformer_block_indices = {}
+    transformer_field_columns = {}
+    for index, usage_key in enumerate(block_keys):
+        block_data = block_structure._block_data_map.get(usage_key)
+        if block_data is None:
+            continue
+        block_data_indices.append(index)
+        _add_to_columns(xblock_field_columns, index, block_data.fields)
+        for transformer_name, transformer_data in block_data.transformer_data.iteritems():
+            transformer_block_indices.setdefault(transformer_name, []).append(index)
+            _add_to_columns(
+                transformer_field_columns.setdefault(transformer_name, {}),
+                index,
+                transformer_data.fields,
+            )
+
+    _compact_columns(xblock_field_columns, block_data_indices)
+    for transformer_name, indices in transformer_block_indices.iteritems():
+        _compact_columns(transformer_field_columns[transformer_name], indices)
+
+    transformer_data = {
+        transformer_name: transformer_data.fields
+        for transformer_name, transformer_data in block_structure.transformer_data.iteritems()
+    }
+
+    return (
+        [_encode_block_key(course_key, usage_key) for usage_key in block_keys],
+        children,
+        parents,
+        block_data_indices,
+        xblock_field_columns,
+        {
+            transformer_name: (indices, transformer_field_columns[transformer_name])
+            for transformer_name, indices in transformer_block_indices.iteritems()
+        },
+        transformer_data,
+    )
+
+
+def deserialize_block_structure(root_block_usage_key, serialized_data):
+    """
+    Returns the block relations, transformer data and block data map of
+    a block structure from their compact representation.
+
+    Arguments:
+        root_block_usage_key (UsageKey) - The usage key of the root of
+            the block structure, as given to serialize_block_structure.
+
+        serialized_data (tuple) - As returned by
+            serialize_block_structure.
+
+    Returns:
+        tuple - The block relations, transformer data and block data map,
+        as accepted by BlockStructureFactory.create_new.
+    """
+    (
+        encoded_block_keys,
+        children,
+        parents,
+        block_data_indices,
+        xblock_field_columns,
+        transformer_columns,
+        transformer_data_fields,
+    ) = serialized_data
+
+    course_key = _get_course_key(root_block_usage_key)
+    block_keys = [_decode_block_key(course_key, encoded_key) for encoded_key in encoded_block_keys]
+
+    block_relations = {}
+    for index, usage_key in enumerate(block_keys):
+        relations = _BlockRelations()
+        relations.children = [block_keys[child_index] for child_index in children[index]]
+        relations.parents = [block_keys[parent_index] for parent_index in parents[index]]
+        block_relations[usage_key] = relations
+
+    block_datas = {}
+    for index in block_data_indices:
+        block_datas[index] = BlockData(block_keys[index])
+
+    for field_name, column in xblock_field_columns.iteritems():
+        for index, value in _iter_column(column, block_data_indices):
+            block_datas[index].fields[field_name] = value
+
+    for transformer_name, (indices, field_columns) in transformer_columns.iteritems():
+        transformer_datas = {}
+        for index in indices:
+            transformer_data = TransformerData()
+            block_datas[index].transformer_data[transformer_name] = transformer_data
+            transformer_datas[index] = transformer_data
+        for field_name, column in field_columns.iteritems():
+            for index, value in _iter_column(column, indices):
+                transformer_datas[index].fields[field_name] = value
+
+    transformer_data = TransformerDataMap()
+    for transformer_name, fields in transformer_data_fields.iteritems():
+        transformer_data[transformer_name] = TransformerData()
+        transformer_data[transformer_name].fields = fields
+
+    block_data_map = {block_data.location: block_data for block_data in block_datas.itervalues()}
+
+    return block_relations, transformer_data, block_data_map
+
+
+def _get_course_key(root_block_usage_key):
+    """
+    Returns the course key of the given root block usage key, or None if
+    it has none.
+    """
+    return getattr(root_block_usage_key, 'course_key', None)
+
+
+def _encode_block_key(course_key, usage_key):
+    """
+    Returns the (block_type, block_id) pair of the given usage key if it
+    can be recreated from them within the given course, or else a
+    1-tuple of the usage key itself.
+    """
+    if course_key is not None:
+        try:
+            block_type, block_id = usage_key.block_type, usage_key.block_id
+            if course_key.make_usage_key(block_type, block_id) == usage_key:
+                return (block_type, block_id)
+        except AttributeError:
+            pass
+    return (usage_key,)
+
+
+def _decode_block_key(course_key, encoded_key):
+    """
+    Returns the usage key encoded by _encode_block_key.
+    """
+    if len(encoded_key) == 2:
+        block_type, block_id = encoded_key
+        return course_key.make_usage_key(block_type, block_id)
+    return encoded_key[0]
+
+
+def _add_to_columns(columns, index, fields):
+    """
+    Appends the values of the given fields of the block at the given
+    index to their columns, each a pair of the block indices and the
+    values of a field.
+    """
+    for field_name, value in fields.iteritems():
+        indices, values = columns.setdefault(field_name, ([], []))
+        indices.append(index)
+        values.append(value)
+
+
+def _compact_columns(columns, all_indices):
+    """
+    Drops the indices of the given columns whose indices are exactly
+    all_indices, as the values of fields that all blocks have, such as
+    most collected xblock fields, are the bulk of the data.
+    """
+    for field_name, (indices, values) in columns.iteritems():
+        if indices == all_indices:
+            columns[field_name] = (None, values)
+
+
+def _iter_column(column, all_indices):
+    """
+    Returns the (block index, value) pairs of the given column, compacted
+    by _compact_columns.
+    """
+    indices, values = column
+    return zip(all_indices if indices is None else indices, values)
@@ -109,6 +109,37 @@ class MockCache(object):
         del self.map[key]
 
 
+class MockStore(object):
+    """
+    A mock durable storage of serialized block structures, providing
+    only the minimum features needed by the block cache framework.
+    """
+    def __init__(self):
+        # An in-memory map of root block usage keys to their schema
+        # version, data version and data.
+        self.map = {}
+
+    def get(self, root_block_usage_key, schema_version):
+        """
+        Returns the data stored for the given root block with the given
+        schema version; returns None if not found.
+        """
+        stored_schema_version, _, data = self.map.get(root_block_usage_key, (None, None, None))
+        return data if stored_schema_version == schema_version else None
+
+    def add(self, root_block_usage_key, schema_version, data_version, data):
+        """
+        Stores the given data for the given root block.
+        """
+        self.map[root_block_usage_key] = (schema_version, data_version, data)
+
+    def delete(self, root_block_usage_key):
+        """
+        Deletes the data stored for the given root block.
+        """
+        self.map.pop(root_block_usage_key, None)
+
+
 class MockModulestoreFactory(object):
     """
     A factory for creating MockModulestore objects.
@@ -154,6 +154,27 @@ class TestBlockStructureData(TestCase, ChildrenMapTestMixin):
                     getattr(bs_block, field, None),
                     block.field_map.get(field),
                 )
+                self.assertEquals(
+                    block_structure.get_xblock_field(block.location, field),
+                    block.field_map.get(field),
+                )
+
+    def test_block_data_fields(self):
+        block_structure = BlockStructureModulestoreData(root_block_usage_key=0)
+        block_data = block_structure._get_or_create_block(0)
+        block_data.field1 = "val1"
+
+        # collected fields are stored in the fields dict, not as attributes
+        self.assertFalse(hasattr(block_data, '__dict__'))
+        self.assertEquals(block_data.fields, {"field1": "val1"})
+
+        for field_name in ("field1", "field2", "location", "fields"):
+            self.assertEquals(
+                block_data.get_field(field_name, "default"),
+                getattr(block_data, field_name, "default"),
+            )
+        self.assertEquals(block_structure.get_xblock_field(0, "location"), 0)
+        self.assertEquals(block_structure.get_xblock_field(1, "field1", "default"), "default")
 
     @ddt.data(
         *itertools.product(
@@ -267,3 +288,31 @@ class TestBlockStructureData(TestCase, ChildrenMapTestMixin):
         _set_value(new_copy, 'edit2')
         self.assertEquals(_get_value(block_structure), 'edit1')
         self.assertEquals(_get_value(new_copy), 'edit2')
+
+    def test_copy_on_write(self):
+        block_structure = self.create_block_structure(ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP)
+        block_structure.set_transformer_data('transformer', 'test_key', 'original_value')
+        block_structure.set_transformer_block_field(1, 'transformer', 'test_key', 'original_value')
+
+        new_copy = block_structure.copy_on_write()
+        self.assert_block_structure(new_copy, ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP)
+        self.assertEquals(new_copy.get_transformer_data('transformer', 'test_key'), 'original_value')
+        self.assertEquals(new_copy.get_transformer_block_field(1, 'transformer', 'test_key'), 'original_value')
+
+        # verify edits to the copy do not affect the original
+        new_copy.set_transformer_data('transformer', 'test_key', 'edit')
+        new_copy.set_transformer_block_field(1, 'transformer', 'test_key', 'edit')
+        new_copy.set_transformer_block_field(2, 'transformer', 'test_key', 'edit')
+        new_copy.remove_block(1, keep_descendants=True)
+        new_copy.set_root_block(2)
+        new_copy._prune_unreachable()  # pylint: disable=protected-access
+
+        self.assertEquals(new_copy.get_transformer_data('transformer', 'test_key'), 'edit')
+        self.assertEquals(new_copy.get_transformer_block_field(2, 'transformer', 'test_key'), 'edit')
+        self.assertNotIn(1, new_copy)
+        self.assertNotIn(0, new_copy)
+
+        self.assert_block_structure(block_structure, ChildrenMapTestMixin.SIMPLE_CHILDREN_MAP)
+        self.assertEquals(block_structure.get_transformer_data('transformer', 'test_key'), 'original_value')
+        self.assertEquals(block_structure.get_transformer_block_field(1, 'transformer', 'test_key'), 'original_value')
+        self.assertIsNone(block_structure.get_transformer_block_field(2, 'transformer', 'test_key'))
@@ -4,8 +4,9 @@ Tests for block_structure/cache.py
 from nose.plugins.attrib import attr
 from unittest import TestCase
 
-from ..cache import BlockStructureCache
-from .helpers import ChildrenMapTestMixin, MockCache, MockTransformer
+from ..block_structure import BlockStructureBlockData
+from ..cache import BlockStructureCache, LocalBlockStructureCache
+from .helpers import ChildrenMapTestMixin, MockCache, MockStore, MockTransformer
 
 
 @attr(shard=2)
@@ -54,3 +55,112 @@ class TestBlockStructureCache(ChildrenMapTestMixin, TestCase):
         self.assertIsNone(
             self.block_structure_cache.get(self.block_structure.root_block_usage_key)
         )
+
+
+@attr(shard=2)
+class TestLocalBlockStructureCache(ChildrenMapTestMixin, TestCase):
+    """
+    Tests for BlockStructureCache with a LocalBlockStructureCache
+    """
+    def setUp(self):
+        super(TestLocalBlockStructureCache, self).setUp()
+        self.children_map = self.SIMPLE_CHILDREN_MAP
+        self.block_structure = self.create_block_structure(self.children_map)
+        self.mock_cache = MockCache()
+        self.local_cache = LocalBlockStructureCache(max_size=10 * 1024 * 1024)
+        self.block_structure_cache = BlockStructureCache(self.mock_cache, self.local_cache)
+        self.block_structure_cache.add(self.block_structure)
+        self.root_block_usage_key = self.block_structure.root_block_usage_key
+
+    def test_get_from_local_cache(self):
+        self.block_structure_cache.get(self.root_block_usage_key)
+
+        # the shared cache's copy of the block structure is no longer read
+        self.mock_cache.map[BlockStructureCache._encode_root_cache_key(self.root_block_usage_key)] = None
+        cached_value = self.block_structure_cache.get(self.root_block_usage_key)
+        self.assertIsNotNone(cached_value)
+        self.assert_block_structure(cached_value, self.children_map)
+
+    def test_copy_on_write(self):
+        cached_value = self.block_structure_cache.get(self.root_block_usage_key)
+        cached_value.remove_block(1, keep_descendants=False)
+        self.assert_block_structure(
+            self.block_structure_cache.get(self.root_block_usage_key), self.children_map
+        )
+
+    def test_updated_by_another_process(self):
+        self.block_structure_cache.get(self.root_block_usage_key)
+
+        updated_block_structure = self.create_block_structure(self.LINEAR_CHILDREN_MAP)
+        BlockStructureCache(self.mock_cache, LocalBlockStructureCache(max_size=1024)).add(updated_block_structure)
+        self.assert_block_structure(
+            self.block_structure_cache.get(self.root_block_usage_key), self.LINEAR_CHILDREN_MAP
+        )
+
+    def test_delete(self):
+        self.block_structure_cache.get(self.root_block_usage_key)
+        self.block_structure_cache.delete(self.root_block_usage_key)
+        self.assertIsNone(self.block_structure_cache.get(self.root_block_usage_key))
+
+    def test_max_size(self):
+        self.local_cache.add('block_1', 'version', self.block_structure, size=6 * 1024 * 1024)
+        self.local_cache.add('block_2', 'version', self.block_structure, size=3 * 1024 * 1024)
+        self.local_cache.get('block_1', 'version')
+        self.local_cache.add('block_3', 'version', self.block_structure, size=3 * 1024 * 1024)
+
+        # the least recently used block structure is evicted
+        self.assertIsNotNone(self.local_cache.get('block_1', 'version'))
+        self.assertIsNone(self.local_cache.get('block_2', 'version'))
+        self.assertIsNotNone(self.local_cache.get('block_3', 'version'))
+
+        # block structures larger than the cache are not cached
+        self.local_cache.add('block_4', 'version', self.block_structure, size=11 * 1024 * 1024)
+        self.assertIsNone(self.local_cache.get('block_4', 'version'))
+
+
+@attr(shard=2)
+class TestStoreBackedBlockStructureCache(ChildrenMapTestMixin, TestCase):
+    """
+    Tests for BlockStructureCache with a durable store
+    """
+    def setUp(self):
+        super(TestStoreBackedBlockStructureCache, self).setUp()
+        self.children_map = self.SIMPLE_CHILDREN_MAP
+        self.block_structure = self.create_block_structure(self.children_map)
+        self.mock_cache = MockCache()
+        self.mock_store = MockStore()
+        self.block_structure_cache = BlockStructureCache(
+            self.mock_cache, LocalBlockStructureCache(max_size=10 * 1024 * 1024), self.mock_store
+        )
+        self.block_structure_cache.add(self.block_structure)
+        self.root_block_usage_key = self.block_structure.root_block_usage_key
+
+    def test_add(self):
+        self.assertIn(self.root_block_usage_key, self.mock_store.map)
+        schema_version, data_version, _ = self.mock_store.map[self.root_block_usage_key]
+        self.assertEquals(schema_version, BlockStructureBlockData.VERSION)
+        self.assertIsNone(data_version)
+
+    def test_get_after_cache_flush(self):
+        self.mock_cache.map.clear()
+        self.assert_block_structure(self.block_structure_cache.get(self.root_block_usage_key), self.children_map)
+
+        # the cache is repopulated from the store
+        self.mock_store.map.clear()
+        self.assert_block_structure(self.block_structure_cache.get(self.root_block_usage_key), self.children_map)
+        self.assert_block_structure(
+            BlockStructureCache(self.mock_cache).get(self.root_block_usage_key), self.children_map
+        )
+
+    def test_get_outdated_schema(self):
+        self.mock_cache.map.clear()
+        BlockStructureBlockData.VERSION += 1
+        try:
+            self.assertIsNone(self.block_structure_cache.get(self.root_block_usage_key))
+        finally:
+            BlockStructureBlockData.VERSION -= 1
+
+    def test_delete(self):
+        self.block_structure_cache.delete(self.root_block_usage_key)
+        self.assertNotIn(self.root_block_usage_key, self.mock_store.map)
+        self.assertIsNone(self.block_structure_cache.get(self.root_block_usage_key))
@@ -1,6 +1,7 @@
 """
 Tests for manager.py
 """
+from mock import patch
 from nose.plugins.attrib import attr
 from unittest import TestCase
 
@@ -186,3 +187,95 @@ class TestBlockStructureManager(TestCase, ChildrenMapTestMixin):
         self.bs_manager.clear()
         self.collect_and_verify(expect_modulestore_called=True, expect_cache_updated=True)
         self.assertEquals(TestTransformer1.collect_call_count, 2)
+
+
+class ReusingTestTransformer(MockTransformer):
+    """
+    Test Transformer class that reuses its collected data for unchanged
+    blocks.
+    """
+    computed_block_keys = []
+
+    @classmethod
+    def collect(cls, block_structure):
+        """
+        Collects the value of each block's 'value' xBlock field, unless
+        it can be reused.
+        """
+        for block_key in block_structure.topological_traversal():
+            if not block_structure.reuse_transformer_block_fields(block_key, cls, 'value'):
+                cls.computed_block_keys.append(block_key)
+                value = getattr(block_structure.get_xblock(block_key), 'value', None)
+                block_structure.set_transformer_block_field(block_key, cls, 'value', value)
+
+
+@attr(shard=2)
+class TestBlockStructureManagerIncrementalCollect(TestCase, ChildrenMapTestMixin):
+    """
+    Test class for BlockStructureManager.update_collected with incremental collection.
+    """
+    def setUp(self):
+        super(TestBlockStructureManagerIncrementalCollect, self).setUp()
+        ReusingTestTransformer.computed_block_keys = []
+        self.registered_transformers = [ReusingTestTransformer()]
+        self.children_map = self.SIMPLE_CHILDREN_MAP
+        self.modulestore = MockModulestoreFactory.create(self.children_map)
+        for block_key, block in self.modulestore.blocks.iteritems():
+            block.field_map.update(edited_on=1, value=unicode(block_key))
+        self.bs_manager = BlockStructureManager(
+            root_block_usage_key=0,
+            modulestore=self.modulestore,
+            cache=MockCache(),
+        )
+
+    def update_and_verify(self, expected_computed_block_keys, **kwargs):
+        """
+        Calls the manager's update_collected method and verifies the
+        blocks whose data was computed, and the collected data.
+        """
+        ReusingTestTransformer.computed_block_keys = []
+        with mock_registered_transformers(self.registered_transformers):
+            self.bs_manager.update_collected(**kwargs)
+            block_structure = self.bs_manager.get_collected()
+        self.assertEquals(set(ReusingTestTransformer.computed_block_keys), set(expected_computed_block_keys))
+        for block_key, block in self.modulestore.blocks.iteritems():
+            self.assertEquals(
+                block_structure.get_transformer_block_field(block_key, ReusingTestTransformer, 'value'),
+                block.field_map['value'],
+            )
+
+    def test_not_incremental(self):
+        self.update_and_verify(range(5))
+        self.update_and_verify(range(5))
+
+    def test_incremental(self):
+        self.update_and_verify(range(5), incremental=True)
+        self.update_and_verify([], incremental=True)
+
+        # changing a block invalidates its subtree
+        self.modulestore.blocks[1].field_map.update(edited_on=2, value='new')
+        self.update_and_verify([1, 3, 4], incremental=True)
+        self.update_and_verify([], incremental=True)
+
+    def test_incremental_without_edited_on(self):
+        self.update_and_verify(range(5), incremental=True)
+        del self.modulestore.blocks[2].field_map['edited_on']
+        self.update_and_verify([2], incremental=True)
+
+    def test_incremental_outdated_data(self):
+        self.update_and_verify(range(5), incremental=True)
+        ReusingTestTransformer.VERSION += 1
+        try:
+            self.update_and_verify(range(5), incremental=True)
+        finally:
+            ReusingTestTransformer.VERSION -= 1
+
+    def test_check_incremental(self):
+        self.update_and_verify(range(5), incremental=True)
+
+        # a change that is not reflected in edited_on
+        self.modulestore.blocks[3].field_map['value'] = 'new'
+        with patch('openedx.core.lib.block_structure.manager.logger') as mock_logger:
+            self.update_and_verify(range(5), incremental=True, check_incremental=True)
+        self.assertTrue(mock_logger.error.called)
+        self.assertIn(u'3', mock_logger.error.call_args[0][2])
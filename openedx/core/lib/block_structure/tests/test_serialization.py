@@ -0,0 +1,98 @@
+"""
+Tests for block_structure/serialization.py
+"""
+# pylint: disable=protected-access
+from datetime import datetime
+
+from nose.plugins.attrib import attr
+from opaque_keys.edx.locator import CourseLocator
+from unittest import TestCase
+
+from ..block_structure import BlockStructureBlockData
+from ..serialization import deserialize_block_structure, serialize_block_structure
+from .helpers import ChildrenMapTestMixin, MockTransformer
+
+
+@attr(shard=2)
+class TestSerialization(ChildrenMapTestMixin, TestCase):
+    """
+    Tests for serialize_block_structure and deserialize_block_structure
+    """
+    def round_trip(self, block_structure):
+        """
+        Returns a copy of the given block structure made by serializing
+        and deserializing it.
+        """
+        block_relations, transformer_data, block_data_map = deserialize_block_structure(
+            block_structure.root_block_usage_key,
+            serialize_block_structure(block_structure),
+        )
+        new_block_structure = BlockStructureBlockData(block_structure.root_block_usage_key)
+        new_block_structure._block_relations = block_relations
+        new_block_structure.transformer_data = transformer_data
+        new_block_structure._block_data_map = block_data_map
+        return new_block_structure
+
+    def assert_same_data(self, block_structure, new_block_structure):
+        """
+        Verifies that the given block structures have the same blocks,
+        relations, fields and transformer data.
+        """
+        self.assertEquals(set(block_structure), set(new_block_structure))
+        for usage_key in block_structure:
+            self.assertEquals(block_structure.get_children(usage_key), new_block_structure.get_children(usage_key))
+            self.assertEquals(block_structure.get_parents(usage_key), new_block_structure.get_parents(usage_key))
+        self.assertEquals(set(block_structure._block_data_map), set(new_block_structure._block_data_map))
+        for usage_key, block_data in block_structure._block_data_map.iteritems():
+            new_block_data = new_block_structure._block_data_map[usage_key]
+            self.assertEquals(block_data.location, new_block_data.location)
+            self.assertEquals(block_data.fields, new_block_data.fields)
+            self.assertEquals(
+                {name: data.fields for name, data in block_data.transformer_data.iteritems()},
+                {name: data.fields for name, data in new_block_data.transformer_data.iteritems()},
+            )
+        self.assertEquals(
+            {name: data.fields for name, data in block_structure.transformer_data.iteritems()},
+            {name: data.fields for name, data in new_block_structure.transformer_data.iteritems()},
+        )
+
+    def test_simple_structure(self):
+        block_structure = self.create_block_structure(self.SIMPLE_CHILDREN_MAP)
+        block_structure._add_transformer(MockTransformer)
+        block_structure.set_transformer_block_field(0, MockTransformer, 'test', 'value')
+        new_block_structure = self.round_trip(block_structure)
+        self.assert_same_data(block_structure, new_block_structure)
+        self.assert_block_structure(new_block_structure, self.SIMPLE_CHILDREN_MAP)
+
+    def test_course_structure(self):
+        course_key = CourseLocator('org', 'course', 'run')
+        other_course_key = CourseLocator('org', 'other_course', 'run')
+        root_key = course_key.make_usage_key('course', 'course')
+        chapter_key = course_key.make_usage_key('chapter', 'chapter')
+        problem_keys = [course_key.make_usage_key('problem', 'problem_{}'.format(index)) for index in range(3)]
+        other_course_problem_key = other_course_key.make_usage_key('problem', 'problem_0')
+
+        block_structure = BlockStructureBlockData(root_key)
+        block_structure._add_relation(root_key, chapter_key)
+        for problem_key in problem_keys + [other_course_problem_key]:
+            block_structure._add_relation(chapter_key, problem_key)
+        block_structure._add_relation(root_key, problem_keys[0])
+
+        # fields that some, but not all, blocks have
+        block_structure._get_or_create_block(root_key).course_version = 'version'
+        for usage_key in block_structure:
+            block_structure._get_or_create_block(usage_key).display_name = unicode(usage_key)
+        block_structure._get_or_create_block(problem_keys[1]).due = datetime(2016, 1, 1)
+
+        block_structure._add_transformer(MockTransformer)
+        block_structure.set_transformer_block_field(problem_keys[2], MockTransformer, 'test', 'value')
+        block_structure.set_transformer_block_field(problem_keys[2], MockTransformer, 'other', None)
+        block_structure._get_or_create_block(chapter_key).transformer_data.get_or_create(MockTransformer)
+
+        new_block_structure = self.round_trip(block_structure)
+        self.assert_same_data(block_structure, new_block_structure)
+        self.assertEquals(
+            new_block_structure.get_transformer_block_field(problem_keys[2], MockTransformer, 'test'),
+            'value',
+        )
+        self.assertIsNotNone(new_block_structure.get_transformer_block_data(chapter_key, MockTransformer))
@@ -4,6 +4,7 @@ Module for a collection of BlockStructureTransformers.
 import functools
 from logging import getLogger
 
+from .block_structure import EDITED_ON_XBLOCK_FIELD
 from .exceptions import TransformerException
 from .transformer import FilteringTransformerMixin
 from .transformer_registry import TransformerRegistry
@@ -75,6 +76,10 @@ class BlockStructureTransformers(object):
         """
         Collects data for each registered transformer.
         """
+        # Collect the time each block was last edited, so that later
+        # collections can tell which blocks are unchanged.
+        block_structure.request_xblock_fields(EDITED_ON_XBLOCK_FIELD)
+
         for transformer in TransformerRegistry.get_registered_transformers():
             block_structure._add_transformer(transformer)  # pylint: disable=protected-access
             transformer.collect(block_structure)
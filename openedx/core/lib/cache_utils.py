@@ -4,7 +4,10 @@ Utilities related to caching.
 import collections
 import cPickle as pickle
 import functools
+import time
 import zlib
+from threading import Lock
+
 from xblock.core import XBlock
 
 
@@ -101,3 +104,55 @@ def zpickle(data):
 def zunpickle(zdata):
     """Given a zlib compressed pickled serialization, returns the deserialized data."""
     return pickle.loads(zlib.decompress(zdata))
+
+
+class ProcessLocalCache(object):
+    """
+    Process-local, least recently used cache, whose entries expire after a
+    timeout.  It can be shared by the threads of a process.
+
+    Values are stored and returned as they are, so callers that hand out
+    mutable values should store and return copies of them.
+    """
+    def __init__(self, max_size, timeout):
+        """
+        Arguments:
+            max_size (int) - The maximum number of entries kept.
+            timeout (int) - The number of seconds each entry is kept.
+        """
+        self.max_size = max_size
+        self.timeout = timeout
+        self._entries = collections.OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key, default=None):
+        """
+        Returns the value cached under key, or default if it's missing or expired.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.time():
+                return default
+            # Re-insert the entry to mark it as the most recently used.
+            self._entries[key] = entry
+            return value
+
+    def set(self, key, value):
+        """
+        Caches value under key, evicting the least recently used entries if needed.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+            while len(self._entries) >= self.max_size:
+                self._entries.popitem(last=False)
+            self._entries[key] = (time.time() + self.timeout, value)
+
+    def clear(self):
+        """
+        Evicts all entries.
+        """
+        with self._lock:
+            self._entries.clear()
@@ -8,25 +8,29 @@ from opaque_keys import InvalidKeyError
 from opaque_keys.edx.keys import CourseKey
 
 
-def get_mutually_exclusive_required_option(options, option_1, option_2):
+def get_mutually_exclusive_required_option(options, *option_names):
     """
-    Validates that exactly one of the 2 given options is specified.
+    Validates that exactly one of the given options is specified.
     Returns the name of the found option.
     """
-    validate_mutually_exclusive_option(options, option_1, option_2)
+    validate_mutually_exclusive_option(options, *option_names)
 
-    if not options.get(option_1) and not options.get(option_2):
-        raise CommandError('Either --{} or --{} must be specified.'.format(option_1, option_2))
+    for option_name in option_names:
+        if options.get(option_name):
+            return option_name
 
-    return option_1 if options.get(option_1) else option_2
+    raise CommandError('Either {} must be specified.'.format(
+        ' or '.join('--{}'.format(option_name) for option_name in option_names)
+    ))
 
 
-def validate_mutually_exclusive_option(options, option_1, option_2):
+def validate_mutually_exclusive_option(options, *option_names):
     """
-    Validates that both of the 2 given options are not specified.
+    Validates that no two of the given options are specified.
     """
-    if options.get(option_1) and options.get(option_2):
-        raise CommandError('Both --{} and --{} cannot be specified.'.format(option_1, option_2))
+    specified_option_names = [option_name for option_name in option_names if options.get(option_name)]
+    if len(specified_option_names) > 1:
+        raise CommandError('Both --{} and --{} cannot be specified.'.format(*specified_option_names[:2]))
 
 
 def validate_dependent_option(options, dependent_option, depending_on_option):
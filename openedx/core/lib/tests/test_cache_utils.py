@@ -2,10 +2,10 @@
 Tests for cache_utils.py
 """
 import ddt
-from mock import MagicMock
+from mock import MagicMock, patch
 from unittest import TestCase
 
-from openedx.core.lib.cache_utils import memoize_in_request_cache
+from openedx.core.lib.cache_utils import memoize_in_request_cache, ProcessLocalCache
 
 
 @ddt.ddt
@@ -62,3 +62,43 @@ class TestMemoizeInRequestCache(TestCase):
                 func_to_memoize(*arg_list2)
 
             self.assertEquals(self.func_to_count.call_count, 2)
+
+
+@patch('openedx.core.lib.cache_utils.time')
+class TestProcessLocalCache(TestCase):
+    """
+    Test the ProcessLocalCache class.
+    """
+    def test_get_missing(self, mock_time):
+        mock_time.time.return_value = 0
+        cache = ProcessLocalCache(max_size=2, timeout=10)
+        self.assertIsNone(cache.get('missing'))
+        self.assertEqual(cache.get('missing', 'default'), 'default')
+
+    def test_least_recently_used_evicted(self, mock_time):
+        mock_time.time.return_value = 0
+        cache = ProcessLocalCache(max_size=2, timeout=10)
+        cache.set('first', 1)
+        cache.set('second', 2)
+        # mark the first value as the most recently used
+        self.assertEqual(cache.get('first'), 1)
+        cache.set('third', 3)
+        self.assertIsNone(cache.get('second'))
+        self.assertEqual(cache.get('first'), 1)
+        self.assertEqual(cache.get('third'), 3)
+
+    def test_expiry(self, mock_time):
+        mock_time.time.return_value = 0
+        cache = ProcessLocalCache(max_size=2, timeout=10)
+        cache.set('first', 1)
+        mock_time.time.return_value = 10
+        self.assertEqual(cache.get('first'), 1)
+        mock_time.time.return_value = 11
+        self.assertIsNone(cache.get('first'))
+
+    def test_clear(self, mock_time):
+        mock_time.time.return_value = 0
+        cache = ProcessLocalCache(max_size=2, timeout=10)
+        cache.set('first', 1)
+        cache.clear()
+        self.assertIsNone(cache.get('first'))
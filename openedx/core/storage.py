@@ -1,6 +1,8 @@
 """
 Django storage backends for Open edX.
 """
+import os
+
 from django_pipeline_forgiving.storages import PipelineForgivingStorage
 from django.contrib.staticfiles.storage import StaticFilesStorage
 from django.core.files.storage import get_storage_class
@@ -48,7 +50,15 @@ class DevelopmentStorage(
 class S3ReportStorage(S3BotoStorage):  # pylint: disable=abstract-method
     """
     Storage for reports.
+
+    Reports larger than `MULTIPART_THRESHOLD` bytes are uploaded to S3 in
+    parts of `MULTIPART_CHUNK_SIZE` bytes, so that they are read from their
+    (possibly on-disk) file a chunk at a time instead of all at once.
     """
+    # S3 requires all parts but the last one to be at least 5MB.
+    MULTIPART_CHUNK_SIZE = 8 * 1024 * 1024
+    MULTIPART_THRESHOLD = 2 * MULTIPART_CHUNK_SIZE
+
     def __init__(self, acl=None, bucket=None, custom_domain=None, **settings):
         """
         init method for S3ReportStorage, Note that we have added an extra key-word
@@ -67,6 +77,41 @@ class S3ReportStorage(S3BotoStorage):  # pylint: disable=abstract-method
             self.custom_domain = custom_domain
         super(S3ReportStorage, self).__init__(acl=acl, bucket=bucket, **settings)
 
+    def _save_content(self, key, content, headers):
+        """
+        Uploads `content` to `key`, using a multipart upload if the content
+        is larger than MULTIPART_THRESHOLD.
+        """
+        content.seek(0, os.SEEK_END)
+        content_size = content.tell()
+        content.seek(0)
+        if content_size <= self.MULTIPART_THRESHOLD:
+            return super(S3ReportStorage, self)._save_content(key, content, headers)
+
+        kwargs = {}
+        if self.encryption:
+            kwargs['encrypt_key'] = self.encryption
+        multipart_upload = self.bucket.initiate_multipart_upload(
+            key.name,
+            headers=headers,
+            policy=self.default_acl,
+            reduced_redundancy=self.reduced_redundancy,
+            **kwargs
+        )
+        try:
+            part_num = 0
+            while content.tell() < content_size:
+                part_num += 1
+                multipart_upload.upload_part_from_file(
+                    content,
+                    part_num,
+                    size=min(self.MULTIPART_CHUNK_SIZE, content_size - content.tell()),
+                )
+            multipart_upload.complete_upload()
+        except Exception:
+            multipart_upload.cancel_upload()
+            raise
+
 
 @lru_cache()
 def get_storage(storage_class=None, **kwargs):